@@ -0,0 +1,60 @@
+"""Keyset pagination indexes for players and coaches
+
+Revision ID: 3f1c9a7d2b84
+Revises: 86aeafee1654
+Create Date: 2026-10-17 09:10:42.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a7d2b84"
+down_revision: Union[str, Sequence[str], None] = "86aeafee1654"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, sort column); every index is (sort column, id)
+KEYSET_INDEXES = [
+    ("idx_players_keyset_name", "players", "name"),
+    ("idx_players_keyset_market_value", "players", "market_value_eur"),
+    ("idx_players_keyset_overall_rating", "players", "overall_rating"),
+    ("idx_players_keyset_potential_rating", "players", "potential_rating"),
+    ("idx_players_keyset_created_at", "players", "created_at"),
+    ("idx_coaches_keyset_name", "coaches", "name"),
+    ("idx_coaches_keyset_overall_rating", "coaches", "overall_rating"),
+    ("idx_coaches_keyset_years_experience", "coaches", "years_experience"),
+    ("idx_coaches_keyset_salary", "coaches", "estimated_salary_eur"),
+    ("idx_coaches_keyset_created_at", "coaches", "created_at"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for name, table, column in KEYSET_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column, "id"],
+                unique=False,
+                postgresql_where=sa.text("is_active"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(KEYSET_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,62 @@
+"""Trigram GIN indexes for player and coach text filters
+
+Revision ID: b71e04c9d3a6
+Revises: 3f1c9a7d2b84
+Create Date: 2026-10-17 10:25:13.604417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b71e04c9d3a6"
+down_revision: Union[str, Sequence[str], None] = "3f1c9a7d2b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column)
+TRIGRAM_INDEXES = [
+    ("idx_players_name_trgm", "players", "name"),
+    ("idx_players_full_name_trgm", "players", "full_name"),
+    ("idx_players_current_club_trgm", "players", "current_club"),
+    ("idx_players_nationality_trgm", "players", "nationality"),
+    ("idx_players_second_nationality_trgm", "players", "second_nationality"),
+    ("idx_players_position_trgm", "players", "position"),
+    ("idx_coaches_name_trgm", "coaches", "name"),
+    ("idx_coaches_full_name_trgm", "coaches", "full_name"),
+    ("idx_coaches_current_club_trgm", "coaches", "current_club"),
+    ("idx_coaches_nationality_trgm", "coaches", "nationality"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Build concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,70 @@
+"""Generated tsvector column and GIN index for player full-text search
+
+Revision ID: 5c8d2e6f1a07
+Revises: b71e04c9d3a6
+Create Date: 2026-10-17 11:40:27.953180
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5c8d2e6f1a07"
+down_revision: Union[str, Sequence[str], None] = "b71e04c9d3a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(full_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(current_club, '')), 'B') || "
+    "setweight(to_tsvector('english', search_array_to_text(tags)), 'B') || "
+    "setweight(to_tsvector('english', coalesce(nationality, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(scouting_notes, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION search_array_to_text(text[]) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT coalesce(array_to_string($1, ' '), '') $$
+        """)
+    op.add_column(
+        "players",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_players_search_vector",
+            "players",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_players_search_vector",
+            table_name="players",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("players", "search_vector")
+    op.execute("DROP FUNCTION IF EXISTS search_array_to_text(text[])")
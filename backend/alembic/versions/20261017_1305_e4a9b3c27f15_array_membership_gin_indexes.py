@@ -0,0 +1,61 @@
+"""GIN indexes for array membership filters
+
+Revision ID: e4a9b3c27f15
+Revises: 5c8d2e6f1a07
+Create Date: 2026-10-17 13:05:51.207634
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a9b3c27f15"
+down_revision: Union[str, Sequence[str], None] = "5c8d2e6f1a07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, ARRAY column)
+ARRAY_INDEXES = [
+    ("idx_players_secondary_positions_gin", "players", "secondary_positions"),
+    ("idx_players_tags_gin", "players", "tags"),
+    ("idx_players_strengths_gin", "players", "strengths"),
+    ("idx_players_weaknesses_gin", "players", "weaknesses"),
+    (
+        "idx_coaches_preferred_formations_gin",
+        "coaches",
+        "preferred_formations",
+    ),
+    ("idx_coaches_tags_gin", "coaches", "tags"),
+    ("idx_coaches_strengths_gin", "coaches", "strengths"),
+    ("idx_coaches_weaknesses_gin", "coaches", "weaknesses"),
+    ("idx_coaches_languages_spoken_gin", "coaches", "languages_spoken"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, column in ARRAY_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(ARRAY_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
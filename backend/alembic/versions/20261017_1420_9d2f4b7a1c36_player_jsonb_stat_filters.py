@@ -0,0 +1,132 @@
+"""JSONB stats columns with GIN and per-key expression indexes
+
+Revision ID: 9d2f4b7a1c36
+Revises: e4a9b3c27f15
+Create Date: 2026-10-17 14:20:37.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2f4b7a1c36"
+down_revision: Union[str, Sequence[str], None] = "e4a9b3c27f15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSONB_COLUMNS = [
+    "current_season_stats",
+    "performance_metrics",
+    "tactical_attributes",
+]
+
+# (column, keys) served by min_/max_ range filters
+NUMERIC_KEYS = [
+    (
+        "current_season_stats",
+        "stat",
+        [
+            "goals",
+            "assists",
+            "appearances",
+            "minutes_played",
+            "yellow_cards",
+            "red_cards",
+        ],
+    ),
+    (
+        "performance_metrics",
+        "metric",
+        [
+            "xG",
+            "xA",
+            "progressive_passes",
+            "defensive_actions",
+            "dribble_success_rate",
+        ],
+    ),
+]
+
+
+def _expression_indexes():
+    for column, prefix, keys in NUMERIC_KEYS:
+        for key in keys:
+            yield (
+                f"idx_players_{prefix}_{key.lower()}",
+                sa.text(f"jsonb_number({column}, '{key}')"),
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION jsonb_number(jsonb, text) RETURNS numeric
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT CASE WHEN jsonb_typeof($1 -> $2) = 'number'
+                          THEN ($1 ->> $2)::numeric END $$
+        """)
+    for column in JSONB_COLUMNS:
+        op.alter_column(
+            "players",
+            column,
+            existing_type=postgresql.JSON(astext_type=sa.Text()),
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=f"{column}::jsonb",
+        )
+
+    with op.get_context().autocommit_block():
+        for column in JSONB_COLUMNS:
+            op.create_index(
+                f"idx_players_{column}_gin",
+                "players",
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, expression in _expression_indexes():
+            op.create_index(
+                name,
+                "players",
+                [expression],
+                unique=False,
+                postgresql_where=sa.text("is_active"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(list(_expression_indexes())):
+            op.drop_index(
+                name,
+                table_name="players",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        for column in reversed(JSONB_COLUMNS):
+            op.drop_index(
+                f"idx_players_{column}_gin",
+                table_name="players",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    for column in reversed(JSONB_COLUMNS):
+        op.alter_column(
+            "players",
+            column,
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            type_=postgresql.JSON(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=f"{column}::json",
+        )
+    op.execute("DROP FUNCTION IF EXISTS jsonb_number(jsonb, text)")
@@ -0,0 +1,79 @@
+"""Player summary rollup table
+
+Revision ID: 2b6e8f0d4a19
+Revises: 9d2f4b7a1c36
+Create Date: 2026-10-17 15:35:12.840117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2b6e8f0d4a19"
+down_revision: Union[str, Sequence[str], None] = "9d2f4b7a1c36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "player_summary_counts",
+        sa.Column("dimension", sa.String(length=20), nullable=False),
+        sa.Column("value", sa.String(length=255), nullable=False),
+        sa.Column("players", sa.Integer(), nullable=False),
+        sa.Column("valued_players", sa.Integer(), nullable=False),
+        sa.Column("market_value_sum", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("dimension", "value"),
+    )
+    op.create_index(
+        "idx_player_summary_counts_top",
+        "player_summary_counts",
+        ["dimension", sa.text("players DESC")],
+        unique=False,
+    )
+
+    # Seed the rollup from the current players
+    op.execute("""
+        INSERT INTO player_summary_counts
+            (dimension, value, players, valued_players, market_value_sum)
+        SELECT
+            CASE
+                WHEN GROUPING(position) = 0 THEN 'position'
+                WHEN GROUPING(nationality) = 0 THEN 'nationality'
+                WHEN GROUPING(current_club) = 0 THEN 'club'
+                ELSE 'total'
+            END,
+            coalesce(
+                CASE
+                    WHEN GROUPING(position) = 0 THEN position
+                    WHEN GROUPING(nationality) = 0 THEN nationality
+                    WHEN GROUPING(current_club) = 0 THEN current_club
+                END,
+                ''
+            ),
+            count(*),
+            count(market_value_eur),
+            coalesce(sum(market_value_eur), 0)
+        FROM players
+        WHERE is_active
+        GROUP BY GROUPING SETS
+            ((position), (nationality), (current_club), ())
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_player_summary_counts_top", table_name="player_summary_counts"
+    )
+    op.drop_table("player_summary_counts")
@@ -0,0 +1,46 @@
+"""Partial index on active players' contract_expires for the contract radar
+
+Revision ID: 7c3e9a5d2f81
+Revises: 2b6e8f0d4a19
+Create Date: 2026-10-17 16:10:48.203511
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e9a5d2f81"
+down_revision: Union[str, Sequence[str], None] = "2b6e8f0d4a19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_players_contract_expires_active",
+            "players",
+            ["contract_expires"],
+            unique=False,
+            postgresql_include=["position", "market_value_eur"],
+            postgresql_where=sa.text(
+                "is_active AND contract_expires IS NOT NULL"
+            ),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_players_contract_expires_active",
+            table_name="players",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,88 @@
+"""Per-position player percentiles and their recompute state
+
+Revision ID: 4f8b2d6e1a93
+Revises: 7c3e9a5d2f81
+Create Date: 2026-10-17 17:05:21.637402
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "4f8b2d6e1a93"
+down_revision: Union[str, Sequence[str], None] = "7c3e9a5d2f81"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "player_percentiles",
+        sa.Column("player_id", sa.UUID(), nullable=False),
+        sa.Column("position", sa.String(length=50), nullable=False),
+        sa.Column(
+            "percentiles",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+        ),
+        sa.Column(
+            "computed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["player_id"], ["players.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("player_id"),
+    )
+    op.create_index(
+        op.f("ix_player_percentiles_position"),
+        "player_percentiles",
+        ["position"],
+        unique=False,
+    )
+    op.create_table(
+        "percentile_groups",
+        sa.Column("position", sa.String(length=50), nullable=False),
+        sa.Column(
+            "version", sa.BigInteger(), server_default="1", nullable=False
+        ),
+        sa.Column(
+            "computed_version",
+            sa.BigInteger(),
+            server_default="0",
+            nullable=False,
+        ),
+        sa.Column("players", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "metric_counts",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("position"),
+    )
+
+    # Every current position starts dirty; groups are computed on first read
+    op.execute("""
+        INSERT INTO percentile_groups (position)
+        SELECT DISTINCT position FROM players
+        WHERE is_active AND position IS NOT NULL
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("percentile_groups")
+    op.drop_index(
+        op.f("ix_player_percentiles_position"),
+        table_name="player_percentiles",
+    )
+    op.drop_table("player_percentiles")
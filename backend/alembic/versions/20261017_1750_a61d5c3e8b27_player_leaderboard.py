@@ -0,0 +1,56 @@
+"""Cached per-position metric leaderboards
+
+Revision ID: a61d5c3e8b27
+Revises: 4f8b2d6e1a93
+Create Date: 2026-10-17 17:50:09.315827
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a61d5c3e8b27"
+down_revision: Union[str, Sequence[str], None] = "4f8b2d6e1a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "player_leaderboard",
+        sa.Column("metric", sa.String(length=50), nullable=False),
+        sa.Column("position", sa.String(length=50), nullable=False),
+        sa.Column("player_id", sa.UUID(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("previous_rank", sa.Integer(), nullable=True),
+        sa.Column("previous_value", sa.Float(), nullable=True),
+        sa.Column(
+            "refreshed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["player_id"], ["players.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("metric", "position", "player_id"),
+    )
+    op.create_index(
+        "idx_player_leaderboard_rank",
+        "player_leaderboard",
+        ["metric", "position", "rank"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_player_leaderboard_rank", table_name="player_leaderboard"
+    )
+    op.drop_table("player_leaderboard")
@@ -0,0 +1,145 @@
+"""Per-competition coach performance side table
+
+Revision ID: c5d1f7a2b946
+Revises: a61d5c3e8b27
+Create Date: 2026-10-17 18:35:41.207364
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d1f7a2b946"
+down_revision: Union[str, Sequence[str], None] = "a61d5c3e8b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "coach_performance",
+        sa.Column("coach_id", sa.UUID(), nullable=False),
+        sa.Column("competition", sa.String(length=100), nullable=False),
+        sa.Column("games", sa.Integer(), nullable=True),
+        sa.Column("win_rate", sa.Float(), nullable=True),
+        sa.Column("points_per_game", sa.Float(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["coach_id"], ["coaches.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("coach_id", "competition"),
+    )
+    op.create_index(
+        "idx_coach_performance_win_rate",
+        "coach_performance",
+        ["competition", "win_rate", "coach_id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_coach_performance_points_per_game",
+        "coach_performance",
+        ["competition", "points_per_game", "coach_id"],
+        unique=False,
+    )
+
+    # Seed from coaching_metrics with the rules of
+    # app.services.coach_performance.performance_by_competition
+    op.execute("""
+        WITH metrics AS (
+            SELECT id AS coach_id, coaching_metrics::jsonb AS m
+            FROM coaches
+            WHERE jsonb_typeof(coaching_metrics::jsonb) = 'object'
+        ),
+        entries AS (
+            SELECT
+                coach_id,
+                e.key AS competition,
+                CASE WHEN jsonb_typeof(e.value -> 'total_games') = 'number'
+                    THEN (e.value ->> 'total_games')::float8 END AS games,
+                CASE WHEN jsonb_typeof(e.value -> 'wins') = 'number'
+                    THEN (e.value ->> 'wins')::float8 END AS wins,
+                CASE WHEN jsonb_typeof(e.value -> 'points') = 'number'
+                    THEN (e.value ->> 'points')::float8 END AS points
+            FROM metrics, jsonb_each(m) AS e
+            WHERE jsonb_typeof(e.value) = 'object'
+                AND char_length(e.key) <= 100
+        ),
+        figures AS (
+            SELECT
+                coach_id,
+                competition,
+                trunc(games)::int AS games,
+                wins / games * 100 AS win_rate,
+                points / games AS points_per_game
+            FROM entries
+            WHERE games > 0 AND (wins IS NOT NULL OR points IS NOT NULL)
+        ),
+        rates AS (
+            SELECT
+                coach_id,
+                CASE WHEN jsonb_typeof(m -> 'win_rate') = 'number'
+                    THEN (m ->> 'win_rate')::float8 END AS win_rate,
+                CASE WHEN jsonb_typeof(
+                    coalesce(m -> 'points_per_game', m -> 'avg_points')
+                ) = 'number'
+                    THEN (
+                        coalesce(m -> 'points_per_game', m -> 'avg_points')
+                        #>> '{}'
+                    )::float8 END AS points_per_game
+            FROM metrics
+        ),
+        -- "all" figures, else "overall" ones, else flat rates
+        totals AS (
+            SELECT
+                coach_id, 1 AS priority, games, win_rate, points_per_game
+            FROM figures
+            WHERE competition = 'all'
+            UNION ALL
+            SELECT coach_id, 2, games, win_rate, points_per_game
+            FROM figures
+            WHERE competition = 'overall'
+            UNION ALL
+            SELECT
+                coach_id,
+                3,
+                NULL,
+                CASE WHEN win_rate <= 1 THEN win_rate * 100
+                    ELSE win_rate END,
+                points_per_game
+            FROM rates
+            WHERE win_rate IS NOT NULL OR points_per_game IS NOT NULL
+        )
+        INSERT INTO coach_performance
+            (coach_id, competition, games, win_rate, points_per_game)
+        SELECT coach_id, competition, games, win_rate, points_per_game
+        FROM figures
+        WHERE competition <> 'all'
+        UNION ALL
+        (
+            SELECT DISTINCT ON (coach_id)
+                coach_id, 'all', games, win_rate, points_per_game
+            FROM totals
+            ORDER BY coach_id, priority
+        )
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_coach_performance_points_per_game",
+        table_name="coach_performance",
+    )
+    op.drop_index(
+        "idx_coach_performance_win_rate", table_name="coach_performance"
+    )
+    op.drop_table("coach_performance")
@@ -0,0 +1,50 @@
+"""Track percentile group freshness by player fingerprint
+
+Revision ID: e2a94c7b3d58
+Revises: c5d1f7a2b946
+Create Date: 2026-10-17 19:10:08.512736
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a94c7b3d58"
+down_revision: Union[str, Sequence[str], None] = "c5d1f7a2b946"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Groups start without a fingerprint, so the first refresh recomputes them
+    op.add_column(
+        "percentile_groups",
+        sa.Column("fingerprint", sa.String(length=64), nullable=True),
+    )
+    op.drop_column("percentile_groups", "computed_version")
+    op.drop_column("percentile_groups", "version")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Every group comes back dirty
+    op.add_column(
+        "percentile_groups",
+        sa.Column(
+            "version", sa.BigInteger(), server_default="1", nullable=False
+        ),
+    )
+    op.add_column(
+        "percentile_groups",
+        sa.Column(
+            "computed_version",
+            sa.BigInteger(),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+    op.drop_column("percentile_groups", "fingerprint")
@@ -0,0 +1,37 @@
+"""Derive player summary totals from the position rows
+
+Revision ID: 9d1c6b4f7e20
+Revises: e2a94c7b3d58
+Create Date: 2026-10-17 19:25:44.093158
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d1c6b4f7e20"
+down_revision: Union[str, Sequence[str], None] = "e2a94c7b3d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("DELETE FROM player_summary_counts WHERE dimension = 'total'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        INSERT INTO player_summary_counts (
+            dimension, value, players, valued_players, market_value_sum,
+            updated_at
+        )
+        SELECT 'total', '', coalesce(sum(players), 0),
+               coalesce(sum(valued_players), 0),
+               coalesce(sum(market_value_sum), 0), now()
+        FROM player_summary_counts
+        WHERE dimension = 'position'
+        """)
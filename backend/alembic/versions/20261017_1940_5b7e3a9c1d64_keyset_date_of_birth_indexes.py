@@ -0,0 +1,52 @@
+"""Keyset pagination indexes for sorting players and coaches by age
+
+Revision ID: 5b7e3a9c1d64
+Revises: 9d1c6b4f7e20
+Create Date: 2026-10-17 19:40:17.385902
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e3a9c1d64"
+down_revision: Union[str, Sequence[str], None] = "9d1c6b4f7e20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, sort column); every index is (sort column, id)
+KEYSET_INDEXES = [
+    ("idx_players_keyset_date_of_birth", "players", "date_of_birth"),
+    ("idx_coaches_keyset_date_of_birth", "coaches", "date_of_birth"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for name, table, column in KEYSET_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column, "id"],
+                unique=False,
+                postgresql_where=sa.text("is_active"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(KEYSET_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, players, coaches, shortlists, reports
+from app.api.v1.endpoints import auth, players, coaches, shortlists, reports, jobs
 
 api_router = APIRouter()
 
@@ -9,4 +9,5 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(players.router, prefix="/players", tags=["players"])
 api_router.include_router(coaches.router, prefix="/coaches", tags=["coaches"])
 api_router.include_router(shortlists.router, prefix="/shortlists", tags=["shortlists"])
-api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
\ No newline at end of file
+api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
\ No newline at end of file
@@ -1,93 +1,367 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, any_, bindparam, or_, desc, asc, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from typing import Any, List, Optional
+from datetime import date
 import uuid
 
-from app.core.database import get_db
+from app.core.cache import bump_generation, cached_response, filter_signature, store_response
+from app.core.conditional import (
+    changed_at, entity_etag, is_not_modified, list_etag, not_modified, set_validators, stored_validators,
+    validator_headers
+)
+from app.core.database import get_db, get_redis
+from app.core.export import export_response
 from app.core.dependencies import check_permission
-from app.schemas.coach import CoachResponse, CoachCreate, CoachUpdate
-from app.schemas.common import StandardResponse, PaginatedResponse
-from app.models import Coach, User
+from app.core.filters import (
+    array_contains_all, array_overlaps, contains, parse_array_filters, similarity_rank, text_search
+)
+from app.core.pagination import (
+    PAGINATION_PARAMS, count_rows, cursor_pagination_meta, keyset_paginate, offset_pagination_meta
+)
+from app.core.projection import (
+    age_from_birth_date, parse_fields, project_rows, projected_response, projection_columns, projection_model
+)
+from app.schemas.coach import (
+    CoachResponse, CoachCreate, CoachUpdate, CoachSimilarityReason, SimilarCoachResponse
+)
+from app.schemas.common import (
+    BatchRequest, DuplicateMatch, JobResponse, MergeReport, MergeRequest, StandardResponse, PaginatedResponse
+)
+from app.models import Coach, CoachPerformance, User
+from app.services import coach_performance
+from app.services.coach_similarity import coach_similarity_index
+from app.services.duplicates import find_duplicates, merge_duplicates, scan_duplicates
+from app.services.jobs import job_registry
 
 router = APIRouter()
 
+# Sort keys usable with cursor pagination; each is backed by a (column, id) index
+KEYSET_SORT_FIELDS = {
+    "name": Coach.name,
+    "overall_rating": Coach.overall_rating,
+    "years_experience": Coach.years_experience,
+    "estimated_salary_eur": Coach.estimated_salary_eur,
+    "created_at": Coach.created_at,
+}
+
+# Sort keys served by a keyset column scanned the opposite way: oldest
+# first is earliest birth date first
+INVERTED_SORT_FIELDS = {
+    "age": Coach.date_of_birth,
+}
+
+# ARRAY columns accepted by any_of/all_of; each has a GIN index
+ARRAY_FILTER_FIELDS = {
+    "preferred_formations": Coach.preferred_formations,
+    "tags": Coach.tags,
+    "strengths": Coach.strengths,
+    "weaknesses": Coach.weaknesses,
+    "languages_spoken": Coach.languages_spoken,
+}
+
+# Sort keys read from the coach_performance side table, for the requested competition
+PERFORMANCE_SORT_FIELDS = {
+    "win_rate": CoachPerformance.win_rate,
+    "points_per_game": CoachPerformance.points_per_game,
+}
+
+# Columns matched by the `search` filter; each has a trigram GIN index
+SEARCH_COLUMNS = [Coach.name, Coach.full_name, Coach.current_club]
+
+# Fields returned by view=list
+LIST_VIEW_FIELDS = (
+    "id", "name", "current_club", "current_role", "nationality", "age", "preferred_formation", "overall_rating"
+)
+
+# Response fields computed from other columns
+DERIVED_FIELDS = {
+    "age": ([Coach.date_of_birth], lambda row: age_from_birth_date(row["date_of_birth"])),
+}
+
+class CoachFilters:
+    """List filters, shared by get_coaches and export_coaches"""
+    
+    def __init__(
+        self,
+        current_role: Optional[str] = Query(None, description="Filter by current role"),
+        club: Optional[str] = Query(None, description="Filter by current club"),
+        nationality: Optional[str] = Query(None, description="Filter by nationality"),
+        formation: Optional[str] = Query(None, description="Filter by preferred formation"),
+        min_age: Optional[int] = Query(None, ge=0, description="Minimum age in years"),
+        max_age: Optional[int] = Query(None, ge=0, description="Maximum age in years"),
+        min_win_rate: Optional[float] = Query(None, ge=0, le=100, description="Minimum win rate in percent"),
+        min_points_per_game: Optional[float] = Query(None, ge=0, description="Minimum points per game"),
+        competition: str = Query(
+            coach_performance.ALL_COMPETITIONS,
+            max_length=coach_performance.MAX_COMPETITION_LENGTH,
+            description="coaching_metrics competition that win rate and points per game filters and sorts read"
+        ),
+        search: Optional[str] = Query(None, description="Search coaches by name"),
+        any_of: Optional[List[str]] = Query(
+            None,
+            description="Array filter field:v1,v2 matching rows holding any value (repeatable)"
+        ),
+        all_of: Optional[List[str]] = Query(
+            None,
+            description="Array filter field:v1,v2 matching rows holding every value (repeatable)"
+        )
+    ):
+        self.current_role = current_role
+        self.club = club
+        self.nationality = nationality
+        self.formation = formation
+        self.min_age = min_age
+        self.max_age = max_age
+        self.min_win_rate = min_win_rate
+        self.min_points_per_game = min_points_per_game
+        self.competition = competition
+        self.search = search
+        # Parsed up front so a bad filter is a 400 before any response starts
+        self.any_of = parse_array_filters(any_of, ARRAY_FILTER_FIELDS)
+        self.all_of = parse_array_filters(all_of, ARRAY_FILTER_FIELDS)
+    
+    def apply(self, query, fuzzy_search: bool = False):
+        """Filter a Query or select() of coaches"""
+        if self.current_role:
+            query = query.filter(contains(Coach.current_role, self.current_role))
+        
+        if self.club:
+            query = query.filter(contains(Coach.current_club, self.club))
+        
+        if self.nationality:
+            query = query.filter(contains(Coach.nationality, self.nationality))
+        
+        if self.formation:
+            query = query.filter(
+                or_(
+                    contains(Coach.preferred_formation, self.formation),
+                    array_overlaps(Coach.preferred_formations, [self.formation])
+                )
+            )
+        
+        # Compiled to date_of_birth ranges
+        if self.min_age is not None:
+            query = query.filter(Coach.age >= self.min_age)
+        
+        if self.max_age is not None:
+            query = query.filter(Coach.age <= self.max_age)
+        
+        # Range scans of the coach_performance indexes
+        if self.min_win_rate is not None:
+            query = query.filter(self.performance_at_least("win_rate", self.min_win_rate))
+        
+        if self.min_points_per_game is not None:
+            query = query.filter(self.performance_at_least("points_per_game", self.min_points_per_game))
+        
+        # Array membership filters compile to && / @> so the GIN indexes apply
+        for column, values in self.any_of:
+            query = query.filter(array_overlaps(column, values))
+        
+        for column, values in self.all_of:
+            query = query.filter(array_contains_all(column, values))
+        
+        # Substring search, optionally typo-tolerant
+        if self.search:
+            query = query.filter(text_search(self.search, SEARCH_COLUMNS, fuzzy=fuzzy_search))
+        
+        return query
+    
+    def performance_at_least(self, field: str, minimum: float):
+        """EXISTS the coach's figure in the requested competition reaches `minimum`"""
+        # Aliased, so the sort's join of coach_performance does not absorb the correlation
+        performance = aliased(CoachPerformance)
+        return select(performance.coach_id).where(
+            performance.coach_id == Coach.id,
+            performance.competition == self.competition,
+            getattr(performance, field) >= minimum
+        ).exists()
+
 @router.get("", response_model=PaginatedResponse[CoachResponse])
 async def get_coaches(
+    request: Request,
     current_user: User = Depends(check_permission('coach', 'read')),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    current_role: Optional[str] = Query(None, description="Filter by current role"),
-    club: Optional[str] = Query(None, description="Filter by current club"),
-    nationality: Optional[str] = Query(None, description="Filter by nationality"),
-    formation: Optional[str] = Query(None, description="Filter by preferred formation"),
-    search: Optional[str] = Query(None, description="Search coaches by name"),
-    sort_by: Optional[str] = Query("name", description="Sort field"),
+    filters: CoachFilters = Depends(),
+    sort_by: Optional[str] = Query(
+        "name",
+        description="Sort field; relevance ranks typo-tolerant search matches, win_rate and points_per_game "
+                    "read the `competition` figures"
+    ),
     sort_order: Optional[str] = Query("asc", description="Sort order: asc, desc"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from meta.next_cursor/prev_cursor; send an empty value to start cursor pagination"
+    ),
+    count: str = Query("exact", pattern="^(exact|estimated|cached)$", description="Total count strategy: exact, estimated, cached"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated CoachResponse fields to return, e.g. name,current_club,overall_rating"
+    ),
+    view: str = Query("full", pattern="^(full|list)$", description="Response shape: full, list (compact rows)"),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
     
 ) -> Any:
     """Get coaches with filtering and pagination"""
     
-    query = db.query(Coach).filter(Coach.is_active == True)
-    
-    # Apply filters
-    if current_role:
-        query = query.filter(Coach.current_role.ilike(f"%{current_role}%"))
+    # Response shape: only the selected fields' columns are read from the table
+    if fields is not None and view == "list":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either fields or view=list, not both"
+        )
+    if view == "list":
+        selected = LIST_VIEW_FIELDS
+    else:
+        selected = parse_fields(fields, CoachResponse) or tuple(CoachResponse.model_fields)
+    item_model = projection_model(CoachResponse, selected)
     
-    if club:
-        query = query.filter(Coach.current_club.ilike(f"%{club}%"))
+    query = db.query(Coach).filter(Coach.is_active == True)
     
-    if nationality:
-        query = query.filter(Coach.nationality.ilike(f"%{nationality}%"))
+    # Apply filters; relevance sorting also admits near misses
+    query = filters.apply(query, fuzzy_search=sort_by == "relevance")
+    
+    # Conditional GET: every query parameter (paging included) plus the
+    # generation writes bump identify this representation, so 304s and cache
+    # hits run no SQL; without Redis an aggregate of the filtered set stands in
+    signature = filter_signature(request.query_params)
+    etag, generation, aggregate = list_etag(
+        redis_client, "coaches", signature,
+        query.with_entities(func.max(changed_at(Coach)), func.count()),
+        date.today()
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
+    # Serve repeated queries from the response cache
+    cache_key, cached = cached_response(
+        redis_client, "coaches",
+        "coaches.cursor" if cursor is not None else "coaches.list",
+        signature,
+        generation=generation
+    )
+    if cached is not None:
+        return set_validators(cached, etag)
     
-    if formation:
-        query = query.filter(
-            or_(
-                Coach.preferred_formation.ilike(f"%{formation}%"),
-                func.array_to_string(Coach.preferred_formations, ',').ilike(f"%{formation}%")
-            )
+    # Total count for pagination; the validator aggregate, when it ran, already counted exactly
+    if count == "exact" and aggregate is not None:
+        total, count_strategy = aggregate[1], "exact"
+    else:
+        total, count_strategy = count_rows(
+            query, count, db,
+            redis_client=redis_client,
+            namespace="coaches",
+            signature=filter_signature(request.query_params, exclude=PAGINATION_PARAMS)
         )
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Coach.name.ilike(search_term),
-                Coach.full_name.ilike(search_term),
-                Coach.current_club.ilike(search_term)
+    # Cursor mode: seek past the last row instead of skipping rows
+    if cursor is not None:
+        sort_field = KEYSET_SORT_FIELDS.get(sort_by)
+        descending = sort_order.lower() == "desc"
+        if sort_by in INVERTED_SORT_FIELDS:
+            sort_field, descending = INVERTED_SORT_FIELDS[sort_by], not descending
+        if sort_field is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cursor pagination supports sort_by: {', '.join([*KEYSET_SORT_FIELDS, *INVERTED_SORT_FIELDS])}"
             )
+        
+        # Plain column rows skip entity construction and the identity map
+        rows, next_cursor, prev_cursor = keyset_paginate(
+            query.with_entities(*projection_columns(Coach, selected, DERIVED_FIELDS, extra=[sort_field])),
+            sort_key=sort_by,
+            sort_column=sort_field,
+            id_column=Coach.id,
+            descending=descending,
+            cursor=cursor or None,
+            limit=limit
         )
+        
+        response = store_response(redis_client, cache_key, PaginatedResponse[item_model], {
+            "success": True,
+            "data": project_rows(rows, selected, DERIVED_FIELDS),
+            "meta": {
+                "pagination": cursor_pagination_meta(limit, total, count_strategy),
+                "next_cursor": next_cursor,
+                "prev_cursor": prev_cursor
+            }
+        })
+        return set_validators(response, etag)
     
-    # Apply sorting
+    # Apply sorting (id breaks ties so pages are stable)
     sort_field = getattr(Coach, sort_by, Coach.name)
-    if sort_order.lower() == "desc":
-        query = query.order_by(desc(sort_field))
+    descending = sort_order.lower() == "desc"
+    if sort_by in INVERTED_SORT_FIELDS:
+        sort_field, descending = INVERTED_SORT_FIELDS[sort_by], not descending
+    if sort_by == "relevance" and filters.search:
+        query = query.order_by(desc(similarity_rank(filters.search, SEARCH_COLUMNS)), asc(Coach.id))
+    elif sort_by in PERFORMANCE_SORT_FIELDS:
+        # Coaches without figures for the competition come last in either direction
+        direction = desc if descending else asc
+        query = query.outerjoin(CoachPerformance, and_(
+            CoachPerformance.coach_id == Coach.id,
+            CoachPerformance.competition == filters.competition
+        )).order_by(direction(PERFORMANCE_SORT_FIELDS[sort_by]).nullslast(), direction(Coach.id))
+    elif descending:
+        query = query.order_by(desc(sort_field), desc(Coach.id))
     else:
-        query = query.order_by(asc(sort_field))
+        query = query.order_by(asc(sort_field), asc(Coach.id))
     
     # Pagination
-    total = query.count()
-    coaches = query.offset(skip).limit(limit).all()
+    rows = query.with_entities(
+        *projection_columns(Coach, selected, DERIVED_FIELDS)
+    ).offset(skip).limit(limit).all()
     
-    return {
+    response = store_response(redis_client, cache_key, PaginatedResponse[item_model], {
         "success": True,
-        "data": coaches,
+        "data": project_rows(rows, selected, DERIVED_FIELDS),
         "meta": {
-            "pagination": {
-                "page": (skip // limit) + 1,
-                "per_page": limit,
-                "total": total,
-                "total_pages": (total + limit - 1) // limit
-            }
+            "pagination": offset_pagination_meta(skip, limit, total, count_strategy)
         }
-    }
+    })
+    return set_validators(response, etag)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_coaches(
+    filters: CoachFilters = Depends(),
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="Export format: csv, ndjson"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated CoachResponse fields to export (default: all)"
+    ),
+    sort_by: str = Query("name", description=f"Sort field: {', '.join(KEYSET_SORT_FIELDS)}"),
+    sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort order: asc, desc"),
+    current_user: User = Depends(check_permission('coach', 'read'))
+) -> Any:
+    """Stream every coach matching the list filters as CSV or NDJSON"""
+    
+    selected = parse_fields(fields, CoachResponse) or tuple(CoachResponse.model_fields)
+    sort_field = KEYSET_SORT_FIELDS.get(sort_by)
+    if sort_field is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Export supports sort_by: {', '.join(KEYSET_SORT_FIELDS)}"
+        )
+    
+    # Sorting on a (column, id) index lets rows stream before the scan completes
+    direction = desc if sort_order == "desc" else asc
+    statement = filters.apply(
+        select(*projection_columns(Coach, selected, DERIVED_FIELDS)).where(Coach.is_active == True)
+    ).order_by(direction(sort_field), direction(Coach.id))
+    
+    return export_response(statement, selected, DERIVED_FIELDS, format, "coaches")
 
 @router.get("/{coach_id}", response_model=StandardResponse[CoachResponse])
 async def get_coach(
     coach_id: str,
+    request: Request,
     current_user: User = Depends(check_permission('coach', 'read')),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Get coach by ID"""
     
@@ -99,6 +373,30 @@ async def get_coach(
             detail="Invalid coach ID format"
         )
     
+    # Detail entries live under a per-coach generation so other writes keep
+    # them, and carry their validators, so hits and 304s run no SQL. age is
+    # derived from today's date, so the representation changes daily too
+    cache_key, cached = cached_response(
+        redis_client, f"coaches:{coach_uuid}", "coaches.detail", f"{coach_uuid}:{date.today()}"
+    )
+    etag, version = stored_validators(cached)
+    if etag is not None:
+        return not_modified(etag, version) if is_not_modified(request, etag, version) else cached
+    
+    # Conditional GET on a miss: validators come from one primary key probe,
+    # so a matching If-None-Match skips the row and serialization
+    version = db.query(changed_at(Coach)).filter(
+        and_(Coach.id == coach_uuid, Coach.is_active == True)
+    ).scalar()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Coach not found"
+        )
+    etag = entity_etag(coach_uuid, version, date.today())
+    if is_not_modified(request, etag, version):
+        return not_modified(etag, version)
+    
     coach = db.query(Coach).filter(
         and_(Coach.id == coach_uuid, Coach.is_active == True)
     ).first()
@@ -109,16 +407,21 @@ async def get_coach(
             detail="Coach not found"
         )
     
-    return {
+    return store_response(redis_client, cache_key, StandardResponse[CoachResponse], {
         "success": True,
         "data": coach
-    }
+    }, headers=validator_headers(etag, version))
 
 @router.post("", response_model=StandardResponse[CoachResponse])
 async def create_coach(
     coach_data: CoachCreate,
+    check_duplicates: bool = Query(
+        False,
+        description="Also report likely duplicates of the new coach in meta.possible_duplicates"
+    ),
     current_user: User = Depends(check_permission('coach', 'read')),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Create new coach"""
     
@@ -137,25 +440,101 @@ async def create_coach(
             detail="Coach with this name already exists at this club"
         )
     
+    possible_duplicates = None
+    if check_duplicates:
+        possible_duplicates = find_duplicates(
+            db, Coach, coach_data.name, coach_data.full_name, coach_data.date_of_birth,
+            coach_data.nationality, coach_data.current_club
+        )
+    
     coach = Coach(
         **coach_data.model_dump(exclude_unset=True),
         data_source="manual"
     )
     
     db.add(coach)
+    db.flush()
+    coach_performance.sync_coach(db, coach.id, coach.coaching_metrics)
     db.commit()
     db.refresh(coach)
+    bump_generation(redis_client, "coaches")
+    coach_similarity_index.mark_stale()
     
-    return {
+    response = {
         "success": True,
         "data": coach
     }
+    if possible_duplicates is not None:
+        response["meta"] = {"possible_duplicates": [DuplicateMatch(**match) for match in possible_duplicates]}
+    return response
+
+@router.post("/duplicates/scan", response_model=StandardResponse[JobResponse], status_code=status.HTTP_202_ACCEPTED)
+async def scan_duplicate_coaches(
+    current_user: User = Depends(check_permission('coach', 'delete')),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Start a background scan that clusters likely duplicate coaches; poll GET /jobs/{id} for the result"""
+    
+    # Scans feed merges, so they need the merge permission; a scan already
+    # running is shared rather than started again
+    job = job_registry.submit(
+        "duplicate_scan", "coach", scan_duplicates, Coach,
+        permission="delete", created_by=current_user.id, redis_client=redis_client, reuse_active=True
+    )
+    
+    return {
+        "success": True,
+        "data": job.as_dict()
+    }
+
+@router.post("/batch", response_model=StandardResponse[List[CoachResponse]])
+async def get_coaches_batch(
+    batch: BatchRequest,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated CoachResponse fields to return"
+    ),
+    view: str = Query("full", pattern="^(full|list)$", description="Response shape: full, list (compact rows)"),
+    current_user: User = Depends(check_permission('coach', 'read')),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Get up to MAX_BATCH_IDS coaches by ID in one query, in request order"""
+    
+    if fields is not None and view == "list":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either fields or view=list, not both"
+        )
+    if view == "list":
+        selected = LIST_VIEW_FIELDS
+    else:
+        selected = parse_fields(fields, CoachResponse) or tuple(CoachResponse.model_fields)
+    item_model = projection_model(CoachResponse, selected)
+    
+    # One array parameter, so every batch size shares a single statement
+    ids = list(dict.fromkeys(batch.ids))
+    rows = db.query(*projection_columns(Coach, selected, DERIVED_FIELDS)).filter(
+        Coach.id == any_(bindparam("ids", ids, type_=ARRAY(Coach.id.type))),
+        Coach.is_active == True
+    ).all()
+    
+    found = {row.id: row for row in rows}
+    return projected_response(StandardResponse[List[item_model]], {
+        "success": True,
+        "data": project_rows([found[coach_id] for coach_id in ids if coach_id in found], selected, DERIVED_FIELDS),
+        "meta": {
+            "requested": len(ids),
+            "found": len(found),
+            "missing_ids": [str(coach_id) for coach_id in ids if coach_id not in found]
+        }
+    })
 
 @router.put("/{coach_id}", response_model=StandardResponse[CoachResponse])
 async def update_coach(
     coach_id: str,
     coach_data: CoachUpdate,
     db: Session = Depends(get_db),
+    redis_client = Depends(get_redis),
     current_user: User = Depends(check_permission('coach', 'update'))
 ) -> Any:
     """Update coach information"""
@@ -184,9 +563,13 @@ async def update_coach(
     update_data = coach_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(coach, field, value)
+    if "coaching_metrics" in update_data:
+        coach_performance.sync_coach(db, coach.id, coach.coaching_metrics)
     
     db.commit()
     db.refresh(coach)
+    bump_generation(redis_client, "coaches", f"coaches:{coach_uuid}")
+    coach_similarity_index.mark_stale()
     
     return {
         "success": True,
@@ -198,7 +581,8 @@ async def update_coach(
 async def delete_coach(
     coach_id: str,
     current_user: User = Depends(check_permission('coach', 'delete')),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Soft delete coach (mark as inactive)"""
     
@@ -221,6 +605,8 @@ async def delete_coach(
     # Soft delete
     coach.is_active = False
     db.commit()
+    bump_generation(redis_client, "coaches", f"coaches:{coach_uuid}")
+    coach_similarity_index.mark_stale()
     
     return {
         "success": True,
@@ -228,13 +614,76 @@ async def delete_coach(
     }
 
 
-@router.get("/{coach_id}/similar", response_model=StandardResponse[List[CoachResponse]])
+@router.post("/{coach_id}/merge", response_model=StandardResponse[MergeReport])
+async def merge_coaches(
+    coach_id: str,
+    merge: MergeRequest,
+    current_user: User = Depends(check_permission('coach', 'delete')),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Merge duplicate coaches into this one: their shortlist items move here and they are deactivated"""
+    
+    try:
+        coach_uuid = uuid.UUID(coach_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid coach ID format"
+        )
+    
+    duplicate_ids = list(dict.fromkeys(merge.duplicate_ids))
+    if coach_uuid in duplicate_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A coach cannot be merged into itself"
+        )
+    
+    # Lock every coach involved, in id order, so concurrent merges and edits serialize
+    coaches = {
+        coach.id: coach
+        for coach in db.query(Coach).filter(
+            Coach.id.in_([coach_uuid, *duplicate_ids]),
+            Coach.is_active == True
+        ).order_by(Coach.id).with_for_update()
+    }
+    if coach_uuid not in coaches:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Coach not found"
+        )
+    missing = [str(duplicate_id) for duplicate_id in duplicate_ids if duplicate_id not in coaches]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Duplicate coaches not found: {', '.join(missing)}"
+        )
+    
+    report = merge_duplicates(
+        db, Coach, coaches[coach_uuid], [coaches[duplicate_id] for duplicate_id in duplicate_ids], current_user.id
+    )
+    db.commit()
+    bump_generation(
+        redis_client, "coaches", "shortlists",
+        *(f"coaches:{entity_id}" for entity_id in (coach_uuid, *duplicate_ids))
+    )
+    coach_similarity_index.mark_stale()
+    
+    return {
+        "success": True,
+        "data": report
+    }
+
+
+@router.get("/{coach_id}/similar", response_model=StandardResponse[List[SimilarCoachResponse]])
 async def get_similar_coaches(
     coach_id: str,
     limit: int = Query(5, ge=1, le=20),
-    db: Session = Depends(get_db)
+    same_role: bool = Query(True, description="Only match coaches in the same current role"),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
-    """Get coaches similar to the specified coach"""
+    """Get coaches similar to the specified coach, best match first, with the features that drove each match"""
     
     try:
         coach_uuid = uuid.UUID(coach_id)
@@ -254,19 +703,41 @@ async def get_similar_coaches(
             detail="Coach not found"
         )
     
-    # Find similar coaches
-    similar_query = db.query(Coach).filter(
-        and_(
+    # Weighted top-K over formations, tactical style, leadership, specialties and results
+    coach_similarity_index.ensure_fresh(db, redis_client)
+    matches = coach_similarity_index.similar(coach_uuid, limit, same_role=same_role)
+    
+    if matches is None:
+        # Nothing to encode for this coach: match on role and formation
+        similar_query = db.query(Coach).filter(
             Coach.id != coach_uuid,
             Coach.is_active == True,
-            Coach.current_role == target_coach.current_role,
             Coach.preferred_formation == target_coach.preferred_formation
         )
-    ).limit(limit)
+        if same_role:
+            similar_query = similar_query.filter(Coach.current_role == target_coach.current_role)
+        similar_coaches = similar_query.order_by(
+            Coach.overall_rating.desc().nullslast(), Coach.id
+        ).limit(limit).all()
+        return {
+            "success": True,
+            "data": similar_coaches
+        }
+    
+    coaches = db.query(Coach).filter(Coach.id.in_([match["id"] for match in matches])).all()
+    coaches_by_id = {coach.id: coach for coach in coaches}
     
-    similar_coaches = similar_query.all()
+    results = []
+    for match in matches:
+        coach = coaches_by_id.get(match["id"])
+        if coach is None:
+            continue
+        result = SimilarCoachResponse.model_validate(coach)
+        result.similarity_score = match["score"]
+        result.match_reasons = [CoachSimilarityReason(**reason) for reason in match["reasons"]]
+        results.append(result)
     
     return {
         "success": True,
-        "data": similar_coaches
+        "data": results
     }
\ No newline at end of file
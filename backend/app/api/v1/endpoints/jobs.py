@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any
+
+from app.core.database import get_redis
+from app.core.dependencies import get_current_user
+from app.core.exceptions import AuthorizationError
+from app.schemas.common import JobResponse, StandardResponse
+from app.models import User
+from app.services.jobs import job_registry
+
+router = APIRouter()
+
+@router.get("/{job_id}", response_model=StandardResponse[JobResponse])
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Status, progress and (once finished) result of a background job"""
+
+    job = job_registry.get(job_id, redis_client)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    # A job is visible to whoever holds the permission it was submitted
+    # under; records mirrored before permissions were stored need read
+    permission = job.get("permission", "read")
+    if not current_user.has_permission(job["resource"], permission):
+        raise AuthorizationError(
+            message="Entity not Authorized",
+            details=f"You don't have permission to {permission} {job['resource']}"
+        )
+
+    return {
+        "success": True,
+        "data": job
+    }
@@ -1,108 +1,512 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, func
-from typing import Any, List, Optional
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, any_, bindparam, case, or_, desc, asc, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from typing import Any, List, Optional, Union
+from datetime import date
+import io
 import uuid
 
 from app.core.dependencies import get_current_user, check_permission
-from app.core.database import get_db
-from app.schemas.player import PlayerResponse, PlayerCreate, PlayerUpdate
-from app.schemas.common import StandardResponse, PaginatedResponse
+from app.core.conditional import (
+    changed_at, entity_etag, is_not_modified, list_etag, not_modified, set_validators, stored_validators,
+    validator_headers
+)
+from app.core.cache import bump_generation, cached_response, filter_signature, store_response
+from app.core.config import settings
+from app.core.database import get_db, get_redis
+from app.core.export import export_response
+from app.core.filters import (
+    array_contains_all, array_overlaps, contains, parse_array_filters, parse_numeric_filters,
+    similarity_rank, text_search
+)
+from app.core.pagination import (
+    PAGINATION_PARAMS, count_rows, cursor_pagination_meta, facet_counts, keyset_paginate,
+    offset_pagination_meta, parse_facets
+)
+from app.core.projection import (
+    age_from_birth_date, parse_fields, project_rows, projected_response, projection_columns, projection_model
+)
+from app.schemas.player import (
+    PlayerResponse, PlayerCreate, PlayerUpdate, PlayerSearchResponse, SimilarPlayerResponse, PlayerImportReport,
+    PlayerAutocompleteResponse, PlayerBulkUpdateItem, PlayerBulkUpdateReport, ContractRadarResponse, PlayerPercentilesResponse,
+    LeaderboardEntry, MAX_BULK_UPDATE_ITEMS
+)
+from app.schemas.common import (
+    BatchRequest, DuplicateMatch, JobResponse, MergeReport, MergeRequest, StandardResponse, PaginatedResponse
+)
 from app.models import Player, User
+from app.models.player import PERFORMANCE_METRIC_KEYS, SEARCH_CONFIG, SEASON_STAT_KEYS, jsonb_number
+from app.services import contract_radar, leaderboard, player_events, player_percentiles, player_summary
+from app.services.autocomplete import autocomplete_index
+from app.services.duplicates import find_duplicates, merge_duplicates, scan_duplicates
+from app.services.jobs import job_registry
+from app.services.player_bulk_update import bulk_update_players, run_bulk_update_job
+from app.services.player_import import IMPORT_FORMATS, ImportFormatError, import_players
+from app.services.similarity import similarity_index, sql_similar_players
 
 router = APIRouter()
 
+# Sort keys usable with cursor pagination; each is backed by a (column, id) index
+KEYSET_SORT_FIELDS = {
+    "name": Player.name,
+    "market_value": Player.market_value_eur,
+    "market_value_eur": Player.market_value_eur,
+    "overall_rating": Player.overall_rating,
+    "potential_rating": Player.potential_rating,
+    "created_at": Player.created_at,
+}
+
+# Sort keys served by a keyset column scanned the opposite way: oldest
+# first is earliest birth date first
+INVERTED_SORT_FIELDS = {
+    "age": Player.date_of_birth,
+}
+
+# Columns matched by the `search` filter; each has a trigram GIN index
+SEARCH_COLUMNS = [Player.name, Player.full_name, Player.current_club]
+
+# ARRAY columns accepted by any_of/all_of; each has a GIN index
+ARRAY_FILTER_FIELDS = {
+    "secondary_positions": Player.secondary_positions,
+    "tags": Player.tags,
+    "strengths": Player.strengths,
+    "weaknesses": Player.weaknesses,
+}
+
+# Fields returned by view=list, drawn from the compact PlayerSearchResponse
+LIST_VIEW_FIELDS = (
+    "id", "name", "position", "current_club", "nationality", "age", "market_value_eur", "overall_rating"
+)
+
+# Response fields computed from other columns
+DERIVED_FIELDS = {
+    "age": ([Player.date_of_birth], lambda row: age_from_birth_date(row["date_of_birth"])),
+}
+
+# Market value bands, as (label, lower bound in EUR) in ascending order
+VALUE_BANDS = (
+    ("under_1m", 0),
+    ("1m_5m", 1_000_000),
+    ("5m_20m", 5_000_000),
+    ("20m_50m", 20_000_000),
+    ("50m_plus", 50_000_000),
+)
+
+# Fields accepted by facets=, as the expression each one groups by
+FACET_FIELDS = {
+    "position": Player.position,
+    "nationality": Player.nationality,
+    "current_club": Player.current_club,
+    "availability_status": Player.availability_status,
+    "value_band": case(
+        *((Player.market_value_eur >= lower, label) for label, lower in reversed(VALUE_BANDS[1:])),
+        (Player.market_value_eur.isnot(None), VALUE_BANDS[0][0])
+    ),
+}
+
+# Columns loaded for full-text search results (PlayerSearchResponse)
+SEARCH_RESULT_COLUMNS = [
+    Player.id, Player.name, Player.position, Player.current_club, Player.nationality,
+    Player.date_of_birth, Player.market_value_eur, Player.overall_rating, Player.scouting_notes
+]
+
+class PlayerFilters:
+    """List filters, shared by get_players and export_players"""
+    
+    def __init__(
+        self,
+        position: Optional[str] = Query(None, description="Filter by position"),
+        club: Optional[str] = Query(None, description="Filter by current club"),
+        nationality: Optional[str] = Query(None, description="Filter by nationality"),
+        min_value: Optional[int] = Query(None, description="Minimum market value in EUR"),
+        max_value: Optional[int] = Query(None, description="Maximum market value in EUR"),
+        min_age: Optional[int] = Query(None, ge=0, description="Minimum age in years"),
+        max_age: Optional[int] = Query(None, ge=0, description="Maximum age in years"),
+        search: Optional[str] = Query(None, description="Search players by name or club"),
+        any_of: Optional[List[str]] = Query(
+            None,
+            description="Array filter field:v1,v2 matching rows holding any value (repeatable)"
+        ),
+        all_of: Optional[List[str]] = Query(
+            None,
+            description="Array filter field:v1,v2 matching rows holding every value (repeatable)"
+        ),
+        min_stat: Optional[List[str]] = Query(
+            None,
+            description="Current season stat floor key:value, e.g. goals:10 (repeatable)"
+        ),
+        max_stat: Optional[List[str]] = Query(
+            None,
+            description="Current season stat ceiling key:value, e.g. red_cards:0 (repeatable)"
+        ),
+        min_metric: Optional[List[str]] = Query(
+            None,
+            description="Performance metric floor key:value, e.g. xG:0.4 (repeatable)"
+        ),
+        max_metric: Optional[List[str]] = Query(
+            None,
+            description="Performance metric ceiling key:value, e.g. xG:0.5 (repeatable)"
+        )
+    ):
+        self.position = position
+        self.club = club
+        self.nationality = nationality
+        self.min_value = min_value
+        self.max_value = max_value
+        self.min_age = min_age
+        self.max_age = max_age
+        self.search = search
+        # Parsed up front so a bad filter is a 400 before any response starts
+        self.any_of = parse_array_filters(any_of, ARRAY_FILTER_FIELDS)
+        self.all_of = parse_array_filters(all_of, ARRAY_FILTER_FIELDS)
+        self.min_stat = parse_numeric_filters(min_stat, SEASON_STAT_KEYS)
+        self.max_stat = parse_numeric_filters(max_stat, SEASON_STAT_KEYS)
+        self.min_metric = parse_numeric_filters(min_metric, PERFORMANCE_METRIC_KEYS)
+        self.max_metric = parse_numeric_filters(max_metric, PERFORMANCE_METRIC_KEYS)
+    
+    def apply(self, query, fuzzy_search: bool = False):
+        """Filter a Query or select() of players"""
+        if self.position:
+            query = query.filter(
+                or_(
+                    contains(Player.position, self.position),
+                    array_overlaps(Player.secondary_positions, {self.position, self.position.upper()})
+                )
+            )
+        
+        if self.club:
+            query = query.filter(contains(Player.current_club, self.club))
+        
+        if self.nationality:
+            query = query.filter(
+                or_(
+                    contains(Player.nationality, self.nationality),
+                    contains(Player.second_nationality, self.nationality)
+                )
+            )
+        
+        if self.min_value is not None:
+            query = query.filter(Player.market_value_eur >= self.min_value)
+        
+        if self.max_value is not None:
+            query = query.filter(Player.market_value_eur <= self.max_value)
+        
+        # Compiled to date_of_birth ranges, served by idx_players_age_position
+        if self.min_age is not None:
+            query = query.filter(Player.age >= self.min_age)
+        
+        if self.max_age is not None:
+            query = query.filter(Player.age <= self.max_age)
+        
+        # Array membership filters compile to && / @> so the GIN indexes apply
+        for column, values in self.any_of:
+            query = query.filter(array_overlaps(column, values))
+        
+        for column, values in self.all_of:
+            query = query.filter(array_contains_all(column, values))
+        
+        # Stat/metric thresholds match the per-key jsonb_number() expression indexes
+        for key, threshold in self.min_stat:
+            query = query.filter(jsonb_number(Player.current_season_stats, key) >= threshold)
+        
+        for key, threshold in self.max_stat:
+            query = query.filter(jsonb_number(Player.current_season_stats, key) <= threshold)
+        
+        for key, threshold in self.min_metric:
+            query = query.filter(jsonb_number(Player.performance_metrics, key) >= threshold)
+        
+        for key, threshold in self.max_metric:
+            query = query.filter(jsonb_number(Player.performance_metrics, key) <= threshold)
+        
+        # Substring search, optionally typo-tolerant
+        if self.search:
+            query = query.filter(text_search(self.search, SEARCH_COLUMNS, fuzzy=fuzzy_search))
+        
+        return query
+
 @router.get("", response_model=PaginatedResponse[PlayerResponse])
 async def get_players(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of records to return"),
-    position: Optional[str] = Query(None, description="Filter by position"),
-    club: Optional[str] = Query(None, description="Filter by current club"),
-    nationality: Optional[str] = Query(None, description="Filter by nationality"),
-    min_value: Optional[int] = Query(None, description="Minimum market value in EUR"),
-    max_value: Optional[int] = Query(None, description="Maximum market value in EUR"),
-    search: Optional[str] = Query(None, description="Search players by name or club"),
-    sort_by: Optional[str] = Query("name", description="Sort field: name, market_value, overall_rating"),
+    filters: PlayerFilters = Depends(),
+    sort_by: Optional[str] = Query(
+        "name",
+        description="Sort field: name, market_value, overall_rating, age; relevance ranks typo-tolerant search matches"
+    ),
     sort_order: Optional[str] = Query("asc", description="Sort order: asc, desc"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from meta.next_cursor/prev_cursor; send an empty value to start cursor pagination"
+    ),
+    count: str = Query("exact", pattern="^(exact|estimated|cached)$", description="Total count strategy: exact, estimated, cached"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated PlayerResponse fields to return, e.g. name,position,market_value_eur"
+    ),
+    view: str = Query("full", pattern="^(full|list)$", description="Response shape: full, list (compact rows)"),
+    facets: Optional[str] = Query(
+        None,
+        description=f"Comma-separated fields to count matches per value for: {', '.join(FACET_FIELDS)}"
+    ),
     current_user: User = Depends(check_permission('player', 'read')),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Get players with advanced filtering, search, and pagination"""
     
+    # Response shape: only the selected fields' columns are read from the table
+    if fields is not None and view == "list":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either fields or view=list, not both"
+        )
+    if view == "list":
+        schema, selected = PlayerSearchResponse, LIST_VIEW_FIELDS
+    else:
+        schema, selected = PlayerResponse, parse_fields(fields, PlayerResponse) or tuple(PlayerResponse.model_fields)
+    item_model = projection_model(schema, selected)
+    requested_facets = parse_facets(facets, FACET_FIELDS)
+    
     # Base query
     query = db.query(Player).filter(Player.is_active == True)
     
-    # Apply filters
-    if position:
-        query = query.filter(
-            or_(
-                Player.position.ilike(f"%{position}%"),
-                func.array_to_string(Player.secondary_positions, ',').ilike(f"%{position}%")
-            )
+    # Apply filters; relevance sorting also admits near misses ("Haalnd")
+    query = filters.apply(query, fuzzy_search=sort_by == "relevance")
+    
+    # Conditional GET: every query parameter (paging included) plus the
+    # generation writes bump identify this representation, so 304s and cache
+    # hits run no SQL; without Redis an aggregate of the filtered set stands in
+    signature = filter_signature(request.query_params)
+    etag, generation, aggregate = list_etag(
+        redis_client, "players", signature,
+        query.with_entities(func.max(changed_at(Player)), func.count()),
+        date.today()
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
+    # Serve repeated queries from the response cache
+    cache_key, cached = cached_response(
+        redis_client, "players",
+        "players.cursor" if cursor is not None else "players.list",
+        signature,
+        generation=generation
+    )
+    if cached is not None:
+        return set_validators(cached, etag)
+    
+    # Total count for pagination; the validator aggregate, when it ran, already counted exactly
+    if count == "exact" and aggregate is not None:
+        total, count_strategy = aggregate[1], "exact"
+    else:
+        total, count_strategy = count_rows(
+            query, count, db,
+            redis_client=redis_client,
+            namespace="players",
+            signature=filter_signature(request.query_params, exclude=PAGINATION_PARAMS)
         )
     
-    if club:
-        query = query.filter(Player.current_club.ilike(f"%{club}%"))
+    # Facet counts: one GROUPING SETS query over the filtered set, same strategy as the total
+    facet_values, facet_strategy = facet_counts(
+        query, requested_facets, FACET_FIELDS, count, db,
+        redis_client=redis_client,
+        namespace="players",
+        signature=filter_signature(request.query_params, exclude=(*PAGINATION_PARAMS, "fields", "view"))
+    )
+    facet_meta = {"facets": facet_values, "facet_strategy": facet_strategy} if requested_facets else {}
     
-    if nationality:
-        query = query.filter(
-            or_(
-                Player.nationality.ilike(f"%{nationality}%"),
-                Player.second_nationality.ilike(f"%{nationality}%")
+    # Cursor mode: seek past the last row instead of skipping rows
+    if cursor is not None:
+        sort_field = KEYSET_SORT_FIELDS.get(sort_by)
+        descending = sort_order.lower() == "desc"
+        if sort_by in INVERTED_SORT_FIELDS:
+            sort_field, descending = INVERTED_SORT_FIELDS[sort_by], not descending
+        if sort_field is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cursor pagination supports sort_by: {', '.join([*KEYSET_SORT_FIELDS, *INVERTED_SORT_FIELDS])}"
             )
+        
+        # Plain column rows skip entity construction and the identity map
+        rows, next_cursor, prev_cursor = keyset_paginate(
+            query.with_entities(*projection_columns(Player, selected, DERIVED_FIELDS, extra=[sort_field])),
+            sort_key=sort_by,
+            sort_column=sort_field,
+            id_column=Player.id,
+            descending=descending,
+            cursor=cursor or None,
+            limit=limit
         )
+        
+        response = store_response(redis_client, cache_key, PaginatedResponse[item_model], {
+            "success": True,
+            "data": project_rows(rows, selected, DERIVED_FIELDS),
+            "meta": {
+                "pagination": cursor_pagination_meta(limit, total, count_strategy),
+                "next_cursor": next_cursor,
+                "prev_cursor": prev_cursor,
+                **facet_meta
+            }
+        })
+        return set_validators(response, etag)
     
-    if min_value is not None:
-        query = query.filter(Player.market_value_eur >= min_value)
+    # Apply sorting (id breaks ties so pages are stable)
+    sort_field = KEYSET_SORT_FIELDS.get(sort_by) or getattr(Player, sort_by, Player.name)
+    descending = sort_order.lower() == "desc"
+    if sort_by in INVERTED_SORT_FIELDS:
+        sort_field, descending = INVERTED_SORT_FIELDS[sort_by], not descending
+    if sort_by == "relevance" and filters.search:
+        query = query.order_by(desc(similarity_rank(filters.search, SEARCH_COLUMNS)), asc(Player.id))
+    elif descending:
+        query = query.order_by(desc(sort_field), desc(Player.id))
+    else:
+        query = query.order_by(asc(sort_field), asc(Player.id))
     
-    if max_value is not None:
-        query = query.filter(Player.market_value_eur <= max_value)
+    # Apply pagination
+    rows = query.with_entities(
+        *projection_columns(Player, selected, DERIVED_FIELDS)
+    ).offset(skip).limit(limit).all()
     
-    # Full-text search
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Player.name.ilike(search_term),
-                Player.full_name.ilike(search_term),
-                Player.current_club.ilike(search_term)
-            )
+    response = store_response(redis_client, cache_key, PaginatedResponse[item_model], {
+        "success": True,
+        "data": project_rows(rows, selected, DERIVED_FIELDS),
+        "meta": {
+            "pagination": offset_pagination_meta(skip, limit, total, count_strategy),
+            **facet_meta
+        }
+    })
+    return set_validators(response, etag)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_players(
+    filters: PlayerFilters = Depends(),
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="Export format: csv, ndjson"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated PlayerResponse fields to export (default: all)"
+    ),
+    sort_by: str = Query("name", description=f"Sort field: {', '.join(KEYSET_SORT_FIELDS)}"),
+    sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort order: asc, desc"),
+    current_user: User = Depends(check_permission('player', 'read'))
+) -> Any:
+    """Stream every player matching the list filters as CSV or NDJSON"""
+    
+    selected = parse_fields(fields, PlayerResponse) or tuple(PlayerResponse.model_fields)
+    sort_field = KEYSET_SORT_FIELDS.get(sort_by)
+    if sort_field is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Export supports sort_by: {', '.join(KEYSET_SORT_FIELDS)}"
         )
     
-    # Apply sorting
-    sort_field = getattr(Player, sort_by, Player.name)
-    if sort_order.lower() == "desc":
-        query = query.order_by(desc(sort_field))
-    else:
-        query = query.order_by(asc(sort_field))
+    # Sorting on a (column, id) index lets rows stream before the scan completes
+    direction = desc if sort_order == "desc" else asc
+    statement = filters.apply(
+        select(*projection_columns(Player, selected, DERIVED_FIELDS)).where(Player.is_active == True)
+    ).order_by(direction(sort_field), direction(Player.id))
     
-    # Get total count for pagination
-    total = query.count()
+    return export_response(statement, selected, DERIVED_FIELDS, format, "players")
+
+@router.get("/autocomplete", response_model=StandardResponse[List[PlayerAutocompleteResponse]])
+async def autocomplete_players(
+    q: str = Query(..., min_length=1, max_length=100, description="Name prefix, e.g. haal"),
+    limit: int = Query(10, ge=1, le=25, description="Number of suggestions"),
+    current_user: User = Depends(check_permission('player', 'read')),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Suggest players whose name, or a word of it, starts with q (accents and case ignored)"""
     
-    # Apply pagination
-    players = query.offset(skip).limit(limit).all()
+    # Served from the in-process prefix index, which follows player writes
+    autocomplete_index.ensure_fresh(db, redis_client)
+    
+    return {
+        "success": True,
+        "data": [suggestion._asdict() for suggestion in autocomplete_index.search(q, limit)]
+    }
+
+@router.get("/contract-radar", response_model=StandardResponse[ContractRadarResponse])
+async def get_contract_radar(
+    months: int = Query(12, ge=1, le=settings.CONTRACT_RADAR_MAX_MONTHS, description="Months ahead, the current one included"),
+    position: Optional[str] = Query(None, description="Only this position"),
+    top: int = Query(5, ge=0, le=settings.CONTRACT_RADAR_TOP_PLAYERS, description="Most valuable players listed per bucket"),
+    value_band: Optional[str] = Query(
+        None,
+        pattern=f"^({'|'.join([*(name for name, _, _ in contract_radar.VALUE_BANDS), contract_radar.UNKNOWN_BAND])})$",
+        description="Only players in this market value band, e.g. 5m_20m, or unknown"
+    ),
+    current_user: User = Depends(check_permission('player', 'read')),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Active players whose contracts expire in the coming months, by expiry month and position"""
     
-    # Calculate pagination metadata
-    total_pages = (total + limit - 1) // limit
-    current_page = (skip // limit) + 1
+    # Aggregated once for the whole horizon and cached until a radar column changes
+    radar = contract_radar.get_radar(db, redis_client)
     
     return {
         "success": True,
-        "data": players,
-        "meta": {
-            "pagination": {
-                "page": current_page,
-                "per_page": limit,
-                "total": total,
-                "total_pages": total_pages
+        "data": contract_radar.radar_view(radar, months, position, top, value_band)
+    }
+
+@router.get("/leaderboard", response_model=StandardResponse[List[LeaderboardEntry]])
+async def get_leaderboard(
+    metric: str = Query(..., description="Season stat, performance metric or rating, e.g. xG, goals, overall_rating"),
+    position: Optional[str] = Query(None, description="Rank within this position, e.g. ST; all positions when omitted"),
+    limit: int = Query(50, ge=1, le=settings.LEADERBOARD_DEPTH),
+    skip: int = Query(0, ge=0, le=settings.LEADERBOARD_DEPTH),
+    current_user: User = Depends(check_permission('player', 'read')),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Top players by a metric, with rank and value changes since the previous leaderboard refresh"""
+    
+    if metric not in leaderboard.METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown metric; use one of: {', '.join(leaderboard.METRICS)}"
+        )
+    
+    # Read from the scheduled rankings. Before the first refresh has finished
+    # the answer is empty while a background build (the scheduled one when
+    # it is running) fills them in
+    refreshed_at = leaderboard.last_refreshed(db)
+    if refreshed_at is None:
+        job = job_registry.submit(
+            "leaderboard_refresh", "player", leaderboard.run_refresh_job,
+            redis_client=redis_client, reuse_active=True
+        )
+        return {
+            "success": True,
+            "data": [],
+            "meta": {
+                "metric": metric,
+                "position": position,
+                "refreshed_at": None,
+                "building": True,
+                "job_id": job.id
             }
         }
+    
+    return {
+        "success": True,
+        "data": leaderboard.read_leaderboard(db, metric, position or leaderboard.ALL_POSITIONS, limit, skip),
+        "meta": {
+            "metric": metric,
+            "position": position,
+            "refreshed_at": refreshed_at
+        }
     }
 
 @router.get("/{player_id}", response_model=StandardResponse[PlayerResponse])
 async def get_player(
     player_id: str,
+    request: Request,
     db: Session = Depends(get_db),
+    redis_client = Depends(get_redis),
     current_user: User = Depends(check_permission('player', 'read'))
 ) -> Any:
     """Get player by ID with full details"""
@@ -115,6 +519,30 @@ async def get_player(
             detail="Invalid player ID format"
         )
     
+    # Detail entries live under a per-player generation so other writes keep
+    # them, and carry their validators, so hits and 304s run no SQL. age is
+    # derived from today's date, so the representation changes daily too
+    cache_key, cached = cached_response(
+        redis_client, f"players:{player_uuid}", "players.detail", f"{player_uuid}:{date.today()}"
+    )
+    etag, version = stored_validators(cached)
+    if etag is not None:
+        return not_modified(etag, version) if is_not_modified(request, etag, version) else cached
+    
+    # Conditional GET on a miss: validators come from one primary key probe,
+    # so a matching If-None-Match skips the row and serialization
+    version = db.query(changed_at(Player)).filter(
+        and_(Player.id == player_uuid, Player.is_active == True)
+    ).scalar()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Player not found"
+        )
+    etag = entity_etag(player_uuid, version, date.today())
+    if is_not_modified(request, etag, version):
+        return not_modified(etag, version)
+    
     player = db.query(Player).filter(
         and_(
             Player.id == player_uuid,
@@ -128,16 +556,21 @@ async def get_player(
             detail="Player not found"
         )
     
-    return {
+    return store_response(redis_client, cache_key, StandardResponse[PlayerResponse], {
         "success": True,
         "data": player
-    }
+    }, headers=validator_headers(etag, version))
 
 @router.post("", response_model=StandardResponse[PlayerResponse])
 async def create_player(
     player_data: PlayerCreate,
+    check_duplicates: bool = Query(
+        False,
+        description="Also report likely duplicates of the new player in meta.possible_duplicates"
+    ),
     current_user: User = Depends(check_permission('player', 'create')),
     db: Session = Depends(get_db),
+    redis_client = Depends(get_redis),
     # current_user: User = Depends(get_current_user),
   
 ) -> Any:
@@ -158,6 +591,13 @@ async def create_player(
             detail="Player with this name already exists at this club"
         )
     
+    possible_duplicates = None
+    if check_duplicates:
+        possible_duplicates = find_duplicates(
+            db, Player, player_data.name, player_data.full_name, player_data.date_of_birth,
+            player_data.nationality, player_data.current_club
+        )
+    
     # Create new player
     player = Player(
         **player_data.model_dump(exclude_unset=True),
@@ -166,19 +606,164 @@ async def create_player(
     )
     
     db.add(player)
+    db.flush()  # Apply column defaults (is_active) before snapshotting
+    player_events.record_changes(db, [(None, player_events.snapshot(player))])
     db.commit()
     db.refresh(player)
+    player_events.players_committed(redis_client)
     
-    return {
+    response = {
         "success": True,
         "data": player
     }
+    if possible_duplicates is not None:
+        response["meta"] = {"possible_duplicates": [DuplicateMatch(**match) for match in possible_duplicates]}
+    return response
+
+@router.post("/duplicates/scan", response_model=StandardResponse[JobResponse], status_code=status.HTTP_202_ACCEPTED)
+async def scan_duplicate_players(
+    current_user: User = Depends(check_permission('player', 'delete')),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Start a background scan that clusters likely duplicate players; poll GET /jobs/{id} for the result"""
+    
+    # Scans feed merges, so they need the merge permission; a scan already
+    # running is shared rather than started again
+    job = job_registry.submit(
+        "duplicate_scan", "player", scan_duplicates, Player,
+        permission="delete", created_by=current_user.id, redis_client=redis_client, reuse_active=True
+    )
+    
+    return {
+        "success": True,
+        "data": job.as_dict()
+    }
+
+# A plain def: FastAPI runs the blocking read, COPY and upsert in its threadpool
+@router.post("/import", response_model=StandardResponse[PlayerImportReport])
+def import_players_file(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one JSON object per line)"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Upload format; inferred from the file name when omitted"),
+    current_user: User = Depends(check_permission('player', 'create')),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Bulk create or update players from a CSV or NDJSON upload"""
+    
+    import_format = format
+    if import_format is None and file.filename:
+        suffix = file.filename.rsplit(".", 1)[-1].lower()
+        import_format = "ndjson" if suffix in ("ndjson", "jsonl") else suffix
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown import format; pass format=csv or format=ndjson"
+        )
+    
+    # Read the spooled upload incrementally rather than loading it whole
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report, changes, updated_ids = import_players(db, stream, import_format, current_user.id)
+        player_events.record_changes(db, changes)
+        db.commit()
+    except ImportFormatError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    finally:
+        stream.detach()
+    
+    player_events.players_committed(redis_client, *updated_ids)
+    
+    return {
+        "success": True,
+        "data": report
+    }
+
+@router.post("/batch", response_model=StandardResponse[List[PlayerResponse]])
+async def get_players_batch(
+    batch: BatchRequest,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated PlayerResponse fields to return"
+    ),
+    view: str = Query("full", pattern="^(full|list)$", description="Response shape: full, list (compact rows)"),
+    current_user: User = Depends(check_permission('player', 'read')),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Get up to MAX_BATCH_IDS players by ID in one query, in request order"""
+    
+    if fields is not None and view == "list":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either fields or view=list, not both"
+        )
+    if view == "list":
+        schema, selected = PlayerSearchResponse, LIST_VIEW_FIELDS
+    else:
+        schema, selected = PlayerResponse, parse_fields(fields, PlayerResponse) or tuple(PlayerResponse.model_fields)
+    item_model = projection_model(schema, selected)
+    
+    # One array parameter, so every batch size shares a single statement
+    ids = list(dict.fromkeys(batch.ids))
+    rows = db.query(*projection_columns(Player, selected, DERIVED_FIELDS)).filter(
+        Player.id == any_(bindparam("ids", ids, type_=ARRAY(Player.id.type))),
+        Player.is_active == True
+    ).all()
+    
+    found = {row.id: row for row in rows}
+    return projected_response(StandardResponse[List[item_model]], {
+        "success": True,
+        "data": project_rows([found[player_id] for player_id in ids if player_id in found], selected, DERIVED_FIELDS),
+        "meta": {
+            "requested": len(ids),
+            "found": len(found),
+            "missing_ids": [str(player_id) for player_id in ids if player_id not in found]
+        }
+    })
+
+# A plain def: FastAPI runs the blocking row locks, updates and per-batch commits in its threadpool
+@router.patch("/bulk", response_model=StandardResponse[Union[PlayerBulkUpdateReport, JobResponse]])
+def bulk_update(
+    response: Response,
+    items: List[PlayerBulkUpdateItem] = Body(..., min_length=1, max_length=MAX_BULK_UPDATE_ITEMS),
+    current_user: User = Depends(check_permission('player', 'update')),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """
+    Update market values, ratings and contracts of many players at once.
+    
+    Send only the fields to change per player. Up to BULK_UPDATE_SYNC_MAX
+    players are applied before responding, with one outcome per id; larger
+    requests are accepted as a background job (202) to poll at GET /jobs/{id}.
+    """
+    
+    changes = [item.model_dump(exclude_unset=True) for item in items]
+    if len(changes) > settings.BULK_UPDATE_SYNC_MAX:
+        job = job_registry.submit(
+            "player_bulk_update", "player", run_bulk_update_job, changes, current_user.id, redis_client,
+            permission="update", created_by=current_user.id, redis_client=redis_client
+        )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {
+            "success": True,
+            "data": job.as_dict()
+        }
+    
+    return {
+        "success": True,
+        "data": bulk_update_players(db, changes, current_user.id, redis_client)
+    }
 
 @router.put("/{player_id}", response_model=StandardResponse[PlayerResponse])
 async def update_player(
     player_id: str,
     player_data: PlayerUpdate,
     db: Session = Depends(get_db),
+    redis_client = Depends(get_redis),
     current_user: User = Depends(check_permission('player', 'update'))
 ) -> Any:
     """Update player information"""
@@ -205,12 +790,15 @@ async def update_player(
         )
     
     # Update fields
+    before = player_events.snapshot(player)
     update_data = player_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(player, field, value)
     
+    player_events.record_changes(db, [(before, player_events.snapshot(player))])
     db.commit()
     db.refresh(player)
+    player_events.players_committed(redis_client, player_uuid, fields=update_data)
     
     return {
         "success": True,
@@ -221,7 +809,8 @@ async def update_player(
 async def delete_player(
     player_id: str,
     current_user: User = Depends(check_permission('player', 'delete')),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Soft delete player (mark as inactive)"""
     
@@ -242,19 +831,85 @@ async def delete_player(
         )
     
     # Soft delete
+    before = player_events.snapshot(player)
     player.is_active = False
+    player_events.record_changes(db, [(before, player_events.snapshot(player))])
     db.commit()
+    player_events.players_committed(redis_client, player_uuid)
     
     return {
         "success": True,
         "data": {"message": "Player deleted successfully"}
     }
 
-@router.get("/{player_id}/similar", response_model=StandardResponse[List[PlayerResponse]])
+@router.post("/{player_id}/merge", response_model=StandardResponse[MergeReport])
+async def merge_players(
+    player_id: str,
+    merge: MergeRequest,
+    current_user: User = Depends(check_permission('player', 'delete')),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Merge duplicate players into this one: their shortlist items move here and they are deactivated"""
+    
+    try:
+        player_uuid = uuid.UUID(player_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid player ID format"
+        )
+    
+    duplicate_ids = list(dict.fromkeys(merge.duplicate_ids))
+    if player_uuid in duplicate_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A player cannot be merged into itself"
+        )
+    
+    # Lock every player involved, in id order, so concurrent merges and edits serialize
+    players = {
+        player.id: player
+        for player in db.query(Player).filter(
+            Player.id.in_([player_uuid, *duplicate_ids]),
+            Player.is_active == True
+        ).order_by(Player.id).with_for_update()
+    }
+    if player_uuid not in players:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Player not found"
+        )
+    missing = [str(duplicate_id) for duplicate_id in duplicate_ids if duplicate_id not in players]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Duplicate players not found: {', '.join(missing)}"
+        )
+    
+    duplicates = [players[duplicate_id] for duplicate_id in duplicate_ids]
+    before = [player_events.snapshot(duplicate) for duplicate in duplicates]
+    report = merge_duplicates(db, Player, players[player_uuid], duplicates, current_user.id)
+    player_events.record_changes(db, zip(before, [player_events.snapshot(duplicate) for duplicate in duplicates]))
+    db.commit()
+    player_events.players_committed(redis_client, player_uuid, *duplicate_ids)
+    bump_generation(redis_client, "shortlists")
+    
+    return {
+        "success": True,
+        "data": report
+    }
+
+@router.get("/{player_id}/similar", response_model=StandardResponse[List[SimilarPlayerResponse]])
 async def get_similar_players(
     player_id: str,
     limit: int = Query(5, ge=1, le=20),
+    min_value: Optional[int] = Query(None, ge=0, description="Minimum market value in EUR"),
+    max_value: Optional[int] = Query(None, ge=0, description="Maximum market value in EUR"),
+    min_age: Optional[int] = Query(None, ge=0, description="Minimum age"),
+    max_age: Optional[int] = Query(None, ge=0, description="Maximum age"),
     db: Session = Depends(get_db),
+    redis_client = Depends(get_redis),
     current_user: User = Depends(check_permission('player', 'read'))
 ) -> Any:
     """Get players similar to the specified player"""
@@ -278,113 +933,178 @@ async def get_similar_players(
             detail="Player not found"
         )
     
-    # Find similar players based on position, age, and market value
-    similar_query = db.query(Player).filter(
-        and_(
-            Player.id != player_uuid,
-            Player.is_active == True,
-            Player.position == target_player.position
-        )
+    # Cosine top-K over similarity vectors within the player's position
+    similarity_index.ensure_fresh(db, redis_client)
+    matches = similarity_index.similar(
+        player_uuid, limit,
+        min_value=min_value, max_value=max_value, min_age=min_age, max_age=max_age
     )
     
-    # Add age similarity (within 3 years)
-    if target_player.date_of_birth:
-        similar_query = similar_query.filter(
-            func.abs(
-                func.extract('year', func.age(Player.date_of_birth)) - 
-                func.extract('year', func.age(target_player.date_of_birth))
-            ) <= 3
-        )
-    
-    # Add market value similarity (within 50% range)
-    if target_player.market_value_eur:
-        min_value = target_player.market_value_eur * 0.5
-        max_value = target_player.market_value_eur * 1.5
-        similar_query = similar_query.filter(
-            and_(
-                Player.market_value_eur >= min_value,
-                Player.market_value_eur <= max_value
-            )
+    if matches is None:
+        # No vector for this player: match on position, age and market value
+        similar_players = sql_similar_players(
+            db, target_player, limit,
+            min_value=min_value, max_value=max_value, min_age=min_age, max_age=max_age
+        )
+        return {
+            "success": True,
+            "data": similar_players
+        }
+    
+    players = db.query(Player).filter(Player.id.in_([match_id for match_id, _ in matches])).all()
+    players_by_id = {player.id: player for player in players}
+    
+    results = []
+    for match_id, score in matches:
+        player = players_by_id.get(match_id)
+        if player is None:
+            continue
+        result = SimilarPlayerResponse.model_validate(player)
+        result.similarity_score = round(score, 6)
+        results.append(result)
+    
+    return {
+        "success": True,
+        "data": results
+    }
+
+@router.get("/{player_id}/percentiles", response_model=StandardResponse[PlayerPercentilesResponse])
+async def get_player_percentiles(
+    player_id: str,
+    current_user: User = Depends(check_permission('player', 'read')),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Percentile ranks of the player's stats, metrics, ratings and value among players of the same position"""
+    
+    try:
+        player_uuid = uuid.UUID(player_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid player ID format"
+        )
+    
+    player = db.query(Player).filter(
+        and_(Player.id == player_uuid, Player.is_active == True)
+    ).first()
+    
+    if not player:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Player not found"
         )
     
-    # Order by market value similarity and limit results
-    similar_players = similar_query.order_by(
-        func.abs(Player.market_value_eur - target_player.market_value_eur)
-    ).limit(limit).all()
+    # Served as stored; the scheduled refresh recomputes positions writes changed
+    return {
+        "success": True,
+        "data": player_percentiles.player_percentiles(db, player)
+    }
+
+@router.post("/percentiles/refresh", response_model=StandardResponse[JobResponse], status_code=status.HTTP_202_ACCEPTED)
+async def refresh_player_percentiles(
+    current_user: User = Depends(check_permission('player', 'update')),
+    redis_client = Depends(get_redis)
+) -> Any:
+    """Start a background recompute of every position whose percentiles are out of date"""
+    
+    job = job_registry.submit(
+        "percentile_refresh", "player", player_percentiles.run_refresh_job,
+        created_by=current_user.id, redis_client=redis_client, reuse_active=True
+    )
     
     return {
         "success": True,
-        "data": similar_players
+        "data": job.as_dict()
     }
 
-@router.get("/search/advanced")
+@router.get("/search/advanced", response_model=PaginatedResponse[PlayerSearchResponse])
 async def advanced_search(
-    query: str = Query(..., description="Search query"),
+    request: Request,
+    query: str = Query(
+        ...,
+        min_length=1,
+        description='Search query in web search syntax: "quoted phrases", OR, -excluded'
+    ),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    count: str = Query("exact", pattern="^(exact|estimated|cached)$", description="Total count strategy: exact, estimated, cached"),
     db: Session = Depends(get_db),
+    redis_client = Depends(get_redis),
     current_user: User = Depends(check_permission('player', 'read'))
     
 ) -> Any:
     """Advanced full-text search using PostgreSQL features"""
     
-    # Use PostgreSQL full-text search
-    players = db.query(Player).filter(
+    # Match against the stored, GIN-indexed search_vector
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    matches = db.query(Player).filter(
         and_(
-            Player.search_vector.match(query),
+            Player.search_vector.op('@@')(ts_query),
             Player.is_active == True
         )
-    ).order_by(
-        func.ts_rank(Player.search_vector, func.plainto_tsquery(query)).desc()
-    ).limit(20).all()
+    )
+    
+    total, count_strategy = count_rows(
+        matches, count, db,
+        redis_client=redis_client,
+        namespace="players",
+        signature=filter_signature(request.query_params, exclude=PAGINATION_PARAMS)
+    )
+    
+    # Rank and page first so snippets are only built for the returned rows
+    rank = func.ts_rank_cd(Player.search_vector, ts_query)
+    page = matches.with_entities(
+        Player.id.label("id"),
+        rank.label("match_score")
+    ).order_by(desc(rank), asc(Player.id)).offset(skip).limit(limit).subquery()
+    
+    headline = func.ts_headline(
+        SEARCH_CONFIG,
+        Player.scouting_notes,
+        ts_query,
+        "MaxFragments=2, MinWords=5, MaxWords=20, StartSel=<mark>, StopSel=</mark>"
+    )
+    rows = db.query(Player, page.c.match_score, headline.label("headline")).options(
+        load_only(*SEARCH_RESULT_COLUMNS)
+    ).join(
+        page, page.c.id == Player.id
+    ).order_by(desc(page.c.match_score), asc(Player.id)).all()
+    
+    results = []
+    for player, match_score, snippet in rows:
+        result = PlayerSearchResponse.model_validate(player)
+        result.match_score = round(float(match_score), 6)
+        result.headline = snippet if player.scouting_notes else None
+        results.append(result)
     
     return {
         "success": True,
-        "data": players,
+        "data": results,
         "meta": {
             "search_query": query,
-            "results_count": len(players)
+            "results_count": len(results),
+            "pagination": offset_pagination_meta(skip, limit, total, count_strategy)
         }
     }
 
 @router.get("/stats/summary")
 async def get_players_summary(
+    response: Response,
+    top: int = Query(10, ge=1, le=50, description="Entries in the nationality and club breakdowns"),
     db: Session = Depends(get_db),
     current_user: User = Depends(check_permission('player', 'read'))
 ) -> Any:
     """Get summary statistics for all players"""
     
-    stats = db.query(
-        func.count(Player.id).label('total_players'),
-        func.count(func.distinct(Player.nationality)).label('total_nationalities'),
-        func.count(func.distinct(Player.current_club)).label('total_clubs'),
-        func.count(func.distinct(Player.position)).label('total_positions'),
-        func.avg(Player.market_value_eur).label('avg_market_value'),
-        func.max(Player.market_value_eur).label('max_market_value'),
-        func.min(Player.market_value_eur).label('min_market_value')
-    ).filter(Player.is_active == True).first()
-    
-    # Position breakdown
-    position_stats = db.query(
-        Player.position,
-        func.count(Player.id).label('count')
-    ).filter(
-        Player.is_active == True
-    ).group_by(Player.position).all()
+    # Served from the incrementally maintained rollup, not the players table
+    data, as_of = player_summary.read_summary(db, top)
+    if as_of:
+        response.headers["X-Summary-As-Of"] = as_of.isoformat()
     
     return {
         "success": True,
-        "data": {
-            "overview": {
-                "total_players": stats.total_players,
-                "total_nationalities": stats.total_nationalities,
-                "total_clubs": stats.total_clubs,
-                "total_positions": stats.total_positions,
-                "avg_market_value_eur": int(stats.avg_market_value) if stats.avg_market_value else 0,
-                "max_market_value_eur": stats.max_market_value,
-                "min_market_value_eur": stats.min_market_value
-            },
-            "position_breakdown": [
-                {"position": pos, "count": count} 
-                for pos, count in position_stats
-            ]
+        "data": data,
+        "meta": {
+            "as_of": as_of.isoformat() if as_of else None
         }
-    }
\ No newline at end of file
+    }
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, func
 from typing import Any, Optional
 import uuid
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
+from app.core.cache import bump_generation, filter_signature
+from app.core.conditional import (
+    changed_at, entity_etag, is_not_modified, list_etag, not_modified, set_validators
+)
+from app.core.database import get_db, get_redis
+from app.core.pagination import PAGINATION_PARAMS, count_rows, offset_pagination_meta
 from app.schemas.report import ReportResponse, ReportCreate
 from app.schemas.common import StandardResponse, PaginatedResponse
 from app.models import Report
@@ -14,11 +19,15 @@ router = APIRouter()
 
 @router.get("", response_model=PaginatedResponse[ReportResponse])
 async def get_reports(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     type: Optional[str] = Query(None, description="Filter by report type"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    count: str = Query("exact", pattern="^(exact|estimated|cached)$", description="Total count strategy: exact, estimated, cached"),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Get user's reports with filtering"""
     
@@ -31,30 +40,44 @@ async def get_reports(
     if status:
         query = query.filter(Report.status == status)
     
+    # Conditional GET: every parameter plus the generation report writes bump;
+    # without Redis, newest change and size of the filtered set
+    etag, _, aggregate = list_etag(
+        redis_client, "reports", filter_signature(request.query_params),
+        query.with_entities(func.max(changed_at(Report)), func.count())
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_validators(response, etag)
+    
     # Order by creation date (newest first)
     query = query.order_by(desc(Report.created_at))
     
-    # Pagination
-    total = query.count()
+    # Pagination; the validator aggregate, when it ran, already counted exactly
+    if count == "exact" and aggregate is not None:
+        total, count_strategy = aggregate[1], "exact"
+    else:
+        total, count_strategy = count_rows(
+            query, count, db,
+            redis_client=redis_client,
+            namespace="reports",
+            signature=filter_signature(request.query_params, exclude=PAGINATION_PARAMS)
+        )
     reports = query.offset(skip).limit(limit).all()
     
     return {
         "success": True,
         "data": reports,
         "meta": {
-            "pagination": {
-                "page": (skip // limit) + 1,
-                "per_page": limit,
-                "total": total,
-                "total_pages": (total + limit - 1) // limit
-            }
+            "pagination": offset_pagination_meta(skip, limit, total, count_strategy)
         }
     }
 
 @router.post("", response_model=StandardResponse[ReportResponse])
 async def generate_report(
     report_data: ReportCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Generate new report (async processing)"""
     
@@ -77,6 +100,7 @@ async def generate_report(
     # For now, we'll just mark as generating
     report.status = "generating"
     db.commit()
+    bump_generation(redis_client, "reports")
     
     return {
         "success": True,
@@ -86,6 +110,8 @@ async def generate_report(
 @router.get("/{report_id}", response_model=StandardResponse[ReportResponse])
 async def get_report(
     report_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ) -> Any:
     """Get report details"""
@@ -113,6 +139,13 @@ async def get_report(
             detail="Report has expired"
         )
     
+    # Conditional GET: checked after the expiry so expired reports still answer 410
+    last_modified = report.updated_at or report.created_at
+    etag = entity_etag(report.id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_validators(response, etag, last_modified)
+    
     return {
         "success": True,
         "data": report
@@ -172,7 +205,8 @@ async def download_report(
 @router.delete("/{report_id}")
 async def delete_report(
     report_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Delete report"""
     
@@ -196,6 +230,7 @@ async def delete_report(
     
     db.delete(report)
     db.commit()
+    bump_generation(redis_client, "reports")
     
     return {
         "success": True,
@@ -1,28 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, func
 from typing import Any, List, Optional
 import uuid
 
-from app.core.database import get_db
+from app.core.cache import bump_generation, filter_signature
+from app.core.conditional import (
+    changed_at, entity_etag, is_not_modified, list_etag, not_modified, set_validators
+)
+from app.core.database import get_db, get_redis
+from app.core.pagination import PAGINATION_PARAMS, count_rows, offset_pagination_meta
 from app.schemas.shortlist import (
-    ShortlistResponse, ShortlistCreate, ShortlistUpdate,
+    ShortlistResponse, ShortlistSummaryResponse, ShortlistCreate, ShortlistUpdate,
     ShortlistItemResponse, ShortlistItemCreate, ShortlistItemUpdate
 )
 from app.schemas.common import StandardResponse, PaginatedResponse
 from app.models import Shortlist, ShortlistItem, Player, Coach
+from app.models.shortlist import ITEM_STATUSES
 
 router = APIRouter()
 
-@router.get("", response_model=PaginatedResponse[ShortlistResponse])
+# Shortlist columns of the list view; items are summarized, not loaded
+SUMMARY_COLUMNS = (
+    Shortlist.id, Shortlist.name, Shortlist.description, Shortlist.type,
+    Shortlist.status, Shortlist.priority, Shortlist.created_at
+)
+
+@router.get("", response_model=PaginatedResponse[ShortlistSummaryResponse])
 async def get_shortlists(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     type: Optional[str] = Query(None, description="Filter by type (player/coach)"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    count: str = Query("exact", pattern="^(exact|estimated|cached)$", description="Total count strategy: exact, estimated, cached"),
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
-    """Get user's shortlists with items count"""
+    """Get user's shortlists with item counts, estimated cost and item status breakdown"""
     
     query = db.query(Shortlist)
     
@@ -33,34 +49,76 @@ async def get_shortlists(
     if status:
         query = query.filter(Shortlist.status == status)
     
-    # Order by created date (newest first)
-    query = query.order_by(desc(Shortlist.created_at))
+    # Conditional GET: every parameter plus the generation shortlist and item
+    # writes bump; without Redis, newest change and size of the filtered
+    # shortlists and of their items (items_count changes with them)
+    etag, _, aggregate = list_etag(
+        redis_client, "shortlists", filter_signature(request.query_params),
+        query.outerjoin(Shortlist.items).with_entities(
+            func.count(func.distinct(Shortlist.id)),
+            func.max(changed_at(Shortlist)),
+            func.max(changed_at(ShortlistItem)),
+            func.count(ShortlistItem.id)
+        )
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_validators(response, etag)
     
-    # Pagination
-    total = query.count()
-    shortlists = query.offset(skip).limit(limit).all()
+    # Order by created date (newest first); id breaks ties so pages are stable
+    query = query.order_by(desc(Shortlist.created_at), desc(Shortlist.id))
     
-    # Add items count to each shortlist
-    for shortlist in shortlists:
-        shortlist.items_count = len(shortlist.items)
+    # Pagination; the validator aggregate, when it ran, already counted exactly
+    if count == "exact" and aggregate is not None:
+        total, count_strategy = aggregate[0], "exact"
+    else:
+        total, count_strategy = count_rows(
+            query, count, db,
+            redis_client=redis_client,
+            namespace="shortlists",
+            signature=filter_signature(request.query_params, exclude=PAGINATION_PARAMS)
+        )
+    
+    # One statement per page: the page's ids, their items aggregated in a
+    # grouped subquery, and the shortlist columns joined to both
+    page = query.with_entities(Shortlist.id).offset(skip).limit(limit).subquery()
+    summary = db.query(
+        ShortlistItem.shortlist_id,
+        func.count().label("items_count"),
+        func.sum(ShortlistItem.estimated_fee_eur).label("total_estimated_cost"),
+        *(func.count().filter(ShortlistItem.status == item_status).label(item_status) for item_status in ITEM_STATUSES)
+    ).filter(
+        ShortlistItem.shortlist_id.in_(db.query(page.c.id))
+    ).group_by(ShortlistItem.shortlist_id).subquery()
+    rows = db.query(*SUMMARY_COLUMNS, summary).join(
+        page, page.c.id == Shortlist.id
+    ).outerjoin(
+        summary, summary.c.shortlist_id == Shortlist.id
+    ).order_by(desc(Shortlist.created_at), desc(Shortlist.id)).all()
+    
+    shortlists = [
+        {
+            **{column.key: row._mapping[column.key] for column in SUMMARY_COLUMNS},
+            "items_count": row.items_count or 0,
+            "total_estimated_cost": row.total_estimated_cost or 0,
+            "status_counts": {item_status: row._mapping[item_status] or 0 for item_status in ITEM_STATUSES}
+        }
+        for row in rows
+    ]
     
     return {
         "success": True,
         "data": shortlists,
         "meta": {
-            "pagination": {
-                "page": (skip // limit) + 1,
-                "per_page": limit,
-                "total": total,
-                "total_pages": (total + limit - 1) // limit
-            }
+            "pagination": offset_pagination_meta(skip, limit, total, count_strategy)
         }
     }
 
 @router.post("", response_model=StandardResponse[ShortlistResponse])
 async def create_shortlist(
     shortlist_data: ShortlistCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Create new shortlist"""
     
@@ -72,6 +130,7 @@ async def create_shortlist(
     db.add(shortlist)
     db.commit()
     db.refresh(shortlist)
+    bump_generation(redis_client, "shortlists")
     
     return {
         "success": True,
@@ -81,6 +140,8 @@ async def create_shortlist(
 @router.get("/{shortlist_id}", response_model=StandardResponse[ShortlistResponse])
 async def get_shortlist(
     shortlist_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ) -> Any:
     """Get shortlist details with all items"""
@@ -93,6 +154,34 @@ async def get_shortlist(
             detail="Invalid shortlist ID format"
         )
     
+    # Conditional GET: the shortlist, its items and the players/coaches they
+    # show all feed the ETag, read in one aggregate before anything is loaded
+    versions = db.query(
+        changed_at(Shortlist),
+        func.count(ShortlistItem.id),
+        func.max(changed_at(ShortlistItem)),
+        func.max(changed_at(Player)),
+        func.max(changed_at(Coach))
+    ).select_from(Shortlist).outerjoin(
+        ShortlistItem, ShortlistItem.shortlist_id == Shortlist.id
+    ).outerjoin(
+        Player, Player.id == ShortlistItem.player_id
+    ).outerjoin(
+        Coach, Coach.id == ShortlistItem.coach_id
+    ).filter(Shortlist.id == shortlist_uuid).group_by(Shortlist.id).first()
+    
+    if not versions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Shortlist not found"
+        )
+    
+    # No Last-Modified: removing an item changes the shortlist without a newer timestamp
+    etag = entity_etag(shortlist_uuid, *versions)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_validators(response, etag)
+    
     # Load shortlist with items and related entities
     shortlist = db.query(Shortlist).options(
         joinedload(Shortlist.items).joinedload(ShortlistItem.player),
@@ -115,7 +204,7 @@ async def get_shortlist(
             "notes": item.notes,
             "scout_rating": item.scout_rating,
             "estimated_fee_eur": item.estimated_fee_eur,
-            "added_at": item.added_at
+            "added_at": item.created_at
         }
         
         if item.player:
@@ -138,15 +227,11 @@ async def get_shortlist(
         
         items_response.append(item_data)
     
-    # Add computed fields
-    shortlist.items_count = len(shortlist.items)
-    shortlist.total_estimated_cost = sum(
-        item.estimated_fee_eur for item in shortlist.items 
-        if item.estimated_fee_eur
-    )
-    
+    # Computed fields are read-only properties on the model, so they go in the payload
     response_data = {
         **shortlist.__dict__,
+        "items_count": len(shortlist.items),
+        "total_estimated_cost": shortlist.total_estimated_cost,
         "items": items_response
     }
     
@@ -159,7 +244,8 @@ async def get_shortlist(
 async def add_shortlist_item(
     shortlist_id: str,
     item_data: ShortlistItemCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Add item to shortlist"""
     
@@ -232,6 +318,7 @@ async def add_shortlist_item(
     
     db.add(shortlist_item)
     db.commit()
+    bump_generation(redis_client, "shortlists")
     db.refresh(shortlist_item)
     
     return {
@@ -247,7 +334,8 @@ async def update_shortlist_item(
     shortlist_id: str,
     item_id: str,
     item_data: ShortlistItemUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Update shortlist item"""
     
@@ -280,6 +368,7 @@ async def update_shortlist_item(
         setattr(item, field, value)
     
     db.commit()
+    bump_generation(redis_client, "shortlists")
     db.refresh(item)
     
     return {
@@ -293,7 +382,8 @@ async def update_shortlist_item(
 async def remove_shortlist_item(
     shortlist_id: str,
     item_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis)
 ) -> Any:
     """Remove item from shortlist"""
     
@@ -321,6 +411,7 @@ async def remove_shortlist_item(
     
     db.delete(item)
     db.commit()
+    bump_generation(redis_client, "shortlists")
     
     return {
         "success": True,
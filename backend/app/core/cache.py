@@ -0,0 +1,167 @@
+"""Redis cache helpers: filter signatures, generation-counter invalidation and response caching"""
+
+import hashlib
+import json
+import logging
+from collections import Counter
+from typing import Iterable, Mapping, Optional, Tuple
+
+import redis
+from fastapi import Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Response cache outcomes per endpoint, counted by this process
+_response_stats = Counter()
+
+
+def filter_signature(params, exclude: Iterable[str] = ()) -> str:
+    """
+    Stable hash of a request's filter parameters.
+
+    Parameter order, repeated-value order and empty values don't change the
+    signature, so equivalent queries share cache entries.
+    """
+    excluded = set(exclude)
+    items = params.multi_items() if hasattr(params, "multi_items") else params.items()
+
+    normalized = {}
+    for key, value in items:
+        if key in excluded or value is None or str(value).strip() == "":
+            continue
+        normalized.setdefault(key, []).append(str(value).strip())
+
+    canonical = json.dumps(
+        {key: sorted(values) for key, values in sorted(normalized.items())},
+        separators=(",", ":")
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def _generation_key(namespace: str) -> str:
+    return f"gen:{namespace}"
+
+
+def get_generation(redis_client, namespace: str) -> Optional[int]:
+    """Current generation of a namespace, or None when Redis is unavailable"""
+    if redis_client is None:
+        return None
+    try:
+        return int(redis_client.get(_generation_key(namespace)) or 0)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to read cache generation for {namespace}: {e}")
+        return None
+
+
+def bump_generation(redis_client, *namespaces: str) -> None:
+    """
+    Invalidate every key built from the given namespaces in O(1).
+
+    Keys embed the generation they were written under, so incrementing it
+    orphans the old entries and lets their TTL reclaim them.
+    """
+    if redis_client is None or not namespaces:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for namespace in namespaces:
+            pipe.incr(_generation_key(namespace))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to bump cache generation for {namespaces}: {e}")
+
+
+def cache_get(redis_client, key: str) -> Optional[str]:
+    """Read a key, treating Redis errors as a miss"""
+    if redis_client is None:
+        return None
+    try:
+        return redis_client.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+
+
+def cache_set(redis_client, key: str, value, ttl_seconds: int) -> None:
+    """Write a key with a TTL, ignoring Redis errors"""
+    if redis_client is None:
+        return
+    try:
+        redis_client.setex(key, ttl_seconds, value)
+    except redis.RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+
+def cached_response(
+    redis_client,
+    namespace: str,
+    endpoint: str,
+    signature: str,
+    generation: Optional[int] = None
+) -> Tuple[Optional[str], Optional[Response]]:
+    """
+    Read-through lookup of a cached endpoint response.
+
+    Returns `(key, response)`: `response` is set on a hit, carrying any
+    headers it was stored with, otherwise `key` is where `store_response`
+    should write. Both are None when the cache is disabled or Redis is
+    unavailable, and the caller reads from the database. Pass `generation`
+    when the caller already read it, to skip a second round trip.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None, None
+
+    if generation is None:
+        generation = get_generation(redis_client, namespace)
+    if generation is None:
+        _response_stats[(endpoint, "bypassed")] += 1
+        return None, None
+
+    key = f"response:{namespace}:{generation}:{endpoint}:{signature}"
+    body = cache_get(redis_client, key)
+    if body is None:
+        _response_stats[(endpoint, "misses")] += 1
+        return key, None
+
+    # Entries stored with headers hold them as a JSON line before the body;
+    # serialized bodies are single-line JSON
+    headers = {}
+    if "\n" in body:
+        stored_headers, body = body.split("\n", 1)
+        headers = json.loads(stored_headers)
+
+    _response_stats[(endpoint, "hits")] += 1
+    return key, Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "HIT"})
+
+
+def store_response(redis_client, key: Optional[str], response_model, content, headers: Optional[Mapping[str, str]] = None):
+    """
+    Serialize `content` through `response_model` and cache it under `key`.
+
+    Always returns the serialized response, so endpoints can hand back
+    payloads shaped by a narrower model than their declared one; nothing is
+    written when there is no key (cache bypassed). `headers` (validators,
+    typically) are set on the response and replayed on cache hits.
+    """
+    body = response_model.model_validate(content, from_attributes=True).model_dump_json()
+    headers = dict(headers or {})
+    if key is None:
+        return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "BYPASS"})
+
+    stored = f"{json.dumps(headers)}\n{body}" if headers else body
+    cache_set(redis_client, key, stored, settings.RESPONSE_CACHE_TTL_SECONDS)
+    return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "MISS"})
+
+
+def response_cache_stats() -> dict:
+    """Hit/miss/bypass counters per cached endpoint since this process started"""
+    stats = {}
+    for (endpoint, outcome), value in sorted(_response_stats.items()):
+        stats.setdefault(endpoint, {"hits": 0, "misses": 0, "bypassed": 0})[outcome] = value
+
+    for counters in stats.values():
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else None
+    return stats
@@ -0,0 +1,116 @@
+"""
+Conditional GET support: ETag / Last-Modified validators and 304 responses.
+
+Detail endpoints get strong ETags built from the entity id and its change
+timestamps, stored with their cached response so hits and 304s skip the
+database; a miss reads them with one primary key probe. List endpoints get
+weak ETags built from the request's parameters plus the namespace's Redis
+cache generation, which every write bumps, so a matching If-None-Match
+costs no SQL. Without Redis, the newest change timestamp and row count of
+the filtered set stand in for the generation.
+"""
+
+import hashlib
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import func
+
+from app.core.cache import get_generation
+
+# Clients may store responses but must revalidate them before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def changed_at(model):
+    """When a row last changed; rows that were never updated only have created_at"""
+    return func.coalesce(model.updated_at, model.created_at)
+
+
+def _digest(parts) -> str:
+    canonical = "|".join(
+        part.isoformat() if isinstance(part, (date, datetime)) else str(part)
+        for part in parts
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def entity_etag(entity_id: Any, *versions: Any) -> str:
+    """Strong ETag for one entity at the given versions (change timestamps, counts)"""
+    return f'"{_digest((entity_id, *versions))}"'
+
+
+def collection_etag(signature: str, *versions: Any) -> str:
+    """Weak ETag for a filtered list: request signature plus the set's newest change and size"""
+    return f'W/"{_digest((signature, *versions))}"'
+
+
+def list_etag(redis_client, namespace: str, signature: str, aggregate, *versions: Any) -> Tuple[str, Optional[int], Any]:
+    """
+    Weak ETag for a list endpoint: `(etag, generation, aggregate_row)`.
+
+    With Redis the ETag comes from the namespace generation and no query
+    runs; pass the generation on to `cached_response`. Otherwise
+    `aggregate`, a query of the filtered set's newest change and size, is
+    executed and its row returned so callers can reuse the count.
+    """
+    generation = get_generation(redis_client, namespace)
+    if generation is not None:
+        return collection_etag(signature, "generation", generation, *versions), generation, None
+
+    row = aggregate.one()
+    return collection_etag(signature, *row, *versions), None, row
+
+
+def _opaque(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison), or If-Modified-Since when no
+    If-None-Match was sent, against the current validators.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or _opaque(etag) in {_opaque(candidate) for candidate in candidates}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """ETag / Last-Modified headers, e.g. to store alongside a cached response"""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def stored_validators(response: Optional[Response]) -> Tuple[Optional[str], Optional[datetime]]:
+    """ETag and Last-Modified a cached response was stored with; (None, None) when it has none"""
+    if response is None or "etag" not in response.headers:
+        return None, None
+    last_modified = response.headers.get("last-modified")
+    return response.headers["etag"], parsedate_to_datetime(last_modified) if last_modified else None
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Attach ETag / Last-Modified to a response and return it"""
+    response.headers.update(validator_headers(etag, last_modified))
+    return response
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """An empty 304 carrying the current validators"""
+    return set_validators(Response(status_code=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
@@ -14,6 +14,8 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
     
     # Security
     SECRET_KEY: str
@@ -42,6 +44,45 @@ class Settings(BaseSettings):
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
+    COUNT_CACHE_TTL_SECONDS: int = 300
+    COUNT_ESTIMATE_EXACT_THRESHOLD: int = 10000
+    FACET_MAX_VALUES: int = 50  # Values listed per facet, most common first
+    FACET_SAMPLE_ROWS: int = 20000  # Target sample size for estimated facet counts
+    
+    # Similarity index
+    SIMILARITY_INDEX_SYNC_SECONDS: int = 30
+    
+    # Autocomplete index
+    AUTOCOMPLETE_SYNC_SECONDS: int = 30
+    AUTOCOMPLETE_OVERLAY_MAX: int = 5000  # Changed players held outside the sorted array before a rebuild
+    
+    # Exports
+    EXPORT_BATCH_SIZE: int = 2000  # Rows fetched per server-side cursor round trip
+    
+    # Background jobs
+    JOB_WORKERS: int = 2
+    JOB_RETENTION_SECONDS: int = 86400  # How long finished jobs stay pollable
+    
+    # Duplicate detection
+    DUPLICATE_MATCH_THRESHOLD: float = 0.88  # Name similarity (0-1) at which two records are reported
+    DUPLICATE_CANDIDATE_LIMIT: int = 200  # Blocked candidates scored per record on create
+    DUPLICATE_MAX_CLUSTERS: int = 1000  # Clusters kept in a scan job result
+    
+    # Bulk updates
+    BULK_UPDATE_BATCH_SIZE: int = 1000  # Players written per UPDATE ... FROM (VALUES ...) statement
+    BULK_UPDATE_SYNC_MAX: int = 2000  # Larger requests run as a background job
+    
+    # Contract radar
+    CONTRACT_RADAR_MAX_MONTHS: int = 24  # Horizon aggregated per build; the longest window a request may ask for
+    CONTRACT_RADAR_TOP_PLAYERS: int = 10  # Most valuable players kept per month and position bucket
+    CONTRACT_RADAR_CACHE_TTL_SECONDS: int = 3600  # Player writes to radar columns invalidate sooner
+    
+    # Leaderboards
+    LEADERBOARD_DEPTH: int = 200  # Players ranked per metric and position
+    LEADERBOARD_REFRESH_SECONDS: int = 900  # Rebuild interval; 0 disables the schedule
+    
+    # Percentiles
+    PERCENTILE_REFRESH_SECONDS: int = 300  # Interval between recomputes of changed positions; 0 disables the schedule
     
     class Config:
         env_file = ".env"
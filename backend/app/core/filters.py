@@ -0,0 +1,107 @@
+"""Predicate builders for list endpoint filters that PostgreSQL indexes can serve"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import cast, func, literal, or_
+
+# pg_trgm can only narrow an index scan once the pattern holds a full trigram
+TRIGRAM_MIN_LENGTH = 3
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains(column, term: str):
+    """
+    Case-insensitive substring match.
+
+    Served by a GIN `gin_trgm_ops` index on `column` for terms of
+    TRIGRAM_MIN_LENGTH characters or more; shorter terms fall back to a scan.
+    """
+    return column.ilike(f"%{escape_like(term.strip())}%")
+
+
+def fuzzy_matches(column, term: str):
+    """
+    Typo-tolerant match using pg_trgm word similarity (`term <% column`).
+
+    True when some word sequence of `column` is similar enough to `term`
+    (pg_trgm.word_similarity_threshold, 0.6 by default); GIN-indexable.
+    """
+    return literal(term.strip()).op("<%")(column)
+
+
+def text_search(term: str, columns: Sequence, fuzzy: bool = False):
+    """Substring match across columns, optionally widened with fuzzy matches"""
+    clauses = [contains(column, term) for column in columns]
+    if fuzzy:
+        clauses.extend(fuzzy_matches(column, term) for column in columns)
+    return or_(*clauses)
+
+
+def similarity_rank(term: str, columns: Sequence):
+    """Best word similarity of `term` against any of the columns, for ORDER BY"""
+    scores = [func.coalesce(func.word_similarity(term.strip(), column), 0) for column in columns]
+    return func.greatest(*scores) if len(scores) > 1 else scores[0]
+
+
+def parse_array_filters(values: Optional[List[str]], allowed: Dict[str, Any]) -> List[Tuple[Any, List[str]]]:
+    """
+    Parse repeatable `field:value1,value2` array filter parameters.
+
+    Returns (column, values) pairs for whitelisted ARRAY columns.
+    """
+    parsed = []
+    for raw in values or []:
+        field, separator, items = raw.partition(":")
+        column = allowed.get(field.strip())
+        members = [item.strip() for item in items.split(",") if item.strip()]
+        if not separator or column is None or not members:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid array filter '{raw}'. Use field:value1,value2 with field in: {', '.join(allowed)}"
+            )
+        parsed.append((column, members))
+    return parsed
+
+
+def _array_param(column, values: Sequence[str]):
+    # Bind as the column's own array type (varchar[]); a text[] operand makes
+    # PostgreSQL reject the operator or cast the column and skip its GIN index
+    return cast(list(values), column.type)
+
+
+def array_overlaps(column, values: Sequence[str]):
+    """`column && ARRAY[...]`: the array shares at least one value (GIN-indexable)"""
+    return column.overlap(_array_param(column, values))
+
+
+def array_contains_all(column, values: Sequence[str]):
+    """`column @> ARRAY[...]`: the array holds every value (GIN-indexable)"""
+    return column.contains(_array_param(column, values))
+
+
+def parse_numeric_filters(values: Optional[List[str]], allowed: Sequence[str]) -> List[Tuple[str, float]]:
+    """
+    Parse repeatable `key:number` threshold parameters (e.g. `goals:10`).
+
+    Returns (key, threshold) pairs for whitelisted keys.
+    """
+    parsed = []
+    for raw in values or []:
+        key, separator, number = raw.partition(":")
+        try:
+            threshold = float(number)
+        except ValueError:
+            threshold = math.nan
+        if not separator or key.strip() not in allowed or not math.isfinite(threshold):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid filter '{raw}'. Use key:number with key in: {', '.join(allowed)}"
+            )
+        parsed.append((key.strip(), threshold))
+    return parsed
@@ -0,0 +1,345 @@
+"""Pagination helpers: total and facet counts, offset metadata and keyset (cursor) pagination"""
+
+import base64
+import binascii
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Table, and_, asc, desc, func, literal, or_, tablesample, tuple_
+from sqlalchemy.exc import CompileError, SQLAlchemyError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.util import ClauseAdapter
+
+from app.core.cache import cache_get, cache_set, get_generation
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+COUNT_STRATEGIES = ("exact", "estimated", "cached")
+
+# Query parameters that page through a result set without changing its size
+PAGINATION_PARAMS = ("skip", "limit", "cursor", "count", "sort_by", "sort_order")
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` wrapper that keeps the statement's bound parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _exact_count(query: Query) -> int:
+    return query.order_by(None).count()
+
+
+def _estimated_count(db: Session, query: Query) -> Optional[int]:
+    """Planner row estimate for the filtered query, or None if it can't be planned"""
+    # A savepoint, so a failed EXPLAIN leaves the request's transaction usable
+    try:
+        with db.begin_nested():
+            plan = db.execute(Explain(query.order_by(None).statement)).scalar()
+    except (CompileError, SQLAlchemyError) as e:
+        logger.warning(f"Count estimate failed, falling back to exact count: {e}")
+        return None
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(
+    query: Query,
+    strategy: str,
+    db: Session,
+    redis_client=None,
+    namespace: Optional[str] = None,
+    signature: Optional[str] = None
+) -> Tuple[int, str]:
+    """
+    Count the rows of a filtered query with the requested strategy.
+
+    - exact: `SELECT count(*)` over the filtered set
+    - estimated: the planner's row estimate; small estimates are re-counted
+      exactly since the count is cheap and estimates are least accurate there
+    - cached: an exact count memoized in Redis per filter signature, under
+      the namespace's generation so writes invalidate it
+
+    Returns `(total, strategy)` where strategy is the one that actually
+    produced the number.
+    """
+    if strategy == "estimated":
+        estimate = _estimated_count(db, query)
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_EXACT_THRESHOLD:
+            return estimate, "estimated"
+        return _exact_count(query), "exact"
+
+    if strategy == "cached" and namespace and signature:
+        generation = get_generation(redis_client, namespace)
+        if generation is not None:
+            key = f"count:{namespace}:{generation}:{signature}"
+            cached = cache_get(redis_client, key)
+            if cached is not None:
+                return int(cached), "cached"
+
+            total = _exact_count(query)
+            cache_set(redis_client, key, total, settings.COUNT_CACHE_TTL_SECONDS)
+            return total, "exact"
+
+    return _exact_count(query), "exact"
+
+
+def parse_facets(facets: Optional[str], allowed: Dict[str, Any]) -> Tuple[str, ...]:
+    """Parse a comma-separated `facets=` parameter against the facetable fields"""
+    if facets is None:
+        return ()
+
+    requested = tuple(dict.fromkeys(facet.strip() for facet in facets.split(",") if facet.strip()))
+    unknown = [facet for facet in requested if facet not in allowed]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid facets '{facets}'. Choose from: {', '.join(allowed)}"
+        )
+    return requested
+
+
+def _grouped_counts(db: Session, query: Query, facets: Sequence[str], columns: Dict[str, Any], sample_percent=None):
+    """Rows of (facet, value, count) from one GROUPING SETS query over the filtered set"""
+    expressions = [columns[facet] for facet in facets]
+    statement = query.order_by(None).with_entities(
+        *(expression.label(f"facet_{index}") for index, expression in enumerate(expressions)),
+        *(func.grouping(expression).label(f"grouped_{index}") for index, expression in enumerate(expressions)),
+        func.count().label("count")
+    ).group_by(func.grouping_sets(*expressions)).statement
+
+    if sample_percent is not None:
+        # Same statement over a block sample; the fixed seed keeps pages consistent
+        table, = query.statement.get_final_froms()
+        sample = tablesample(table, func.system(literal(sample_percent)), name=f"{table.name}_sample", seed=literal(0))
+        statement = ClauseAdapter(sample).traverse(statement)
+
+    scale = 100.0 / sample_percent if sample_percent else 1.0
+    for row in db.execute(statement):
+        # grouping() is 0 for the expression the row is grouped by
+        index = next(index for index in range(len(facets)) if row[len(facets) + index] == 0)
+        yield facets[index], row[index], int(round(row.count * scale))
+
+
+def facet_counts(
+    query: Query,
+    facets: Sequence[str],
+    columns: Dict[str, Any],
+    strategy: str,
+    db: Session,
+    redis_client=None,
+    namespace: Optional[str] = None,
+    signature: Optional[str] = None
+) -> Tuple[Dict[str, List[dict]], str]:
+    """
+    Per-value counts of `facets` over a filtered query, using a count strategy.
+
+    - exact: one GROUPING SETS aggregate over the filtered set
+    - estimated: when the planner expects at least COUNT_ESTIMATE_EXACT_THRESHOLD
+      rows, the same aggregate over a TABLESAMPLE of about FACET_SAMPLE_ROWS
+      matching rows, scaled up; smaller sets are counted exactly
+    - cached: exact counts memoized in Redis per filter signature, under the
+      namespace's generation so writes invalidate them
+
+    Each facet lists its FACET_MAX_VALUES most common values. Returns
+    `(facets, strategy)` where strategy is the one that produced the counts.
+    """
+    if not facets:
+        return {}, strategy
+
+    key = None
+    if strategy == "cached" and namespace and signature:
+        generation = get_generation(redis_client, namespace)
+        if generation is not None:
+            key = f"facets:{namespace}:{generation}:{signature}"
+            cached = cache_get(redis_client, key)
+            if cached is not None:
+                return json.loads(cached), "cached"
+
+    sample_percent = None
+    if strategy == "estimated":
+        estimate = _estimated_count(db, query)
+        single_table = [type(source) for source in query.statement.get_final_froms()] == [Table]
+        if single_table and estimate is not None and estimate >= settings.COUNT_ESTIMATE_EXACT_THRESHOLD:
+            percent = 100.0 * settings.FACET_SAMPLE_ROWS / estimate
+            sample_percent = percent if percent < 100.0 else None
+
+    counts: Dict[str, List[dict]] = {facet: [] for facet in facets}
+    for facet, value, count in _grouped_counts(db, query, facets, columns, sample_percent):
+        counts[facet].append({"value": value, "count": count})
+    for facet, values in counts.items():
+        values.sort(key=lambda entry: (-entry["count"], entry["value"] is None, str(entry["value"])))
+        del values[settings.FACET_MAX_VALUES:]
+
+    if key is not None:
+        cache_set(redis_client, key, json.dumps(counts, default=str), settings.COUNT_CACHE_TTL_SECONDS)
+    return counts, "estimated" if sample_percent is not None else "exact"
+
+
+def offset_pagination_meta(skip: int, limit: int, total: int, count_strategy: str = "exact") -> dict:
+    """Build the `meta.pagination` block for skip/limit pages"""
+    return {
+        "page": (skip // limit) + 1,
+        "per_page": limit,
+        "total": total,
+        "total_pages": (total + limit - 1) // limit,
+        "count_strategy": count_strategy
+    }
+
+
+def cursor_pagination_meta(limit: int, total: int, count_strategy: str = "exact") -> dict:
+    """Build the `meta.pagination` block for keyset pages (no page number)"""
+    return {
+        "page": None,
+        "per_page": limit,
+        "total": total,
+        "total_pages": (total + limit - 1) // limit,
+        "count_strategy": count_strategy
+    }
+
+
+def encode_cursor(payload: dict) -> str:
+    """Encode a cursor payload into an opaque URL-safe token"""
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict:
+    """Decode a token produced by `encode_cursor`"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        payload = None
+
+    if not isinstance(payload, dict) or "id" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    return payload
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _load_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def _seek_predicate(sort_column, id_column, value, last_id, descending: bool):
+    """
+    Rows strictly after (value, last_id) in the scan order.
+
+    PostgreSQL sorts NULLs last ascending and first descending, which is what
+    a (sort_column, id) B-tree yields when scanned forwards or backwards.
+    """
+    if descending:
+        if value is None:
+            return or_(
+                and_(sort_column.is_(None), id_column < last_id),
+                sort_column.isnot(None)
+            )
+        return tuple_(sort_column, id_column) < tuple_(value, last_id)
+
+    if value is None:
+        return and_(sort_column.is_(None), id_column > last_id)
+    return or_(
+        tuple_(sort_column, id_column) > tuple_(value, last_id),
+        sort_column.is_(None)
+    )
+
+
+def keyset_paginate(
+    query: Query,
+    sort_key: str,
+    sort_column,
+    id_column,
+    descending: bool,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """
+    Fetch one keyset page of `query` ordered by (sort_column, id_column).
+
+    Returns the rows plus `next_cursor` / `prev_cursor` tokens. A cursor is
+    bound to the sort key and direction it was issued for.
+    """
+    order = "desc" if descending else "asc"
+    payload = decode_cursor(cursor) if cursor else None
+    backwards = False
+
+    if payload:
+        if payload.get("s") != sort_key or payload.get("o") != order:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the requested sort order"
+            )
+        backwards = payload.get("d") == "prev"
+        try:
+            value = _load_value(sort_column, payload.get("v"))
+            last_id = id_column.type.python_type(payload["id"])
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        query = query.filter(
+            _seek_predicate(sort_column, id_column, value, last_id, descending != backwards)
+        )
+
+    # Backward pages scan the index in the opposite direction, then flip
+    direction = desc if descending != backwards else asc
+    rows = query.order_by(None).order_by(
+        direction(sort_column), direction(id_column)
+    ).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    if not rows:
+        return rows, None, None
+
+    def make_cursor(row, direction_flag: str) -> str:
+        return encode_cursor({
+            "s": sort_key,
+            "o": order,
+            "d": direction_flag,
+            "v": _dump_value(getattr(row, sort_column.key)),
+            "id": str(getattr(row, id_column.key))
+        })
+
+    has_next = has_more if not backwards else True
+    has_prev = payload is not None if not backwards else has_more
+
+    next_cursor = make_cursor(rows[-1], "next") if has_next else None
+    prev_cursor = make_cursor(rows[0], "prev") if has_prev else None
+    return rows, next_cursor, prev_cursor
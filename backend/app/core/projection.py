@@ -0,0 +1,79 @@
+"""Sparse fieldsets: select only the columns a response needs and serialize plain rows"""
+
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel, ConfigDict, create_model
+
+# Response fields computed in Python: field -> (columns it reads, value from the row mapping)
+DerivedFields = Dict[str, Tuple[Sequence[Any], Callable[[Any], Any]]]
+
+
+def age_from_birth_date(born: Optional[date]) -> Optional[int]:
+    """Age in whole years today, matching the models' `age` property"""
+    if not born:
+        return None
+    today = date.today()
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated `fields=` parameter against a response schema.
+
+    `id` is always included so clients can address the returned rows.
+    """
+    if fields is None:
+        return None
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in schema.model_fields]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid fields '{fields}'. Choose from: {', '.join(schema.model_fields)}"
+        )
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+@lru_cache(maxsize=256)
+def projection_model(schema: type[BaseModel], fields: Tuple[str, ...]) -> type[BaseModel]:
+    """`schema` narrowed to `fields` (all optional), built once per field set"""
+    if fields == tuple(schema.model_fields):
+        return schema
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{field: (Optional[schema.model_fields[field].annotation], None) for field in fields}
+    )
+
+
+def projection_columns(model, fields: Sequence[str], derived: DerivedFields, extra: Sequence[Any] = ()) -> List[Any]:
+    """Columns to SELECT for `fields`, plus `extra` ones the query orders or seeks by"""
+    columns = {}
+    for field in fields:
+        for column in derived[field][0] if field in derived else [getattr(model, field)]:
+            columns[column.key] = column
+    for column in extra:
+        columns.setdefault(column.key, column)
+    return list(columns.values())
+
+
+def project_rows(rows, fields: Sequence[str], derived: DerivedFields) -> List[dict]:
+    """Turn column rows into response dicts without building ORM entities"""
+    items = []
+    for row in rows:
+        values = row._mapping
+        items.append({
+            field: derived[field][1](values) if field in derived else values[field]
+            for field in fields
+        })
+    return items
+
+
+def projected_response(response_model: type[BaseModel], content: Any) -> Response:
+    """Serialize `content` through a projection-shaped model, bypassing the declared response_model"""
+    body = response_model.model_validate(content, from_attributes=True).model_dump_json()
+    return Response(content=body, media_type="application/json")
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -7,13 +8,32 @@ import logging
 
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.core.database import health_check
+from app.core.database import get_redis, health_check
+from app.core.cache import response_cache_stats
+from app.services import leaderboard, player_percentiles
+from app.services.jobs import job_registry
 
 
 # Configure logging
 logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Scheduled background work; runs on the job registry's thread pool
+    if settings.LEADERBOARD_REFRESH_SECONDS > 0:
+        job_registry.schedule(
+            "leaderboard_refresh", "player", leaderboard.run_refresh_job,
+            settings.LEADERBOARD_REFRESH_SECONDS, redis_client=get_redis()
+        )
+    if settings.PERCENTILE_REFRESH_SECONDS > 0:
+        job_registry.schedule(
+            "percentile_refresh", "player", player_percentiles.run_refresh_job,
+            settings.PERCENTILE_REFRESH_SECONDS, redis_client=get_redis()
+        )
+    yield
+    job_registry.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -21,6 +41,7 @@ app = FastAPI(
     description="Professional football scouting and recruitment platform",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    lifespan=lifespan,
 )
 
 # Middleware
@@ -90,6 +111,7 @@ async def health_check_endpoint():
         "success": True,
         "status": "healthy" if overall_healthy else "unhealthy",
         "services": health_info,
+        "response_cache": response_cache_stats(),
         "version": settings.VERSION,
         "environment": settings.ENVIRONMENT
     }
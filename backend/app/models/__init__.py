@@ -29,7 +29,11 @@ class SoftDeleteMixin:
 # Import all models to ensure they're registered with SQLAlchemy
 from app.models.user import User
 from app.models.player import Player
+from app.models.player_summary import PlayerSummaryCount
+from app.models.player_percentile import PlayerPercentile, PercentileGroup
+from app.models.player_leaderboard import PlayerLeaderboardEntry
 from app.models.coach import Coach
+from app.models.coach_performance import CoachPerformance
 from app.models.shortlist import Shortlist, ShortlistItem
 from app.models.report import Report
 from app.models.activity_log import ActivityLog
@@ -42,7 +46,12 @@ __all__ = [
     'SoftDeleteMixin',
     'User',
     'Player',
+    'PlayerSummaryCount',
+    'PlayerPercentile',
+    'PercentileGroup',
+    'PlayerLeaderboardEntry',
     'Coach',
+    'CoachPerformance',
     'Shortlist',
     'ShortlistItem',
     'Report',
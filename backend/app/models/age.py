@@ -0,0 +1,79 @@
+"""
+SQL side of the `age` hybrid on models with a `date_of_birth` column.
+
+Age is not stored, so a predicate on the computed age can use no index.
+`AgeComparator` rewrites comparisons against a constant age into ranges
+on `date_of_birth` (`Player.age >= 21` becomes
+`date_of_birth <= <today 21 years ago>`), which the date_of_birth indexes
+serve. Anything else, selecting or ordering by the attribute included,
+falls back to the computed age in whole years.
+"""
+
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import Integer, and_, cast, func, or_
+from sqlalchemy.ext.hybrid import Comparator
+from sqlalchemy.sql import operators
+
+
+def years_before(day: date, years: int) -> date:
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:  # 29 February
+        return day.replace(year=day.year - years, day=28)
+
+
+def birth_day_bounds(min_age: Optional[int], max_age: Optional[int]) -> Tuple[Optional[date], Optional[date]]:
+    """
+    Date of birth range `(earliest, latest)` for an age range, both inclusive.
+
+    Someone is at least `min_age` when born on or before `latest`, and at
+    most `max_age` when born after the day `max_age + 1` years ago.
+    """
+    today = date.today()
+    latest = years_before(today, min_age) if min_age is not None else None
+    earliest = years_before(today, max_age + 1) + timedelta(days=1) if max_age is not None else None
+    return earliest, latest
+
+
+def age_expression(date_of_birth):
+    """Age in whole years as of the database's current date"""
+    return cast(func.date_part('year', func.age(func.current_date(), date_of_birth)), Integer)
+
+
+class AgeComparator(Comparator):
+    """Compares `age` through `date_of_birth` ranges where the operand is a constant age"""
+
+    def __init__(self, date_of_birth):
+        super().__init__(age_expression(date_of_birth))
+        self.date_of_birth = date_of_birth
+
+    def _range(self, min_age: Optional[int], max_age: Optional[int]):
+        earliest, latest = birth_day_bounds(min_age, max_age)
+        clauses = []
+        if earliest is not None:
+            clauses.append(self.date_of_birth >= earliest)
+        if latest is not None:
+            clauses.append(self.date_of_birth <= latest)
+        return and_(*clauses)
+
+    def operate(self, op, *other, **kwargs):
+        if other and all(isinstance(value, int) and not isinstance(value, bool) for value in other):
+            if op is operators.ge:
+                return self._range(other[0], None)
+            if op is operators.gt:
+                return self._range(other[0] + 1, None)
+            if op is operators.le:
+                return self._range(None, other[0])
+            if op is operators.lt:
+                return self._range(None, other[0] - 1)
+            if op is operators.eq:
+                return self._range(other[0], other[0])
+            if op is operators.ne:
+                # Unknown birth dates stay unmatched, as `age != n` is NULL for them
+                earliest, latest = birth_day_bounds(other[0], other[0])
+                return or_(self.date_of_birth < earliest, self.date_of_birth > latest)
+            if op is operators.between_op and len(other) == 2:
+                return self._range(*other)
+        return op(self.expression, *other, **kwargs)
@@ -4,6 +4,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import date
 from app.models import BaseModel
+from app.models.age import AgeComparator
 import uuid
 from datetime import datetime
 
@@ -95,6 +96,11 @@ class Coach(BaseModel):
             )
         return None
     
+    @age.comparator
+    def age(cls):
+        # Constant age comparisons become date_of_birth ranges (see app.models.age)
+        return AgeComparator(cls.date_of_birth)
+    
     @property
     def display_name(self):
         return self.full_name or self.name
@@ -136,4 +142,25 @@ class Coach(BaseModel):
 Index('idx_coaches_name_club', Coach.name, Coach.current_club)
 Index('idx_coaches_role_level', Coach.current_role, Coach.coaching_level)
 Index('idx_coaches_formation_style', Coach.preferred_formation, Coach.leadership_style)
-Index('idx_coaches_nationality_experience', Coach.nationality, Coach.years_experience)
\ No newline at end of file
+Index('idx_coaches_nationality_experience', Coach.nationality, Coach.years_experience)
+
+# Keyset pagination: one (sort column, id) index per cursor-pageable sort key
+Index('idx_coaches_keyset_name', Coach.name, Coach.id, postgresql_where=Coach.is_active)
+Index('idx_coaches_keyset_overall_rating', Coach.overall_rating, Coach.id, postgresql_where=Coach.is_active)
+Index('idx_coaches_keyset_years_experience', Coach.years_experience, Coach.id, postgresql_where=Coach.is_active)
+Index('idx_coaches_keyset_salary', Coach.estimated_salary_eur, Coach.id, postgresql_where=Coach.is_active)
+Index('idx_coaches_keyset_created_at', Coach.created_at, Coach.id, postgresql_where=Coach.is_active)
+Index('idx_coaches_keyset_date_of_birth', Coach.date_of_birth, Coach.id, postgresql_where=Coach.is_active)
+
+# Trigram GIN indexes serving ILIKE '%term%' and word-similarity filters (pg_trgm)
+Index('idx_coaches_name_trgm', Coach.name, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+Index('idx_coaches_full_name_trgm', Coach.full_name, postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'})
+Index('idx_coaches_current_club_trgm', Coach.current_club, postgresql_using='gin', postgresql_ops={'current_club': 'gin_trgm_ops'})
+Index('idx_coaches_nationality_trgm', Coach.nationality, postgresql_using='gin', postgresql_ops={'nationality': 'gin_trgm_ops'})
+
+# Array membership filters (&&, @>) on tag-like columns
+Index('idx_coaches_preferred_formations_gin', Coach.preferred_formations, postgresql_using='gin')
+Index('idx_coaches_tags_gin', Coach.tags, postgresql_using='gin')
+Index('idx_coaches_strengths_gin', Coach.strengths, postgresql_using='gin')
+Index('idx_coaches_weaknesses_gin', Coach.weaknesses, postgresql_using='gin')
+Index('idx_coaches_languages_spoken_gin', Coach.languages_spoken, postgresql_using='gin')
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.models import Base
+
+class CoachPerformance(Base):
+    """
+    Win rate and points per game of one coach in one competition, derived
+    from Coach.coaching_metrics by app/services/coach_performance.py so
+    coach lists can filter and sort on them.
+
+    competition is a coaching_metrics key; 'all' holds the figures
+    Coach.get_win_rate() reports by default.
+    """
+    __tablename__ = "coach_performance"
+
+    coach_id = Column(UUID(as_uuid=True), ForeignKey("coaches.id", ondelete="CASCADE"), primary_key=True)
+    competition = Column(String(100), primary_key=True)
+
+    games = Column(Integer)  # NULL when only rates were recorded
+    win_rate = Column(Float)  # Percent
+    points_per_game = Column(Float)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<CoachPerformance(coach_id={self.coach_id}, competition={self.competition}, win_rate={self.win_rate})>"
+
+# Range filters and sorts within one competition, ties broken by coach
+Index('idx_coach_performance_win_rate', CoachPerformance.competition, CoachPerformance.win_rate, CoachPerformance.coach_id)
+Index('idx_coach_performance_points_per_game', CoachPerformance.competition, CoachPerformance.points_per_game, CoachPerformance.coach_id)
@@ -1,11 +1,51 @@
-from sqlalchemy import Column, String, Integer, Date, Boolean, Text, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSON
+from sqlalchemy import Column, String, Integer, Date, Boolean, Text, ForeignKey, Index, Computed, DDL, event, func, literal, and_
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSON, JSONB, TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import date, datetime
 from app.models import BaseModel
+from app.models.age import AgeComparator
 import uuid
 
+# Text search configuration shared by the stored vector and the queries against it
+SEARCH_CONFIG = 'english'
+
+# array_to_string() is only STABLE, so generated columns need an IMMUTABLE wrapper
+SEARCH_ARRAY_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION search_array_to_text(text[]) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$ SELECT coalesce(array_to_string($1, ' '), '') $$
+""")
+
+# Weighted search document: names rank above club/tags, then nationality, then notes
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(full_name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(current_club, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', search_array_to_text(tags)), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(nationality, '')), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(scouting_notes, '')), 'D')"
+)
+
+# Numeric JSONB lookup that yields NULL for missing or non-numeric values, so
+# range filters never fail on a bad document; IMMUTABLE so it can be indexed
+JSONB_NUMBER_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION jsonb_number(jsonb, text) RETURNS numeric
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$ SELECT CASE WHEN jsonb_typeof($1 -> $2) = 'number' THEN ($1 ->> $2)::numeric END $$
+""")
+
+# current_season_stats keys filterable with min_stat/max_stat (see PlayerStats)
+SEASON_STAT_KEYS = ('goals', 'assists', 'appearances', 'minutes_played', 'yellow_cards', 'red_cards')
+
+# performance_metrics keys accepted by update_performance_metrics and min_metric/max_metric
+PERFORMANCE_METRIC_KEYS = ('xG', 'xA', 'progressive_passes', 'defensive_actions', 'dribble_success_rate')
+
+
+def jsonb_number(column, key: str):
+    """`jsonb_number(column, key)`: matches the per-key expression indexes below"""
+    return func.jsonb_number(column, literal(key))
+
 class Player(BaseModel):
     __tablename__ = "players"
     
@@ -38,20 +78,21 @@ class Player(BaseModel):
     agent_contact = Column(JSON)  # {email, phone, agency, etc.}
     
     # Performance Data
-    current_season_stats = Column(JSON)  # Current season statistics
+    current_season_stats = Column(JSONB)  # Current season statistics
     career_stats = Column(JSON)  # Career totals
     performance_history = Column(JSON)  # Array of season-by-season data
     
     # Advanced Analytics
     similarity_vector = Column(JSON)  # For ML similarity matching
-    performance_metrics = Column(JSON)  # Advanced metrics like xG, xA, etc.
-    tactical_attributes = Column(JSON)  # Tactical intelligence, positioning, etc.
+    performance_metrics = Column(JSONB)  # Advanced metrics like xG, xA, etc.
+    tactical_attributes = Column(JSONB)  # Tactical intelligence, positioning, etc.
     
     # Scouting Information
     scouting_notes = Column(Text)
     strengths = Column(ARRAY(String), default=[])  # Array of strength tags
     weaknesses = Column(ARRAY(String), default=[])  # Array of weakness tags
     tags = Column(ARRAY(String), default=[])  # General tags
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))  # Maintained by PostgreSQL
     
     # Ratings
     overall_rating = Column(Integer)  # 0-100 overall rating
@@ -89,6 +130,11 @@ class Player(BaseModel):
             )
         return None
     
+    @age.comparator
+    def age(cls):
+        # Constant age comparisons become date_of_birth ranges (see app.models.age)
+        return AgeComparator(cls.date_of_birth)
+    
     @property
     def display_name(self):
         return self.full_name or self.name
@@ -116,13 +162,66 @@ class Player(BaseModel):
             self.performance_metrics = {}
         
         # Validate and update metrics
-        valid_metrics = ['xG', 'xA', 'progressive_passes', 'defensive_actions', 'dribble_success_rate']
         for key, value in metrics.items():
-            if key in valid_metrics and isinstance(value, (int, float)):
+            if key in PERFORMANCE_METRIC_KEYS and isinstance(value, (int, float)):
                 self.performance_metrics[key] = value
 
 # Create indexes for better query performance
 Index('idx_players_name_club', Player.name, Player.current_club)
 Index('idx_players_position_nationality', Player.position, Player.nationality)
 Index('idx_players_market_value_desc', Player.market_value_eur.desc())
-Index('idx_players_age_position', Player.date_of_birth, Player.position)
\ No newline at end of file
+Index('idx_players_age_position', Player.date_of_birth, Player.position)
+Index(
+    'idx_players_contract_expires_active',
+    Player.contract_expires,
+    postgresql_include=['position', 'market_value_eur'],
+    postgresql_where=and_(Player.is_active, Player.contract_expires.isnot(None))
+)
+
+# Keyset pagination: one (sort column, id) index per cursor-pageable sort key
+Index('idx_players_keyset_name', Player.name, Player.id, postgresql_where=Player.is_active)
+Index('idx_players_keyset_market_value', Player.market_value_eur, Player.id, postgresql_where=Player.is_active)
+Index('idx_players_keyset_overall_rating', Player.overall_rating, Player.id, postgresql_where=Player.is_active)
+Index('idx_players_keyset_potential_rating', Player.potential_rating, Player.id, postgresql_where=Player.is_active)
+Index('idx_players_keyset_created_at', Player.created_at, Player.id, postgresql_where=Player.is_active)
+Index('idx_players_keyset_date_of_birth', Player.date_of_birth, Player.id, postgresql_where=Player.is_active)
+
+# Trigram GIN indexes serving ILIKE '%term%' and word-similarity filters (pg_trgm)
+Index('idx_players_name_trgm', Player.name, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+Index('idx_players_full_name_trgm', Player.full_name, postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'})
+Index('idx_players_current_club_trgm', Player.current_club, postgresql_using='gin', postgresql_ops={'current_club': 'gin_trgm_ops'})
+Index('idx_players_nationality_trgm', Player.nationality, postgresql_using='gin', postgresql_ops={'nationality': 'gin_trgm_ops'})
+Index('idx_players_second_nationality_trgm', Player.second_nationality, postgresql_using='gin', postgresql_ops={'second_nationality': 'gin_trgm_ops'})
+Index('idx_players_position_trgm', Player.position, postgresql_using='gin', postgresql_ops={'position': 'gin_trgm_ops'})
+
+# Full-text search over the generated search_vector
+Index('idx_players_search_vector', Player.search_vector, postgresql_using='gin')
+
+# Array membership filters (&&, @>) on tag-like columns
+Index('idx_players_secondary_positions_gin', Player.secondary_positions, postgresql_using='gin')
+Index('idx_players_tags_gin', Player.tags, postgresql_using='gin')
+Index('idx_players_strengths_gin', Player.strengths, postgresql_using='gin')
+Index('idx_players_weaknesses_gin', Player.weaknesses, postgresql_using='gin')
+
+# JSONB documents: containment (@>) and key lookups
+Index('idx_players_current_season_stats_gin', Player.current_season_stats, postgresql_using='gin')
+Index('idx_players_performance_metrics_gin', Player.performance_metrics, postgresql_using='gin')
+Index('idx_players_tactical_attributes_gin', Player.tactical_attributes, postgresql_using='gin')
+
+# Range filters on individual stats and metrics (min_stat=goals:10, min_metric=xG:0.4)
+for _key in SEASON_STAT_KEYS:
+    Index(
+        f'idx_players_stat_{_key.lower()}',
+        jsonb_number(Player.current_season_stats, _key),
+        postgresql_where=Player.is_active
+    )
+for _key in PERFORMANCE_METRIC_KEYS:
+    Index(
+        f'idx_players_metric_{_key.lower()}',
+        jsonb_number(Player.performance_metrics, _key),
+        postgresql_where=Player.is_active
+    )
+
+# Create the helper functions before the table whenever metadata creates it
+event.listen(Player.__table__, 'before_create', SEARCH_ARRAY_FUNCTION)
+event.listen(Player.__table__, 'before_create', JSONB_NUMBER_FUNCTION)
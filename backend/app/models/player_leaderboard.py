@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.models import Base
+
+class PlayerLeaderboardEntry(Base):
+    """
+    One ranked player of a metric leaderboard, rebuilt on a schedule by
+    app/services/leaderboard.py.
+
+    position is the partition the rank applies to; an empty position is the
+    leaderboard across all positions. previous_rank and previous_value are
+    the player's standing at the refresh before, None when they were not
+    ranked then.
+    """
+    __tablename__ = "player_leaderboard"
+    
+    metric = Column(String(50), primary_key=True)
+    position = Column(String(50), primary_key=True, default='')
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    
+    rank = Column(Integer, nullable=False)
+    value = Column(Float, nullable=False)
+    previous_rank = Column(Integer)
+    previous_value = Column(Float)
+    
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<PlayerLeaderboardEntry(metric={self.metric}, position={self.position}, rank={self.rank})>"
+
+# Leaderboard pages read one partition in rank order
+Index('idx_player_leaderboard_rank', PlayerLeaderboardEntry.metric, PlayerLeaderboardEntry.position, PlayerLeaderboardEntry.rank)
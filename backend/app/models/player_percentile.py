@@ -0,0 +1,43 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+from app.models import Base
+
+class PlayerPercentile(Base):
+    """
+    Percentile ranks (0-100) of one active player's stats and metrics within
+    their position, maintained by app/services/player_percentiles.py.
+
+    percentiles maps metric name to percentile and only holds the metrics
+    the player has a value for.
+    """
+    __tablename__ = "player_percentiles"
+    
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(String(50), nullable=False, index=True)
+    percentiles = Column(JSONB, nullable=False, default=dict)
+    
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<PlayerPercentile(player_id={self.player_id}, position={self.position})>"
+
+class PercentileGroup(Base):
+    """
+    Recompute state of one position's percentiles.
+
+    fingerprint is the position's player fingerprint (see
+    app/services/player_percentiles.py) when its percentiles were last
+    computed; the group is dirty while the live fingerprint differs.
+    """
+    __tablename__ = "percentile_groups"
+    
+    position = Column(String(50), primary_key=True)
+    fingerprint = Column(String(64))  # NULL until first computed
+    
+    players = Column(Integer, nullable=False, default=0, server_default='0')
+    metric_counts = Column(JSONB, nullable=False, default=dict, server_default='{}')  # Players ranked per metric
+    computed_at = Column(DateTime(timezone=True))
+    
+    def __repr__(self):
+        return f"<PercentileGroup(position={self.position}, fingerprint={self.fingerprint})>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Index
+from sqlalchemy.sql import func
+from app.models import Base
+
+class PlayerSummaryCount(Base):
+    """
+    Rollup of active players per dimension value, kept current by the player
+    write paths (see app/services/player_summary.py).
+
+    dimension is 'position', 'nationality' or 'club'; an empty value stands
+    for players without one. Totals are summed from the position rows.
+    """
+    __tablename__ = "player_summary_counts"
+    
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(255), primary_key=True, default='')
+    
+    players = Column(Integer, nullable=False, default=0)
+    valued_players = Column(Integer, nullable=False, default=0)  # Players with a market value
+    market_value_sum = Column(BigInteger, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<PlayerSummaryCount(dimension={self.dimension}, value={self.value}, players={self.players})>"
+
+# Top-N breakdowns read each dimension in count order
+Index('idx_player_summary_counts_top', PlayerSummaryCount.dimension, PlayerSummaryCount.players.desc())
@@ -90,6 +90,12 @@ class Shortlist(BaseModel):
         if self.shared_with and str(user_id) in self.shared_with:
             self.shared_with.remove(str(user_id))
 
+# Item workflow statuses, in pipeline order (see shortlist_item_status_check)
+ITEM_STATUSES = (
+    'identified', 'scouted', 'analyzed', 'shortlisted',
+    'approached', 'negotiating', 'signed', 'rejected', 'unavailable'
+)
+
 class ShortlistItem(BaseModel):
     __tablename__ = "shortlist_items"
     
@@ -204,12 +210,7 @@ class ShortlistItem(BaseModel):
     
     def update_status(self, new_status: str, notes: str = None):
         """Update item status with optional notes"""
-        valid_statuses = [
-            'identified', 'scouted', 'analyzed', 'shortlisted', 
-            'approached', 'negotiating', 'signed', 'rejected', 'unavailable'
-        ]
-        
-        if new_status in valid_statuses:
+        if new_status in ITEM_STATUSES:
             old_status = self.status
             self.status = new_status
             
@@ -18,6 +18,7 @@ class CoachCreate(CoachBase):
     estimated_salary_eur: Optional[int] = None
     scouting_notes: Optional[str] = None
     overall_rating: Optional[int] = None
+    coaching_metrics: Optional[Dict[str, Any]] = None  # Per competition {wins, points, total_games}; "all" or "overall" for totals
     # potential_rating: Optional[int] = None
 
 class CoachUpdate(CoachCreate):
@@ -45,4 +46,20 @@ class CoachResponse(CoachBase):
     
     # class Config:
     #     from_attributes = True
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class CoachSimilarityReason(BaseModel):
+    """How much one feature contributed to a coach match"""
+    feature: str  # formations, tactical_style, leadership_style, coaching_specialties, win_rate, points_per_game
+    similarity: float  # 0-1 agreement on this feature alone
+    contribution: float  # Share of similarity_score; contributions add up to it
+    shared: List[str] = []  # Labels both coaches have (categorical features)
+    target_value: Optional[float] = None  # The target coach's value (numeric features)
+    value: Optional[float] = None  # This coach's value (numeric features)
+
+class SimilarCoachResponse(CoachResponse):
+    preferred_formations: Optional[List[str]] = None
+    leadership_style: Optional[str] = None
+    coaching_specialties: Optional[List[str]] = None
+    similarity_score: Optional[float] = None  # Weighted feature agreement with the target, 0-1
+    match_reasons: List[CoachSimilarityReason] = []
\ No newline at end of file
@@ -1,9 +1,16 @@
 from pydantic import BaseModel, Field, ConfigDict  
 from typing import Any, Dict, Generic, List, Optional, TypeVar
-from datetime import datetime
+from datetime import date, datetime
+import uuid
 
 DataT = TypeVar('DataT')
 
+# Most ids accepted by one batch fetch
+MAX_BATCH_IDS = 500
+
+# Most duplicates folded into one record per merge
+MAX_MERGE_IDS = 50
+
 class PaginationMeta(BaseModel):
     page: int = Field(..., description="Current page number")
     per_page: int = Field(..., description="Items per page")
@@ -14,12 +21,56 @@ class StandardResponse(BaseModel, Generic[DataT]):
     success: bool = Field(True, description="Indicates if the request was successful")
     data: DataT = Field(..., description="Response data")
     message: Optional[str] = Field(None, description="Optional message")
+    meta: Optional[Dict[str, Any]] = Field(None, description="Optional response metadata")
 
 class PaginatedResponse(BaseModel, Generic[DataT]):
     success: bool = Field(True, description="Indicates if the request was successful")
     data: List[DataT] = Field(..., description="List of items")
     meta: Dict[str, Any] = Field(..., description="Pagination metadata")
 
+class BatchRequest(BaseModel):
+    ids: List[uuid.UUID] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_IDS, description="IDs to fetch, in the order to return them"
+    )
+
+class DuplicateMatch(BaseModel):
+    """An existing record that likely describes the same person"""
+    id: uuid.UUID
+    name: str
+    full_name: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    nationality: Optional[str] = None
+    current_club: Optional[str] = None
+    score: float = Field(..., description="Name similarity, 0-1")
+    reasons: List[str]
+
+class MergeRequest(BaseModel):
+    duplicate_ids: List[uuid.UUID] = Field(
+        ..., min_length=1, max_length=MAX_MERGE_IDS, description="Records to fold into the surviving one"
+    )
+
+class MergeReport(BaseModel):
+    survivor_id: uuid.UUID
+    merged_ids: List[uuid.UUID]
+    repointed_items: int = Field(..., description="Shortlist items moved to the surviving record")
+    dropped_item_ids: List[uuid.UUID] = Field(
+        ..., description="Shortlist items deleted because the shortlist already held the surviving record"
+    )
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    resource: str
+    permission: str = Field("read", description="Permission on the resource needed to read this job")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    created_by: Optional[uuid.UUID] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    progress: Optional[Dict[str, Any]] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
 class ErrorResponse(BaseModel):
     success: bool = Field(False, description="Always false for error responses")
     error: Dict[str, Any] = Field(..., description="Error details")
\ No newline at end of file
@@ -1,22 +1,28 @@
-from pydantic import BaseModel, Field, ConfigDict, field_validator  
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator  
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 import uuid
 
+# Most player changes accepted by one PATCH /players/bulk request
+MAX_BULK_UPDATE_ITEMS = 50000
+
+# Largest value of the players table's Integer columns
+MAX_INTEGER = 2_147_483_647
+
 class PlayerBase(BaseModel):
     name: str = Field(..., max_length=255)
-    full_name: Optional[str] = None
+    full_name: Optional[str] = Field(None, max_length=255)
     position: str = Field(..., max_length=50)
-    current_club: Optional[str] = None
-    nationality: Optional[str] = None
-    second_nationality: Optional[str]= None
+    current_club: Optional[str] = Field(None, max_length=255)
+    nationality: Optional[str] = Field(None, max_length=100)
+    second_nationality: Optional[str]= Field(None, max_length=100)
     scouting_notes: Optional[str]= None
 
 class PlayerCreate(PlayerBase):
     date_of_birth: Optional[date] = None
     height_cm: Optional[int] = Field(None, ge=150, le=220)
     weight_kg: Optional[int] = Field(None, ge=50, le=120)
-    preferred_foot: Optional[str] = Field(None, description="Preferred foot")
+    preferred_foot: Optional[str] = Field(None, max_length=10, description="Preferred foot")
     
     @field_validator('preferred_foot')
     @classmethod
@@ -25,8 +31,8 @@ class PlayerCreate(PlayerBase):
             raise ValueError('Preferred foot must be left, right, or both')
         return v
     secondary_positions: Optional[List[str]] = []
-    market_value_eur: Optional[int] = Field(None, ge=0)
-    weekly_wage_eur: Optional[int] = Field(None, ge=0)
+    market_value_eur: Optional[int] = Field(None, ge=0, le=MAX_INTEGER)
+    weekly_wage_eur: Optional[int] = Field(None, ge=0, le=MAX_INTEGER)
     overall_rating: Optional[int]= Field(None, ge=0, le=100)
     potential_rating: Optional[int] = Field(None, ge=0, le=100)
  
@@ -50,6 +56,19 @@ class PlayerSearchResponse(BaseModel):
     market_value_eur: Optional[int] = None
     overall_rating: Optional[int] = None
     match_score: Optional[float] = None  # For search relevance
+    headline: Optional[str] = None  # Highlighted scouting notes snippet
+
+    model_config = ConfigDict(from_attributes=True)
+
+class PlayerAutocompleteResponse(BaseModel):
+    """Name suggestion for the search box"""
+    id: uuid.UUID
+    name: str
+    position: str
+    current_club: Optional[str] = None
+    nationality: Optional[str] = None
+    overall_rating: Optional[int] = None
+    market_value_eur: Optional[int] = None
 
 class PlayerUpdate(PlayerCreate):
     # name: Optional[str] = None
@@ -78,4 +97,117 @@ class PlayerResponse(PlayerBase):
     
     # class Config:
     #     from_attributes = True
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class SimilarPlayerResponse(PlayerResponse):
+    similarity_score: Optional[float] = None  # Cosine similarity within the position group
+
+class PlayerImportRowError(BaseModel):
+    """Validation problems of one uploaded row"""
+    row: int  # 1-based record number, not counting the CSV header
+    errors: List[Dict[str, Any]]
+
+class PlayerImportReport(BaseModel):
+    """Outcome of a bulk player import"""
+    received: int
+    inserted: int
+    updated: int
+    failed: int
+    duplicates: int  # Rows superseded by a later row with the same name and club
+    errors: List[PlayerImportRowError]
+    errors_truncated: bool
+    elapsed_seconds: float
+    rows_per_second: Optional[float] = None
+
+class PlayerBulkUpdateItem(BaseModel):
+    """One player's changes in a bulk update; only the fields sent are written (null clears)"""
+    model_config = ConfigDict(extra='forbid')
+
+    id: uuid.UUID
+    market_value_eur: Optional[int] = Field(None, ge=0, le=MAX_INTEGER)
+    weekly_wage_eur: Optional[int] = Field(None, ge=0, le=MAX_INTEGER)
+    release_clause_eur: Optional[int] = Field(None, ge=0, le=MAX_INTEGER)
+    overall_rating: Optional[int] = Field(None, ge=0, le=100)
+    potential_rating: Optional[int] = Field(None, ge=0, le=100)
+    contract_expires: Optional[date] = None
+
+    @model_validator(mode='after')
+    def validate_has_changes(self):
+        if not self.model_fields_set - {'id'}:
+            raise ValueError('At least one field to update is required')
+        return self
+
+class PlayerBulkUpdateOutcome(BaseModel):
+    id: uuid.UUID
+    status: str = Field(..., description="updated, unchanged or not_found")
+
+class PlayerBulkUpdateReport(BaseModel):
+    """Outcome of a bulk player update"""
+    received: int
+    players: int  # Distinct ids; repeated ids are merged, later fields winning
+    updated: int
+    unchanged: int
+    not_found: int
+    results: List[PlayerBulkUpdateOutcome]
+    elapsed_seconds: float
+
+class ContractRadarPlayer(BaseModel):
+    id: uuid.UUID
+    name: str
+    current_club: Optional[str] = None
+    age: Optional[int] = None
+    market_value_eur: Optional[int] = None
+    contract_expires: date
+
+class ContractRadarBucket(BaseModel):
+    """Players of one position whose contracts expire in one month"""
+    month: str  # YYYY-MM
+    position: Optional[str] = None
+    players: int
+    total_market_value_eur: int
+    value_bands: Dict[str, int]  # Player counts per market value band, plus unknown
+    top_players: List[ContractRadarPlayer]  # Most valuable first
+
+class ContractRadarWindow(BaseModel):
+    months: int
+    players: int
+    total_market_value_eur: int
+
+class ContractRadarResponse(BaseModel):
+    """Active players whose contracts expire between as_of and window_end"""
+    as_of: date
+    window_end: date
+    months: int
+    players: int
+    total_market_value_eur: int
+    value_bands: Dict[str, int]
+    windows: List[ContractRadarWindow]  # Totals for the standard 6/12/18 month horizons
+    buckets: List[ContractRadarBucket]
+    generated_at: datetime
+
+class PlayerPercentileRank(BaseModel):
+    metric: str
+    percentile: float  # 0-100; share of the position below the player's value, ties counting half
+    players: int  # Players of the position with a value for this metric
+
+class PlayerPercentilesResponse(BaseModel):
+    """A player's stats and metrics ranked within their position"""
+    player_id: uuid.UUID
+    position: str
+    players: int  # Active players of the position
+    percentiles: List[PlayerPercentileRank]  # Only metrics the player has a value for
+    computed_at: Optional[datetime] = None
+    stale: bool  # Recent writes are not reflected yet; the group is being recomputed elsewhere
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    player_id: uuid.UUID
+    name: str
+    current_club: Optional[str] = None
+    nationality: Optional[str] = None
+    position: str
+    value: float
+    previous_rank: Optional[int] = None  # Rank at the refresh before; None when not ranked then
+    rank_change: Optional[int] = None  # Places climbed since the refresh before
+    value_change: Optional[float] = None
+    refreshed_at: datetime
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict, field_validator  
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 import uuid
 
@@ -60,6 +60,16 @@ class ShortlistUpdate(BaseModel):
     budget_eur: Optional[int] = None
 
 
+class ShortlistSummaryResponse(ShortlistBase):
+    """A shortlist in list views: item aggregates instead of the items"""
+    id: uuid.UUID
+    status: str
+    priority: str
+    items_count: int = 0
+    total_estimated_cost: int = 0  # Sum of the items' estimated_fee_eur
+    status_counts: Dict[str, int] = {}  # Items per item status, every status included
+    created_at: datetime
+
 class ShortlistResponse(ShortlistBase):
     id: uuid.UUID
     status: str
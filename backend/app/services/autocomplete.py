@@ -0,0 +1,332 @@
+"""
+In-memory player name autocomplete.
+
+Names and full names are normalized (accent-folded, case-folded, punctuation
+dropped) into prefix keys, one per word start, and held in a sorted NumPy
+byte-string array: a prefix lookup is two binary searches, and the best
+players in the matching range are picked with argpartition over a score
+that orders by overall_rating, then market_value_eur.
+
+Player writes land in a small overlay (a bisect-sorted key list) instead
+of re-sorting the array; the overlay is folded back into a fresh sorted
+array once it grows past AUTOCOMPLETE_OVERLAY_MAX players.
+"""
+
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_generation
+from app.core.config import settings
+from app.models import Player
+
+logger = logging.getLogger(__name__)
+
+# Keys are stored as UTF-8 truncated to this many bytes; longer queries are
+# cut to match, and their matches confirmed against the full names
+KEY_BYTES = 48
+
+# Prefix keys kept per player (full strings plus later word starts)
+MAX_KEYS_PER_PLAYER = 6
+
+# Re-read window behind the watermark, for transactions that committed late
+SYNC_OVERLAP = timedelta(seconds=60)
+
+SYNC_COLUMNS = (
+    Player.id, Player.is_active, Player.name, Player.full_name, Player.position,
+    Player.current_club, Player.nationality, Player.overall_rating, Player.market_value_eur
+)
+
+# Letters NFKD leaves undecomposed
+_FOLD = str.maketrans({"ø": "o", "đ": "d", "ł": "l", "ħ": "h", "ı": "i", "æ": "ae", "œ": "oe", "þ": "th", "ð": "d"})
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Accent- and case-folded text with punctuation collapsed to single spaces"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char)).translate(_FOLD)
+    return _NON_WORD.sub(" ", folded.replace("_", " ")).strip()
+
+
+def _encode(text: str) -> bytes:
+    return text.encode("utf-8")[:KEY_BYTES]
+
+
+def prefix_keys(name: Optional[str], full_name: Optional[str]) -> List[bytes]:
+    """Lookup keys of a player: each name from each of its word starts ("haaland" for "Erling Haaland")"""
+    keys = []
+    for value in (name, full_name):
+        words = normalize(value).split(" ")
+        keys.extend(" ".join(words[start:]) for start in range(len(words)) if words[start])
+    return list(dict.fromkeys(_encode(key) for key in keys))[:MAX_KEYS_PER_PLAYER]
+
+
+def match_text(name: Optional[str], full_name: Optional[str]) -> str:
+    """Normalized names with a space before every word start, for confirming long queries"""
+    return "\n".join(f" {normalize(value)}" for value in (name, full_name))
+
+
+def score(overall_rating: Optional[int], market_value_eur: Optional[int]) -> float:
+    """Ranking score: overall_rating first, market value breaks ties"""
+    value = min(max(market_value_eur or 0, 0), 10 ** 10 - 1)
+    return float((overall_rating if overall_rating is not None else -1) * 10 ** 10 + value)
+
+
+class Suggestion(NamedTuple):
+    id: uuid.UUID
+    name: str
+    position: str
+    current_club: Optional[str]
+    nationality: Optional[str]
+    overall_rating: Optional[int]
+    market_value_eur: Optional[int]
+
+
+class _Entry(NamedTuple):
+    keys: List[bytes]
+    score: float
+    suggestion: Suggestion
+    text: str  # match_text of the player's names
+
+
+def _entry(row) -> _Entry:
+    return _Entry(
+        prefix_keys(row.name, row.full_name),
+        score(row.overall_rating, row.market_value_eur),
+        Suggestion(
+            row.id, row.name, row.position, row.current_club, row.nationality,
+            row.overall_rating, row.market_value_eur
+        ),
+        match_text(row.name, row.full_name)
+    )
+
+
+class _SortedNames:
+    """Immutable sorted key array over a fixed set of players; rows can only be retired"""
+
+    def __init__(self, entries: List[_Entry]):
+        self.suggestions = [entry.suggestion for entry in entries]
+        self.texts = [entry.text for entry in entries]
+        self.rows = {entry.suggestion.id: row for row, entry in enumerate(entries)}
+        self.scores = np.array([entry.score for entry in entries], dtype=np.float64)
+        self.alive = np.ones(len(entries), dtype=bool)
+
+        counts = [len(entry.keys) for entry in entries]
+        keys = np.array([key for entry in entries for key in entry.keys], dtype=f"S{KEY_BYTES}")
+        key_rows = np.repeat(np.arange(len(entries), dtype=np.int32), counts)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.key_rows = key_rows[order]
+
+    def retire(self, player_id: uuid.UUID) -> None:
+        row = self.rows.get(player_id)
+        if row is not None:
+            self.alive[row] = False
+
+    def live_entries(self) -> List[_Entry]:
+        """Entries of the rows still alive, for rebuilding"""
+        keys: Dict[int, List[bytes]] = {}
+        for key, row in zip(self.keys.tolist(), self.key_rows.tolist()):
+            if self.alive[row]:
+                keys.setdefault(row, []).append(key)
+        return [
+            _Entry(keys.get(row, []), float(self.scores[row]), suggestion, self.texts[row])
+            for row, suggestion in enumerate(self.suggestions) if self.alive[row]
+        ]
+
+    def top(self, prefix: bytes, limit: int, confirm: Optional[str] = None) -> List[Tuple[float, Suggestion]]:
+        """Best `limit` players with a key starting with `prefix` (and whose match_text contains `confirm`)"""
+        if len(prefix) >= KEY_BYTES:
+            # prefix + b"\xff" would be cut back to prefix at the key width
+            lo = int(np.searchsorted(self.keys, prefix, side="left"))
+            hi = int(np.searchsorted(self.keys, prefix, side="right"))
+        else:
+            lo = int(np.searchsorted(self.keys, prefix, side="left"))
+            hi = int(np.searchsorted(self.keys, prefix + b"\xff", side="left"))
+        if lo >= hi:
+            return []
+
+        rows = self.key_rows[lo:hi]
+        if confirm is not None:
+            rows = rows[np.fromiter((confirm in self.texts[row] for row in rows.tolist()), dtype=bool, count=len(rows))]
+            if not len(rows):
+                return []
+        scores = np.where(self.alive[rows], self.scores[rows], -np.inf)
+        # A player matches through at most MAX_KEYS_PER_PLAYER keys, so this many
+        # best keys always hold the best `limit` distinct players
+        k = min(len(rows), limit * MAX_KEYS_PER_PLAYER)
+        best = np.argpartition(-scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        best = best[np.argsort(-scores[best], kind="stable")]
+
+        results, seen = [], set()
+        for index in best:
+            if scores[index] == -np.inf or len(results) == limit:
+                break
+            row = int(rows[index])
+            if row not in seen:
+                seen.add(row)
+                results.append((float(scores[index]), self.suggestions[row]))
+        return results
+
+
+class _Overlay:
+    """Recently changed players, with their keys kept sorted for range lookups"""
+
+    def __init__(self):
+        self.entries: Dict[uuid.UUID, _Entry] = {}
+        self._keys: List[Tuple[bytes, uuid.UUID]] = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def values(self) -> List[_Entry]:
+        return list(self.entries.values())
+
+    def put(self, player_id: uuid.UUID, entry: _Entry) -> None:
+        self.pop(player_id)
+        self.entries[player_id] = entry
+        for key in entry.keys:
+            bisect.insort(self._keys, (key, player_id))
+
+    def pop(self, player_id: uuid.UUID) -> None:
+        entry = self.entries.pop(player_id, None)
+        if entry is None:
+            return
+        for key in entry.keys:
+            position = bisect.bisect_left(self._keys, (key, player_id))
+            if position < len(self._keys) and self._keys[position] == (key, player_id):
+                del self._keys[position]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._keys.clear()
+
+    def top(self, prefix: bytes, limit: int, confirm: Optional[str] = None) -> List[Tuple[float, Suggestion]]:
+        # Tuples compare by key first, so (prefix,) sorts before every (prefix..., id)
+        lo = bisect.bisect_left(self._keys, (prefix,))
+        hi = bisect.bisect_left(self._keys, (prefix + b"\xff",))
+        matched = {
+            player_id for _, player_id in self._keys[lo:hi]
+            if confirm is None or confirm in self.entries[player_id].text
+        }
+        best = heapq.nlargest(limit, (self.entries[player_id] for player_id in matched), key=lambda entry: entry.score)
+        return [(entry.score, entry.suggestion) for entry in best]
+
+
+class AutocompleteIndex:
+    """Prefix search over player names, ranked by rating then market value"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._base: Optional[_SortedNames] = None
+        self._overlay = _Overlay()
+        self._stale = False
+        self._watermark: Optional[datetime] = None
+        self._generation: Optional[int] = None
+        self._synced_at = 0.0
+
+    def __len__(self) -> int:
+        if self._base is None:
+            return 0
+        return int(self._base.alive.sum()) + len(self._overlay)
+
+    def mark_stale(self) -> None:
+        """Sync before the next query (called after local player writes)"""
+        self._stale = True
+
+    def ensure_fresh(self, db: Session, redis_client=None) -> None:
+        """
+        Load on first use, then apply player changes since the last sync.
+
+        Writes from other workers are noticed through the Redis `players`
+        generation, or every AUTOCOMPLETE_SYNC_SECONDS without Redis.
+        """
+        with self._lock:
+            generation = get_generation(redis_client, "players")
+            if self._base is None:
+                self._load(db)
+            elif self._stale or (
+                generation != self._generation if generation is not None
+                else time.monotonic() - self._synced_at >= settings.AUTOCOMPLETE_SYNC_SECONDS
+            ):
+                self._sync(db)
+            self._generation = generation
+
+    def _changed_at(self):
+        return func.coalesce(Player.updated_at, Player.created_at)
+
+    def _load(self, db: Session) -> None:
+        started = time.perf_counter()
+        watermark = db.query(func.max(self._changed_at())).scalar()
+        rows = db.query(*SYNC_COLUMNS).filter(Player.is_active == True).all()
+
+        self._base = _SortedNames([_entry(row) for row in rows])
+        self._overlay.clear()
+        self._watermark = watermark
+        self._stale = False
+        self._synced_at = time.monotonic()
+        logger.info(f"Autocomplete index loaded {len(rows)} players in {time.perf_counter() - started:.2f}s")
+
+    def _sync(self, db: Session) -> None:
+        changed_at = self._changed_at()
+        query = db.query(*SYNC_COLUMNS, changed_at.label("changed_at"))
+        if self._watermark is not None:
+            query = query.filter(changed_at > self._watermark - SYNC_OVERLAP)
+
+        for row in query.all():
+            # The base copy is retired for good; the overlay holds the current version
+            self._base.retire(row.id)
+            if row.is_active:
+                self._overlay.put(row.id, _entry(row))
+            else:
+                self._overlay.pop(row.id)
+            if self._watermark is None or row.changed_at > self._watermark:
+                self._watermark = row.changed_at
+
+        if len(self._overlay) > settings.AUTOCOMPLETE_OVERLAY_MAX:
+            self._compact()
+        self._stale = False
+        self._synced_at = time.monotonic()
+
+    def _compact(self) -> None:
+        """Fold the overlay into a new sorted array"""
+        started = time.perf_counter()
+        self._base = _SortedNames(self._base.live_entries() + self._overlay.values())
+        self._overlay.clear()
+        logger.info(f"Autocomplete index compacted in {time.perf_counter() - started:.2f}s")
+
+    def search(self, query: str, limit: int) -> List[Suggestion]:
+        """The best `limit` players with a name or name word starting with `query`"""
+        normalized = normalize(query)
+        prefix = _encode(normalized)
+        if not prefix:
+            return []
+        # Cut queries match every key sharing their first KEY_BYTES bytes
+        confirm = f" {normalized}" if len(normalized.encode("utf-8")) > KEY_BYTES else None
+
+        with self._lock:
+            if self._base is None:
+                return []
+            matches = self._base.top(prefix, limit, confirm)
+            matches.extend(self._overlay.top(prefix, limit, confirm))
+
+        matches.sort(key=lambda match: -match[0])
+        return [suggestion for _, suggestion in matches[:limit]]
+
+
+# Shared by all requests in this process
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,94 @@
+"""
+Per-competition win rate and points per game of coaches, kept in the
+`coach_performance` side table so coach lists can filter and sort on them
+in SQL.
+
+Figures are derived from `Coach.coaching_metrics` the way
+Coach.get_win_rate and Coach.get_points_per_game read it: one entry per
+competition holding `wins`, `points` and `total_games`. Write paths that
+set coaching_metrics call `sync_coach` before committing; the migration
+that added the table seeded it with the same rules in SQL.
+"""
+
+import math
+import uuid
+from typing import Dict, Optional
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.models import CoachPerformance
+
+# Competition of the figures Coach.get_win_rate() reports by default
+ALL_COMPETITIONS = "all"
+
+# Longest competition key stored; longer keys are skipped
+MAX_COMPETITION_LENGTH = 100
+
+
+def _number(value) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value)
+
+
+def _from_totals(totals: dict) -> Optional[dict]:
+    """Rates of one competition entry; None without games or anything to rate"""
+    games = _number(totals.get("total_games"))
+    if not games or games < 0:
+        return None
+    wins, points = _number(totals.get("wins")), _number(totals.get("points"))
+    if wins is None and points is None:
+        return None
+    return {
+        "games": int(games),
+        "win_rate": wins / games * 100 if wins is not None else None,
+        "points_per_game": points / games if points is not None else None
+    }
+
+
+def _from_rates(coaching_metrics: dict) -> Optional[dict]:
+    """Flat `win_rate` (a fraction up to 1, else percent) and `points_per_game`/`avg_points` values"""
+    win_rate = _number(coaching_metrics.get("win_rate"))
+    points_per_game = _number(coaching_metrics.get("points_per_game", coaching_metrics.get("avg_points")))
+    if win_rate is None and points_per_game is None:
+        return None
+    if win_rate is not None and win_rate <= 1:
+        win_rate *= 100
+    return {"games": None, "win_rate": win_rate, "points_per_game": points_per_game}
+
+
+def performance_by_competition(coaching_metrics) -> Dict[str, dict]:
+    """
+    `{competition: {"games", "win_rate", "points_per_game"}}` from coaching_metrics.
+
+    Every competition entry with games played counts. "all" falls back to
+    the "overall" entry, as in Coach.get_win_rate, and then to flat rate
+    values. Figures that cannot be derived are None.
+    """
+    if not isinstance(coaching_metrics, dict):
+        return {}
+
+    figures = {}
+    for competition, totals in coaching_metrics.items():
+        if isinstance(totals, dict) and len(competition) <= MAX_COMPETITION_LENGTH:
+            rates = _from_totals(totals)
+            if rates is not None:
+                figures[competition] = rates
+
+    if ALL_COMPETITIONS not in figures:
+        overall = figures.get("overall") or _from_rates(coaching_metrics)
+        if overall is not None:
+            figures[ALL_COMPETITIONS] = overall
+    return figures
+
+
+def sync_coach(db: Session, coach_id: uuid.UUID, coaching_metrics) -> None:
+    """Replace one coach's rows with figures from `coaching_metrics`, within the caller's transaction"""
+    db.execute(delete(CoachPerformance).where(CoachPerformance.coach_id == coach_id))
+    rows = [
+        {"coach_id": coach_id, "competition": competition, **rates}
+        for competition, rates in performance_by_competition(coaching_metrics).items()
+    ]
+    if rows:
+        db.execute(insert(CoachPerformance), rows)
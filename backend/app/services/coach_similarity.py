@@ -0,0 +1,280 @@
+"""
+In-process similarity index over coaches' tactical profiles.
+
+Every active coach is encoded into one row of a float32 matrix made of
+feature blocks: formations, tactical style, leadership style and coaching
+specialties one-hot (multi-hot where a coach has several), plus win rate
+and points per game (see app.services.coach_performance). Each block is
+unit-length and scaled by the square root of its weight, so one
+matrix-vector product gives every coach's weighted sum of per-block
+cosine similarities to the target. The same block slices, applied to the
+top-K rows only, explain which features drove each match.
+
+Coaches are few, so the index is rebuilt as a whole when coach writes
+bump the Redis "coaches" generation (or every
+SIMILARITY_INDEX_SYNC_SECONDS without Redis).
+"""
+
+import logging
+import math
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_generation
+from app.core.config import settings
+from app.models import Coach
+from app.services.coach_performance import ALL_COMPETITIONS, performance_by_competition
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of each feature block in the similarity score
+FEATURE_WEIGHTS = {
+    "formations": 3.0,
+    "tactical_style": 3.0,
+    "leadership_style": 1.0,
+    "coaching_specialties": 2.0,
+    "win_rate": 1.5,
+    "points_per_game": 1.5,
+}
+
+CATEGORICAL_FEATURES = ("formations", "tactical_style", "leadership_style", "coaching_specialties")
+
+# Scale of the numeric features: win rate in percent, points per game out of 3
+NUMERIC_FEATURES = {"win_rate": 100.0, "points_per_game": 3.0}
+
+LOAD_COLUMNS = (
+    Coach.id, Coach.current_role, Coach.preferred_formation, Coach.preferred_formations, Coach.tactical_style,
+    Coach.leadership_style, Coach.coaching_specialties, Coach.coaching_metrics
+)
+
+
+def _label(value) -> Optional[str]:
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+
+def encode_coach(row) -> Dict[str, Dict[str, float]]:
+    """
+    Categorical features of one coach as `{feature: {label: weight}}`.
+
+    Tactical style keys count when true or positive; numeric intensities
+    are kept and scaled against the largest seen, string values become
+    `key:value` labels and lists one label per item.
+    """
+    formations = {
+        formation.strip(): 1.0
+        for formation in [row.preferred_formation, *(row.preferred_formations or [])]
+        if isinstance(formation, str) and formation.strip()
+    }
+
+    if isinstance(row.tactical_style, dict):
+        items = list(row.tactical_style.items())
+    elif isinstance(row.tactical_style, list):
+        items = [(value, True) for value in row.tactical_style]
+    else:
+        items = []
+
+    style: Dict[str, float] = {}
+    for key, value in items:
+        key = _label(key)
+        if key is None:
+            continue
+        if value is True:
+            style[key] = 1.0
+        elif isinstance(value, (int, float)) and math.isfinite(value) and value > 0:
+            style[key] = float(value)
+        elif _label(value) is not None:
+            style[f"{key}:{_label(value)}"] = 1.0
+        elif isinstance(value, list):
+            style.update((f"{key}:{_label(item)}", 1.0) for item in value if _label(item) is not None)
+
+    leadership = _label(row.leadership_style)
+    return {
+        "formations": formations,
+        "tactical_style": style,
+        "leadership_style": {leadership: 1.0} if leadership else {},
+        "coaching_specialties": {
+            label: 1.0 for label in map(_label, row.coaching_specialties or []) if label is not None
+        },
+    }
+
+
+def _angle(value: float, scale: float) -> Tuple[float, float]:
+    """
+    A numeric value as a unit vector in the first quadrant.
+
+    The dot product of two such vectors is cos(pi/2 * |a - b| / scale):
+    1 for equal values, falling to 0 at opposite ends of the scale.
+    """
+    angle = min(max(value / scale, 0.0), 1.0) * math.pi / 2
+    return math.cos(angle), math.sin(angle)
+
+
+class CoachSimilarityIndex:
+    """Weighted cosine top-K over encoded coach features"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ids: List[uuid.UUID] = []
+        self._rows: Dict[uuid.UUID, int] = {}
+        self._roles = np.empty(0, dtype=object)
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._present = np.empty((0, len(FEATURE_WEIGHTS)), dtype=bool)
+        self._numeric = np.empty((0, len(NUMERIC_FEATURES)))
+        self._blocks: Dict[str, slice] = {}
+        self._labels: List[str] = []
+        self._loaded = False
+        self._stale = False
+        self._generation: Optional[int] = None
+        self._synced_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def mark_stale(self) -> None:
+        """Rebuild before the next query (called after local coach writes)"""
+        self._stale = True
+
+    def ensure_fresh(self, db: Session, redis_client=None) -> None:
+        """Build the index on first use, and again once coaches have changed"""
+        with self._lock:
+            generation = get_generation(redis_client, "coaches")
+            if not self._loaded or self._stale or (
+                generation != self._generation if generation is not None
+                else time.monotonic() - self._synced_at >= settings.SIMILARITY_INDEX_SYNC_SECONDS
+            ):
+                self._load(db)
+            self._generation = generation
+
+    def _load(self, db: Session) -> None:
+        started = time.perf_counter()
+        rows = db.query(*LOAD_COLUMNS).filter(Coach.is_active == True).all()
+        encoded = [encode_coach(row) for row in rows]
+        performance = [performance_by_competition(row.coaching_metrics).get(ALL_COMPETITIONS, {}) for row in rows]
+        numeric = np.array(
+            [[figures.get(feature) for feature in NUMERIC_FEATURES] for figures in performance], dtype=np.float64
+        ).reshape(len(rows), len(NUMERIC_FEATURES))
+
+        # Column layout: one column per label of each categorical block, two per numeric one
+        blocks: Dict[str, slice] = {}
+        labels: List[str] = []
+        vocabulary: Dict[str, Dict[str, int]] = {}
+        for feature in CATEGORICAL_FEATURES:
+            names = sorted({label for features in encoded for label in features[feature]})
+            vocabulary[feature] = {label: len(labels) + offset for offset, label in enumerate(names)}
+            blocks[feature] = slice(len(labels), len(labels) + len(names))
+            labels.extend(names)
+        for feature in NUMERIC_FEATURES:
+            blocks[feature] = slice(len(labels), len(labels) + 2)
+            labels.extend((feature, feature))
+
+        matrix = np.zeros((len(rows), len(labels)), dtype=np.float32)
+        for row, features in enumerate(encoded):
+            for feature in CATEGORICAL_FEATURES:
+                for label, value in features[feature].items():
+                    matrix[row, vocabulary[feature][label]] = value
+        for column, (feature, scale) in enumerate(NUMERIC_FEATURES.items()):
+            for row in np.flatnonzero(~np.isnan(numeric[:, column])):
+                matrix[row, blocks[feature]] = _angle(numeric[row, column], scale)
+
+        # Tactical intensities on a 0-1 scale, relative to each key's largest value
+        style = matrix[:, blocks["tactical_style"]]
+        peaks = style.max(axis=0) if len(style) else np.empty(0, dtype=np.float32)
+        style /= np.where(peaks > 0, peaks, 1.0)
+
+        # Unit-length blocks, scaled so dot products add up weighted similarities
+        present = np.zeros((len(rows), len(FEATURE_WEIGHTS)), dtype=bool)
+        for index, (feature, weight) in enumerate(FEATURE_WEIGHTS.items()):
+            block = matrix[:, blocks[feature]]
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            block *= np.sqrt(weight) / np.where(norms > 0, norms, 1.0)
+            present[:, index] = norms[:, 0] > 0
+
+        self._ids = [row.id for row in rows]
+        self._rows = {coach_id: row for row, coach_id in enumerate(self._ids)}
+        self._roles = np.array([_label(row.current_role) for row in rows], dtype=object)
+        self._matrix = np.ascontiguousarray(matrix)
+        self._present = present
+        self._numeric = numeric
+        self._blocks = blocks
+        self._labels = labels
+        self._loaded = True
+        self._stale = False
+        self._synced_at = time.monotonic()
+        logger.info(
+            f"Coach similarity index loaded {len(rows)} coaches "
+            f"({len(labels)} features) in {time.perf_counter() - started:.2f}s"
+        )
+
+    def _reasons(self, target: int, row: int, denominator: float) -> List[dict]:
+        """Per-feature similarity of one match, largest contribution first"""
+        reasons = []
+        for feature, weight in FEATURE_WEIGHTS.items():
+            columns = self._blocks[feature]
+            weighted = float(np.dot(self._matrix[row, columns], self._matrix[target, columns]))
+            if weighted <= 0:
+                continue
+            reason = {
+                "feature": feature,
+                "similarity": round(weighted / weight, 4),
+                "contribution": round(weighted / denominator, 4),
+                "shared": [],
+                "target_value": None,
+                "value": None
+            }
+            if feature in NUMERIC_FEATURES:
+                column = list(NUMERIC_FEATURES).index(feature)
+                reason["target_value"] = round(float(self._numeric[target, column]), 2)
+                reason["value"] = round(float(self._numeric[row, column]), 2)
+            else:
+                both = (self._matrix[row, columns] > 0) & (self._matrix[target, columns] > 0)
+                reason["shared"] = [self._labels[columns.start + offset] for offset in np.flatnonzero(both)]
+            reasons.append(reason)
+        return sorted(reasons, key=lambda reason: -reason["contribution"])
+
+    def similar(self, coach_id: uuid.UUID, k: int, same_role: bool = True) -> Optional[List[dict]]:
+        """
+        The `k` coaches most similar to `coach_id`, best first, as
+        `{"id", "score", "reasons"}` with the score between 0 and 1.
+
+        The score is the weighted share of the features the target has
+        that a match agrees with. Returns None when the coach is not
+        indexed or has no encodable features, so callers can fall back to
+        attribute matching.
+        """
+        with self._lock:
+            target = self._rows.get(coach_id)
+            if target is None or not self._present[target].any():
+                return None
+
+            denominator = float(np.dot(self._present[target], list(FEATURE_WEIGHTS.values())))
+            scores = self._matrix @ self._matrix[target]
+
+            mask = np.ones(len(self._ids), dtype=bool)
+            mask[target] = False
+            if same_role and self._roles[target] is not None:
+                mask &= self._roles == self._roles[target]
+            candidates = int(mask.sum())
+            if candidates == 0:
+                return []
+
+            scores[~mask] = -np.inf
+            k = min(k, candidates)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                {
+                    "id": self._ids[row],
+                    "score": round(float(scores[row]) / denominator, 6),
+                    "reasons": self._reasons(target, row, denominator)
+                }
+                for row in top
+            ]
+
+
+# Shared by all requests in this process
+coach_similarity_index = CoachSimilarityIndex()
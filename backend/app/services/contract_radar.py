@@ -0,0 +1,254 @@
+"""
+Contract-expiry radar: active players whose contracts run out in the
+coming months, bucketed by expiry month and position.
+
+The radar is aggregated for the whole CONTRACT_RADAR_MAX_MONTHS horizon
+at once, with two range scans of the partial index on active players'
+`contract_expires`, and cached in Redis under the "contract_radar"
+generation. Player writes that touch RADAR_FIELDS bump it (see
+player_events.players_committed). Requests for a shorter window or a
+single position or value band are sliced from the cached radar, which
+keeps each bucket's most valuable players per value band.
+"""
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache_get, cache_set, get_generation
+from app.core.config import settings
+from app.core.projection import age_from_birth_date
+from app.models import Player
+
+NAMESPACE = "contract_radar"
+
+# Player columns the radar reads; writes to any other column leave it valid
+RADAR_FIELDS = frozenset({
+    "is_active", "contract_expires", "position", "market_value_eur", "name", "current_club", "date_of_birth"
+})
+
+# Market value bands as (name, lower bound inclusive, upper bound exclusive)
+VALUE_BANDS = (
+    ("under_1m", 0, 1_000_000),
+    ("1m_5m", 1_000_000, 5_000_000),
+    ("5m_20m", 5_000_000, 20_000_000),
+    ("20m_50m", 20_000_000, 50_000_000),
+    ("50m_plus", 50_000_000, None),
+)
+
+# Players without a market value
+UNKNOWN_BAND = "unknown"
+
+# Summary windows reported with every radar, in months
+WINDOWS = (6, 12, 18)
+
+
+def _add_months(day: date, months: int) -> date:
+    """First day of the month `months` after the month of `day`"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _band_counts(values: dict) -> dict:
+    return {name: values.get(name, 0) for name, _, _ in VALUE_BANDS} | {UNKNOWN_BAND: values.get(UNKNOWN_BAND, 0)}
+
+
+def _band_condition(lower: int, upper: Optional[int]):
+    return and_(Player.market_value_eur >= lower, *([Player.market_value_eur < upper] if upper is not None else []))
+
+
+def build_radar(db: Session, today: date) -> dict:
+    """Aggregate the radar for contracts expiring from `today` to the end of the horizon"""
+    horizon = _add_months(today, settings.CONTRACT_RADAR_MAX_MONTHS)
+    month = func.to_char(Player.contract_expires, "YYYY-MM")
+    in_window = and_(
+        Player.is_active == True,
+        Player.contract_expires >= today,
+        Player.contract_expires < horizon
+    )
+
+    band_columns = [
+        column
+        for name, lower, upper in VALUE_BANDS
+        for column in (
+            func.count().filter(_band_condition(lower, upper)).label(name),
+            func.coalesce(func.sum(Player.market_value_eur).filter(_band_condition(lower, upper)), 0).label(
+                f"{name}_market_value_eur"
+            )
+        )
+    ]
+    rows = db.execute(
+        select(
+            month.label("month"),
+            Player.position,
+            func.count().label("players"),
+            func.coalesce(func.sum(Player.market_value_eur), 0).label("total_market_value_eur"),
+            func.count().filter(Player.market_value_eur.is_(None)).label(UNKNOWN_BAND),
+            *band_columns
+        )
+        .where(in_window)
+        .group_by(month, Player.position)
+        .order_by(month, Player.position)
+    ).mappings().all()
+
+    buckets = {
+        (row["month"], row["position"]): {
+            "month": row["month"],
+            "position": row["position"],
+            "players": row["players"],
+            "total_market_value_eur": int(row["total_market_value_eur"]),
+            "value_bands": _band_counts(row),
+            "band_market_value_eur": _band_counts({
+                name: int(row[f"{name}_market_value_eur"]) for name, _, _ in VALUE_BANDS
+            }),
+            "top_players": {name: [] for name in _band_counts({})}
+        }
+        for row in rows
+    }
+
+    # Most valuable players per bucket and value band, ranked in the same scan
+    band = case(
+        *[(_band_condition(lower, upper), name) for name, lower, upper in VALUE_BANDS],
+        else_=UNKNOWN_BAND
+    )
+    rank = func.row_number().over(
+        partition_by=(month, Player.position, band),
+        order_by=(Player.market_value_eur.desc().nullslast(), Player.id)
+    )
+    ranked = (
+        select(
+            month.label("month"),
+            band.label("band"),
+            Player.id, Player.name, Player.position, Player.current_club, Player.date_of_birth,
+            Player.market_value_eur, Player.contract_expires,
+            rank.label("rank")
+        )
+        .where(in_window)
+        .subquery()
+    )
+    for row in db.execute(
+        select(ranked)
+        .where(ranked.c.rank <= settings.CONTRACT_RADAR_TOP_PLAYERS)
+        .order_by(ranked.c.month, ranked.c.position, ranked.c.band, ranked.c.rank)
+    ).mappings():
+        buckets[(row["month"], row["position"])]["top_players"][row["band"]].append({
+            "id": str(row["id"]),
+            "name": row["name"],
+            "current_club": row["current_club"],
+            "age": age_from_birth_date(row["date_of_birth"]),
+            "market_value_eur": row["market_value_eur"],
+            "contract_expires": row["contract_expires"].isoformat()
+        })
+
+    return {
+        "as_of": today.isoformat(),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "buckets": list(buckets.values())
+    }
+
+
+def get_radar(db: Session, redis_client) -> dict:
+    """The current radar, from Redis when a build for this generation and day is cached"""
+    today = date.today()
+    generation = get_generation(redis_client, NAMESPACE)
+    if generation is None:
+        return build_radar(db, today)
+
+    # The window starts today, so a new day needs a new build too
+    key = f"{NAMESPACE}:bands:{generation}:{today.isoformat()}"
+    body = cache_get(redis_client, key)
+    if body is not None:
+        return json.loads(body)
+
+    radar = build_radar(db, today)
+    cache_set(redis_client, key, json.dumps(radar), settings.CONTRACT_RADAR_CACHE_TTL_SECONDS)
+    return radar
+
+
+def _within(radar: dict, months: int, position: Optional[str]) -> List[dict]:
+    """Buckets of the first `months` months (the current one included), optionally of one position"""
+    last_month = _add_months(date.fromisoformat(radar["as_of"]), months - 1).strftime("%Y-%m")
+    return [
+        bucket for bucket in radar["buckets"]
+        if bucket["month"] <= last_month
+        and (position is None or (bucket["position"] or "").lower() == position.lower())
+    ]
+
+
+def _bucket_view(bucket: dict, top: int, value_band: Optional[str]) -> dict:
+    """
+    One cached bucket as reported, limited to `value_band` when given.
+
+    Bands are ranked separately; without a band the most valuable players
+    are the bands' lists from the highest band down, unknown values last.
+    """
+    if value_band is None:
+        players = bucket["players"]
+        total = bucket["total_market_value_eur"]
+        value_bands = bucket["value_bands"]
+        bands = [name for name, _, _ in reversed(VALUE_BANDS)] + [UNKNOWN_BAND]
+    else:
+        players = bucket["value_bands"][value_band]
+        total = bucket["band_market_value_eur"][value_band]
+        value_bands = _band_counts({value_band: players})
+        bands = [value_band]
+
+    top_players = [player for name in bands for player in bucket["top_players"][name]]
+    return {
+        "month": bucket["month"],
+        "position": bucket["position"],
+        "players": players,
+        "total_market_value_eur": total,
+        "value_bands": value_bands,
+        "top_players": top_players[:top]
+    }
+
+
+def radar_view(
+    radar: dict,
+    months: int,
+    position: Optional[str] = None,
+    top: Optional[int] = None,
+    value_band: Optional[str] = None
+) -> dict:
+    """
+    Slice a radar to its first `months` months and optionally one position
+    and value band, keeping `top` players per bucket.
+    """
+    as_of = date.fromisoformat(radar["as_of"])
+    top = settings.CONTRACT_RADAR_TOP_PLAYERS if top is None else top
+    buckets = [
+        view
+        for view in (_bucket_view(bucket, top, value_band) for bucket in _within(radar, months, position))
+        if view["players"]
+    ]
+
+    bands: dict = {}
+    for bucket in buckets:
+        for name, count in bucket["value_bands"].items():
+            bands[name] = bands.get(name, 0) + count
+
+    windows = []
+    for window in WINDOWS:
+        if window <= settings.CONTRACT_RADAR_MAX_MONTHS:
+            selected = [_bucket_view(bucket, 0, value_band) for bucket in _within(radar, window, position)]
+            windows.append({
+                "months": window,
+                "players": sum(bucket["players"] for bucket in selected),
+                "total_market_value_eur": sum(bucket["total_market_value_eur"] for bucket in selected)
+            })
+
+    return {
+        "as_of": as_of,
+        "window_end": _add_months(as_of, months) - timedelta(days=1),
+        "months": months,
+        "players": sum(bucket["players"] for bucket in buckets),
+        "total_market_value_eur": sum(bucket["total_market_value_eur"] for bucket in buckets),
+        "value_bands": _band_counts(bands),
+        "windows": windows,
+        "buckets": buckets,
+        "generated_at": radar["generated_at"]
+    }
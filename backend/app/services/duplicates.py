@@ -0,0 +1,383 @@
+"""
+Fuzzy duplicate detection for players and coaches.
+
+Records are only compared within blocks sharing a cheap key: the same date
+of birth (and surname initial), or the same nationality and surname stem.
+Within a block, names are scored with trigram similarity on the whole name
+and Jaro-Winkler word by word, so an initial matches a full first name
+("K. De Bruyne" / "Kevin De Bruyne"). Birth dates that are both
+known and differ rule a pair out.
+
+`find_duplicates` serves the opt-in check on create, `scan_duplicates` runs
+over a whole table as a background job and groups matches into clusters,
+and `merge_duplicates` folds duplicates into a surviving record.
+"""
+
+import logging
+import re
+import time
+import uuid
+from collections import defaultdict
+from datetime import date
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.filters import contains
+from app.models import Player, ShortlistItem
+from app.services.autocomplete import normalize
+from app.services.jobs import Job
+
+logger = logging.getLogger(__name__)
+
+# Score of an initial against a word starting with the same letter
+INITIAL_SCORE = 0.9
+
+# Surname characters shared by records in one nationality block
+STEM_LENGTH = 3
+
+# Blocks compared between progress updates of a scan job
+PROGRESS_EVERY_BLOCKS = 5000
+
+_WORD = re.compile(r"\w+")
+
+
+def jaro_winkler(a: str, b: str, prefix_scale: float = 0.1) -> float:
+    """Jaro-Winkler similarity (0-1), rewarding a common prefix of up to four characters"""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+
+    window = max(max(len(a), len(b)) // 2 - 1, 0)
+    b_matched = [False] * len(b)
+    a_chars = []
+    for i, char in enumerate(a):
+        end = min(len(b), i + window + 1)
+        j = b.find(char, max(0, i - window), end)
+        while j != -1 and b_matched[j]:
+            j = b.find(char, j + 1, end)
+        if j != -1:
+            b_matched[j] = True
+            a_chars.append(char)
+    matches = len(a_chars)
+    if not matches:
+        return 0.0
+
+    b_chars = [char for char, matched in zip(b, b_matched) if matched]
+    transpositions = sum(map(str.__ne__, a_chars, b_chars)) // 2
+    jaro = (matches / len(a) + matches / len(b) + (matches - transpositions) / matches) / 3
+
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Trigrams as pg_trgm extracts them: per word, padded with two spaces before and one after"""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class _Name(NamedTuple):
+    text: str
+    tokens: List[str]
+    grams: FrozenSet[str]
+
+
+def _prepare(value: Optional[str]) -> Optional[_Name]:
+    text = normalize(value)
+    return _Name(text, text.split(" "), trigrams(text)) if text else None
+
+
+# Words repeat across a table (first names, common surnames), so their scores are cached
+@lru_cache(maxsize=1 << 18)
+def _token_similarity(x: str, y: str) -> float:
+    if len(x) == 1 or len(y) == 1:
+        return INITIAL_SCORE if x[0] == y[0] else 0.0
+    return jaro_winkler(x, y)
+
+
+def _similarity(a: _Name, b: _Name, floor: float = 0.0) -> float:
+    """Name similarity; any result below `floor` is only known to be below it"""
+    if a.text == b.text:
+        return 1.0
+    whole = len(a.grams & b.grams) / len(a.grams | b.grams)
+    if len(a.tokens) != len(b.tokens):
+        # Words split differently ("Kylewalker" / "Kyle Walker"): compare the whole strings too
+        whole = max(whole, jaro_winkler(a.text, b.text))
+
+    # Match each word of the shorter name to its best unused word of the longer one
+    short, long = sorted((a.tokens, b.tokens), key=len)
+    # A name covering only part of the other ("Walker" / "Kyle Walker") counts for less
+    coverage = (len(short) / len(long)) ** 0.25
+    needed = floor * len(short) / coverage
+    unused = list(long)
+    total = 0.0
+    # Surnames first: they settle most non-matches before the first names are scored
+    for position, token in enumerate(reversed(short)):
+        scores = [_token_similarity(token, other) for other in unused]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        total += scores[best]
+        del unused[best]
+        if total + len(short) - position - 1 < needed:
+            return whole
+    return max(whole, total / len(short) * coverage)
+
+
+def name_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """Accent- and case-insensitive similarity (0-1) of two names"""
+    prepared_a, prepared_b = _prepare(a), _prepare(b)
+    if prepared_a is None or prepared_b is None:
+        return 0.0
+    return _similarity(prepared_a, prepared_b)
+
+
+class _Record(NamedTuple):
+    id: uuid.UUID
+    name: str
+    full_name: Optional[str]
+    date_of_birth: Optional[date]
+    nationality: Optional[str]
+    current_club: Optional[str]
+    names: Tuple[_Name, ...]
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "full_name": self.full_name,
+            "date_of_birth": self.date_of_birth,
+            "nationality": self.nationality,
+            "current_club": self.current_club
+        }
+
+
+def _record(record_id, name, full_name, date_of_birth, nationality, current_club) -> _Record:
+    names = {}
+    for value in (name, full_name):
+        prepared = _prepare(value)
+        if prepared is not None:
+            names.setdefault(prepared.text, prepared)
+    return _Record(record_id, name, full_name, date_of_birth, nationality, current_club, tuple(names.values()))
+
+
+def _surnames(record: _Record) -> List[str]:
+    return list(dict.fromkeys(name.tokens[-1] for name in record.names))
+
+
+def _block_keys(record: _Record) -> List[tuple]:
+    keys = []
+    for surname in _surnames(record):
+        if record.date_of_birth is not None:
+            keys.append(("dob", record.date_of_birth, surname[0]))
+        if record.nationality:
+            keys.append(("nationality", normalize(record.nationality), surname[:STEM_LENGTH]))
+    return keys
+
+
+def _match(a: _Record, b: _Record) -> Optional[Tuple[float, List[str]]]:
+    """(score, reasons) when the two records look like one person, else None"""
+    if a.date_of_birth is not None and b.date_of_birth is not None and a.date_of_birth != b.date_of_birth:
+        return None
+    threshold = settings.DUPLICATE_MATCH_THRESHOLD
+    score = max((_similarity(x, y, threshold) for x in a.names for y in b.names), default=0.0)
+    if score < threshold:
+        return None
+
+    reasons = ["similar name" if score < 1 else "same name"]
+    if a.date_of_birth is not None and a.date_of_birth == b.date_of_birth:
+        reasons.append("same date of birth")
+    if a.nationality and normalize(a.nationality) == normalize(b.nationality):
+        reasons.append("same nationality")
+    if a.current_club and normalize(a.current_club) == normalize(b.current_club):
+        reasons.append("same club")
+    return round(score, 4), reasons
+
+
+def _columns(model):
+    """Columns in `_record` argument order"""
+    return (model.id, model.name, model.full_name, model.date_of_birth, model.nationality, model.current_club)
+
+
+def find_duplicates(
+    db: Session,
+    model,
+    name: str,
+    full_name: Optional[str] = None,
+    date_of_birth: Optional[date] = None,
+    nationality: Optional[str] = None,
+    current_club: Optional[str] = None,
+    exclude_id: Optional[uuid.UUID] = None
+) -> List[dict]:
+    """
+    Active records of `model` that likely describe the given person, best first.
+
+    Candidates share the birth date, or the nationality and a surname; with
+    neither known, a surname match alone. At most DUPLICATE_CANDIDATE_LIMIT
+    candidates are scored.
+    """
+    target = _record(exclude_id, name, full_name, date_of_birth, nationality, current_club)
+    if not target.names:
+        return []
+
+    words = _WORD.findall(name)
+    surname = words[-1] if words else None
+    surname_match = or_(contains(model.name, surname), contains(model.full_name, surname)) if surname else None
+
+    blocks = []
+    if date_of_birth is not None:
+        blocks.append(model.date_of_birth == date_of_birth)
+    if nationality and surname_match is not None:
+        blocks.append(and_(model.nationality == nationality, surname_match))
+    if not blocks and surname_match is not None:
+        blocks.append(surname_match)
+    if not blocks:
+        return []
+
+    query = db.query(*_columns(model)).filter(model.is_active == True, or_(*blocks))
+    if exclude_id is not None:
+        query = query.filter(model.id != exclude_id)
+
+    matches = []
+    for row in query.limit(settings.DUPLICATE_CANDIDATE_LIMIT):
+        candidate = _record(*row)
+        match = _match(target, candidate)
+        if match is not None:
+            score, reasons = match
+            matches.append({**candidate.summary(), "score": score, "reasons": reasons})
+    matches.sort(key=lambda match: -match["score"])
+    return matches
+
+
+def _cluster(records: Sequence[_Record], job: Job) -> Tuple[int, List[dict]]:
+    """
+    (pairs compared, clusters) of `records`, compared block by block.
+
+    Matching pairs are joined transitively (union-find); the largest
+    clusters come first, ties broken by their best pair score.
+    """
+    blocks: Dict[tuple, List[int]] = defaultdict(list)
+    for index, record in enumerate(records):
+        for key in _block_keys(record):
+            blocks[key].append(index)
+    blocks = [members for members in blocks.values() if len(members) > 1]
+    job.set_progress(records=len(records), blocks=len(blocks), blocks_done=0)
+
+    parent = list(range(len(records)))
+
+    def root(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    compared, pairs = set(), {}
+    for done, members in enumerate(blocks, start=1):
+        for position, a in enumerate(members):
+            for b in members[position + 1:]:
+                pair = (a, b) if a < b else (b, a)
+                if pair in compared:
+                    continue
+                compared.add(pair)
+                match = _match(records[a], records[b])
+                if match is not None:
+                    pairs[pair] = match
+                    parent[root(a)] = root(b)
+        if done % PROGRESS_EVERY_BLOCKS == 0:
+            job.set_progress(records=len(records), blocks=len(blocks), blocks_done=done)
+
+    clusters: Dict[int, Dict[str, list]] = defaultdict(lambda: {"members": [], "pairs": []})
+    for (a, b), (score, reasons) in pairs.items():
+        cluster = clusters[root(a)]
+        cluster["pairs"].append({"ids": [records[a].id, records[b].id], "score": score, "reasons": reasons})
+    for index in {index for pair in pairs for index in pair}:
+        clusters[root(index)]["members"].append(records[index].summary())
+
+    ordered = sorted(
+        clusters.values(),
+        key=lambda cluster: (-len(cluster["members"]), -max(pair["score"] for pair in cluster["pairs"]))
+    )
+    return len(compared), ordered
+
+
+def scan_duplicates(db: Session, job: Job, model) -> dict:
+    """
+    Background job: cluster likely duplicates among all active records of
+    `model`, at most DUPLICATE_MAX_CLUSTERS clusters.
+    """
+    started = time.perf_counter()
+    records = [_record(*row) for row in db.query(*_columns(model)).filter(model.is_active == True)]
+    compared, ordered = _cluster(records, job)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Duplicate scan of {len(records)} {model.__tablename__}: {compared} pairs compared, "
+        f"{len(ordered)} clusters in {elapsed:.1f}s"
+    )
+    return {
+        "records": len(records),
+        "compared_pairs": compared,
+        "clusters_found": len(ordered),
+        "clusters_truncated": len(ordered) > settings.DUPLICATE_MAX_CLUSTERS,
+        "clusters": [
+            {"size": len(cluster["members"]), **cluster}
+            for cluster in ordered[:settings.DUPLICATE_MAX_CLUSTERS]
+        ],
+        "elapsed_seconds": round(elapsed, 3)
+    }
+
+
+def merge_duplicates(db: Session, model, survivor, duplicates: Sequence, user_id: Optional[uuid.UUID]) -> dict:
+    """
+    Fold `duplicates` into `survivor` inside the caller's transaction.
+
+    Their shortlist items are re-pointed to the survivor. Where a shortlist
+    would then hold the survivor twice (unique_shortlist_player / _coach),
+    the survivor's own item is kept, else the earliest added, and the
+    others are deleted. The duplicates are deactivated; the caller commits.
+    """
+    column = ShortlistItem.player_id if model is Player else ShortlistItem.coach_id
+    merged_ids = [duplicate.id for duplicate in duplicates]
+
+    ranked = select(
+        ShortlistItem.id,
+        func.row_number().over(
+            partition_by=ShortlistItem.shortlist_id,
+            order_by=((column == survivor.id).desc(), ShortlistItem.created_at, ShortlistItem.id)
+        ).label("rank")
+    ).where(column.in_([survivor.id, *merged_ids])).subquery()
+    dropped = db.execute(
+        delete(ShortlistItem)
+        .where(ShortlistItem.id.in_(select(ranked.c.id).where(ranked.c.rank > 1)))
+        .returning(ShortlistItem.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    repointed = db.execute(
+        update(ShortlistItem)
+        .where(column.in_(merged_ids))
+        .values({column.key: survivor.id, "last_updated_by": user_id, "updated_at": func.now()})
+        .returning(ShortlistItem.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    for duplicate in duplicates:
+        duplicate.is_active = False
+        duplicate.last_updated_by = user_id
+
+    return {
+        "survivor_id": survivor.id,
+        "merged_ids": merged_ids,
+        "repointed_items": len(repointed),
+        "dropped_item_ids": dropped
+    }
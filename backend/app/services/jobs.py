@@ -0,0 +1,211 @@
+"""
+In-process background jobs.
+
+Work too long for a request (duplicate scans, large bulk updates) is
+submitted to a small thread pool and answered with a job id that clients
+poll at GET /jobs/{job_id}. Periodic work (leaderboard refreshes) is
+submitted by `schedule`. Each job gets its own database session.
+
+Job records live in the process that runs them and are mirrored to Redis
+when it is available, so any worker can answer a status poll. Jobs do not
+survive a restart; callers re-submit.
+"""
+
+import json
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache import cache_get, cache_set
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+class Job:
+    """
+    State of one submitted job; `progress` may be updated by the job while it runs.
+
+    `permission` is the one needed on `resource` to submit the job, and so
+    to see its record.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        resource: str,
+        permission: str,
+        created_by: Optional[uuid.UUID],
+        publish: Callable[["Job"], None]
+    ):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.resource = resource
+        self.permission = permission
+        self.created_by = created_by
+        self.status = "queued"
+        self.created_at = _now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.progress: Optional[Dict[str, Any]] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self._publish = publish
+
+    def set_progress(self, **progress: Any) -> None:
+        self.progress = progress
+        self._publish(self)
+
+    def as_dict(self) -> dict:
+        return jsonable_encoder({
+            "id": self.id,
+            "kind": self.kind,
+            "resource": self.resource,
+            "permission": self.permission,
+            "status": self.status,
+            "created_by": self.created_by,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error
+        })
+
+
+class JobRegistry:
+    """Runs jobs on a lazily started thread pool and keeps their records for JOB_RETENTION_SECONDS"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = threading.Event()
+
+    def submit(
+        self,
+        kind: str,
+        resource: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        permission: str = "read",
+        created_by: Optional[uuid.UUID] = None,
+        redis_client=None,
+        reuse_active: bool = False
+    ) -> Job:
+        """
+        Queue `fn(db, job, *args)`; its return value becomes the job result.
+
+        `fn` owns its transaction: commit what it writes, the session is
+        closed (and rolled back) afterwards either way. `permission` on
+        `resource` is required to read the job's record. With
+        `reuse_active`, a queued or running job of the same kind, resource
+        and permission in this process is returned instead of starting
+        another.
+        """
+        job = Job(kind, resource, permission, created_by, lambda job: self._mirror(redis_client, job))
+        with self._lock:
+            self._prune()
+            if reuse_active:
+                active = next((
+                    other for other in self._jobs.values()
+                    if other.kind == kind and other.resource == resource and other.permission == permission
+                    and other.finished_at is None
+                ), None)
+                if active is not None:
+                    return active
+            self._jobs[job.id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="job")
+            executor = self._executor
+        self._mirror(redis_client, job)
+        executor.submit(self._run, job, fn, args, redis_client)
+        return job
+
+    def schedule(
+        self,
+        kind: str,
+        resource: str,
+        fn: Callable[..., Any],
+        interval_seconds: int,
+        redis_client=None
+    ) -> None:
+        """
+        Submit `fn(db, job)` now and every `interval_seconds` after, until `shutdown`.
+
+        A run still going when the next one is due postpones it to the
+        following interval rather than queueing a second copy.
+        """
+        def loop():
+            job = None
+            while not self._stopping.is_set():
+                if job is None or job.finished_at is not None:
+                    job = self.submit(kind, resource, fn, redis_client=redis_client)
+                self._stopping.wait(interval_seconds)
+
+        threading.Thread(target=loop, name=f"schedule-{kind}", daemon=True).start()
+
+    def shutdown(self) -> None:
+        """Stop scheduling and drop queued jobs; running jobs finish in the background"""
+        self._stopping.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get(self, job_id: str, redis_client=None) -> Optional[dict]:
+        """A job record from this process, else from Redis; None when unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job.as_dict()
+        body = cache_get(redis_client, _key(job_id))
+        return json.loads(body) if body is not None else None
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, redis_client) -> None:
+        job.status, job.started_at = "running", _now()
+        self._mirror(redis_client, job)
+
+        db = SessionLocal()
+        try:
+            job.result = fn(db, job, *args)
+            job.status = "succeeded"
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"Job {job.id} ({job.kind}) failed")
+            job.status, job.error = "failed", str(e) or e.__class__.__name__
+        finally:
+            db.close()
+            job.finished_at = _now()
+            self._mirror(redis_client, job)
+
+    def _mirror(self, redis_client, job: Job) -> None:
+        cache_set(redis_client, _key(job.id), json.dumps(job.as_dict()), settings.JOB_RETENTION_SECONDS)
+
+    def _prune(self) -> None:
+        now = _now()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None
+            and (now - job.finished_at).total_seconds() > settings.JOB_RETENTION_SECONDS
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Shared by all requests in this process
+job_registry = JobRegistry()
@@ -0,0 +1,162 @@
+"""
+Metric leaderboards: the top LEADERBOARD_DEPTH active players per metric,
+ranked within each position and across all positions.
+
+Rankings are computed with `rank() OVER (PARTITION BY position ...)` on a
+schedule (see app.main) and stored in `player_leaderboard`, so requests
+read one partition in rank order instead of sorting the players table.
+Each refresh keeps the rank and value a player had at the refresh before,
+which is what rank and value deltas are measured against.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import Float, and_, cast, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Player, PlayerLeaderboardEntry
+from app.models.player import PERFORMANCE_METRIC_KEYS, SEASON_STAT_KEYS, jsonb_number
+from app.services.jobs import Job
+
+logger = logging.getLogger(__name__)
+
+# Rankable metrics; higher values rank first
+METRICS = {
+    **{key: jsonb_number(Player.current_season_stats, key) for key in SEASON_STAT_KEYS},
+    **{key: jsonb_number(Player.performance_metrics, key) for key in PERFORMANCE_METRIC_KEYS},
+    "overall_rating": Player.overall_rating,
+    "potential_rating": Player.potential_rating,
+    "scout_rating": Player.scout_rating,
+}
+
+# Position of the leaderboard across all positions
+ALL_POSITIONS = ""
+
+
+def _ranked(metric: str):
+    """Top-depth rows of one metric, per position and overall, as (position, player_id, rank, value)"""
+    expression = METRICS[metric]
+    ranked = and_(Player.is_active == True, expression.isnot(None))
+
+    # Ties share a rank, but each board keeps exactly LEADERBOARD_DEPTH rows, ties broken by id
+    by_position = select(
+        Player.position,
+        Player.id.label("player_id"),
+        func.rank().over(partition_by=Player.position, order_by=expression.desc()).label("rank"),
+        func.row_number().over(partition_by=Player.position, order_by=(expression.desc(), Player.id)).label("place"),
+        cast(expression, Float).label("value")
+    ).where(ranked, Player.position.isnot(None)).subquery()
+
+    # The overall board is a top-N scan, of the metric's partial index where it has one
+    top = select(Player.id, expression.label("value")).where(ranked).order_by(
+        expression.desc(), Player.id
+    ).limit(settings.LEADERBOARD_DEPTH).subquery()
+
+    return union_all(
+        select(
+            by_position.c.position, by_position.c.player_id, by_position.c.rank, by_position.c.value
+        ).where(by_position.c.place <= settings.LEADERBOARD_DEPTH),
+        select(
+            literal(ALL_POSITIONS),
+            top.c.id,
+            func.rank().over(order_by=top.c.value.desc()),
+            cast(top.c.value, Float)
+        )
+    ).subquery()
+
+
+def refresh_metric(db: Session, metric: str) -> int:
+    """Rebuild one metric's leaderboards within the caller's transaction; returns the rows ranked"""
+    table = PlayerLeaderboardEntry.__table__
+    rows = _ranked(metric)
+    statement = insert(PlayerLeaderboardEntry).from_select(
+        ["metric", "position", "player_id", "rank", "value"],
+        select(literal(metric), rows.c.position, rows.c.player_id, rows.c.rank, rows.c.value)
+    )
+    ranked = db.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.metric, table.c.position, table.c.player_id],
+        set_={
+            "previous_rank": table.c.rank,
+            "previous_value": table.c.value,
+            "rank": statement.excluded.rank,
+            "value": statement.excluded.value,
+            "refreshed_at": func.now()
+        }
+    )).rowcount
+
+    # Rows this refresh did not write have dropped out of the top; now() is the transaction start
+    db.execute(table.delete().where(table.c.metric == metric, table.c.refreshed_at < func.now()))
+    return ranked
+
+
+def last_refreshed(db: Session) -> Optional[datetime]:
+    return db.query(func.max(PlayerLeaderboardEntry.refreshed_at)).scalar()
+
+
+def refresh_leaderboards(db: Session, job: Optional[Job] = None, min_age_seconds: int = 0) -> dict:
+    """
+    Rebuild every metric's leaderboards in one transaction, so readers never see a half-refreshed set.
+
+    Skipped when another session is refreshing, or when the boards are
+    younger than `min_age_seconds` (another worker's scheduled run).
+    """
+    started = time.perf_counter()
+    locked = db.execute(select(func.pg_try_advisory_xact_lock(func.hashtext("player_leaderboard")))).scalar()
+    refreshed_at = last_refreshed(db) if locked else None
+    if not locked or (
+        refreshed_at is not None
+        and datetime.now(timezone.utc) - refreshed_at < timedelta(seconds=min_age_seconds)
+    ):
+        db.rollback()
+        return {"skipped": True, "metrics": 0, "rows": 0, "elapsed_seconds": round(time.perf_counter() - started, 3)}
+
+    rows = 0
+    for done, metric in enumerate(METRICS, 1):
+        rows += refresh_metric(db, metric)
+        if job is not None:
+            job.set_progress(metrics=len(METRICS), refreshed=done, rows=rows)
+    db.commit()
+
+    elapsed = round(time.perf_counter() - started, 3)
+    logger.info(f"Leaderboards refreshed: {len(METRICS)} metrics, {rows} rows in {elapsed}s")
+    return {"skipped": False, "metrics": len(METRICS), "rows": rows, "elapsed_seconds": elapsed}
+
+
+def run_refresh_job(db: Session, job: Job) -> dict:
+    """Scheduled `refresh_leaderboards` (see app.services.jobs); other workers' recent runs count"""
+    return refresh_leaderboards(db, job, min_age_seconds=settings.LEADERBOARD_REFRESH_SECONDS // 2)
+
+
+def read_leaderboard(db: Session, metric: str, position: str, limit: int, offset: int = 0) -> List[dict]:
+    """One leaderboard page in rank order, with the players' current names and clubs"""
+    rows = db.query(
+        PlayerLeaderboardEntry, Player.name, Player.current_club, Player.nationality, Player.position
+    ).join(Player, Player.id == PlayerLeaderboardEntry.player_id).filter(
+        PlayerLeaderboardEntry.metric == metric,
+        PlayerLeaderboardEntry.position == position,
+        Player.is_active == True
+    ).order_by(
+        PlayerLeaderboardEntry.rank, PlayerLeaderboardEntry.player_id
+    ).offset(offset).limit(limit).all()
+
+    return [
+        {
+            "rank": entry.rank,
+            "player_id": entry.player_id,
+            "name": name,
+            "current_club": current_club,
+            "nationality": nationality,
+            "position": player_position,
+            "value": entry.value,
+            "previous_rank": entry.previous_rank,
+            "rank_change": entry.previous_rank - entry.rank if entry.previous_rank is not None else None,
+            "value_change": round(entry.value - entry.previous_value, 6) if entry.previous_value is not None else None,
+            "refreshed_at": entry.refreshed_at
+        }
+        for entry, name, current_club, nationality, player_position in rows
+    ]
@@ -0,0 +1,144 @@
+"""
+Bulk player updates (PATCH /players/bulk).
+
+Changes are grouped by the set of fields they write, and each group is
+applied in batches of BULK_UPDATE_BATCH_SIZE with one
+`UPDATE players ... FROM (VALUES ...)` statement. Rows whose values
+already match are skipped by an IS DISTINCT FROM guard, so they cost no
+write and keep their cached responses. Every batch commits on its own,
+together with its summary rollup changes.
+"""
+
+import time
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import any_, bindparam, cast, column, func, tuple_, update, values
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Player
+from app.services import player_events
+from app.services.jobs import Job
+from app.services.player_summary import SummaryKey
+
+SUMMARY_COLUMNS = (Player.is_active, Player.position, Player.nationality, Player.current_club, Player.market_value_eur)
+
+
+def _merge(items: Sequence[dict]) -> Dict[uuid.UUID, dict]:
+    """One change set per player; later items override earlier ones field by field"""
+    merged: Dict[uuid.UUID, dict] = {}
+    for item in items:
+        changes = dict(item)
+        merged.setdefault(changes.pop("id"), {}).update(changes)
+    return merged
+
+
+def _apply_batch(
+    db: Session,
+    fields: Tuple[str, ...],
+    batch: List[Tuple[uuid.UUID, dict]],
+    user_id: Optional[uuid.UUID]
+) -> Tuple[List[uuid.UUID], List[uuid.UUID]]:
+    """Write one batch sharing `fields`; returns (found ids, updated ids)"""
+    table = Player.__table__
+    ids = [player_id for player_id, _ in batch]
+
+    # Lock the rows first: existence tells not_found from unchanged, and the
+    # locked values are the rollup's "before" side
+    before = {
+        row[0]: SummaryKey(*row[1:])
+        for row in db.query(Player.id, *SUMMARY_COLUMNS).filter(
+            Player.id == any_(bindparam("ids", ids, type_=ARRAY(Player.id.type))),
+            Player.is_active == True
+        ).with_for_update()
+    }
+    if not before:
+        return [], []
+
+    changes = values(
+        column("id", Player.id.type),
+        *(column(field, table.c[field].type) for field in fields),
+        name="changes"
+    ).data([(player_id, *(item[field] for field in fields)) for player_id, item in batch if player_id in before])
+
+    # A VALUES column that is NULL in every row would be typed text; cast to the target types
+    new_values = {field: cast(changes.c[field], table.c[field].type) for field in fields}
+    updated = db.execute(
+        update(Player)
+        .where(
+            Player.id == changes.c.id,
+            tuple_(*(table.c[field] for field in fields)).is_distinct_from(tuple_(*new_values.values()))
+        )
+        .values({
+            **new_values,
+            "last_updated_by": user_id,
+            "updated_at": func.now()
+        })
+        .returning(Player.id, *SUMMARY_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    player_events.record_changes(db, [(before[row[0]], SummaryKey(*row[1:])) for row in updated])
+    return list(before), [row[0] for row in updated]
+
+
+def bulk_update_players(
+    db: Session,
+    items: Sequence[dict],
+    user_id: Optional[uuid.UUID],
+    redis_client=None,
+    job: Optional[Job] = None
+) -> dict:
+    """
+    Apply `items` (`{"id": ..., <field>: <value>, ...}`, only the fields to write).
+
+    Commits after every batch, so a failure keeps the batches already
+    written. Returns the report with one outcome per player id:
+    updated, unchanged (values already current) or not_found (missing or
+    deleted).
+    """
+    started = time.perf_counter()
+    merged = _merge(items)
+
+    groups: Dict[Tuple[str, ...], List[Tuple[uuid.UUID, dict]]] = {}
+    for player_id, changes in merged.items():
+        groups.setdefault(tuple(sorted(changes)), []).append((player_id, changes))
+
+    found, updated = set(), set()
+    processed = 0
+    for fields, group in sorted(groups.items()):
+        for offset in range(0, len(group), settings.BULK_UPDATE_BATCH_SIZE):
+            batch = group[offset:offset + settings.BULK_UPDATE_BATCH_SIZE]
+            batch_found, batch_updated = _apply_batch(db, fields, batch, user_id)
+            db.commit()
+            player_events.players_committed(redis_client, *batch_updated, fields=fields)
+
+            found.update(batch_found)
+            updated.update(batch_updated)
+            processed += len(batch)
+            if job is not None:
+                job.set_progress(players=len(merged), processed=processed, updated=len(updated))
+
+    results = [
+        {
+            "id": player_id,
+            "status": "updated" if player_id in updated else "unchanged" if player_id in found else "not_found"
+        }
+        for player_id in merged
+    ]
+    return {
+        "received": len(items),
+        "players": len(merged),
+        "updated": len(updated),
+        "unchanged": len(found) - len(updated),
+        "not_found": len(merged) - len(found),
+        "results": results,
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+def run_bulk_update_job(db: Session, job: Job, items: List[dict], user_id: Optional[uuid.UUID], redis_client) -> dict:
+    """`bulk_update_players` as a background job (see app.services.jobs)"""
+    return bulk_update_players(db, items, user_id, redis_client, job)
@@ -0,0 +1,41 @@
+"""
+Side effects of player writes, shared by every code path that changes players.
+
+`record_changes` runs inside the write's transaction, for state that must
+commit with it; `players_committed` runs after commit, for caches and
+in-process indexes that only need to learn that data changed.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import bump_generation
+from app.services import contract_radar, player_summary
+from app.services.autocomplete import autocomplete_index
+from app.services.player_summary import SummaryKey, snapshot
+from app.services.similarity import similarity_index
+
+__all__ = ["snapshot", "record_changes", "players_committed"]
+
+
+def record_changes(db: Session, changes: Iterable[Tuple[Optional[SummaryKey], Optional[SummaryKey]]]) -> None:
+    """Apply (before, after) player snapshots to the rollups, before commit"""
+    player_summary.apply_changes(db, changes)
+
+
+def players_committed(redis_client, *player_ids, fields: Optional[Iterable[str]] = None) -> None:
+    """
+    Invalidate what was derived from players once a write has committed.
+
+    Pass the ids of changed players to also drop their cached detail
+    responses; creates only need the list-level invalidation. `fields`
+    names the columns written, when known, so aggregates that read none of
+    them stay cached.
+    """
+    namespaces = ["players", *(f"players:{player_id}" for player_id in player_ids)]
+    if fields is None or not contract_radar.RADAR_FIELDS.isdisjoint(fields):
+        namespaces.append(contract_radar.NAMESPACE)
+    bump_generation(redis_client, *namespaces)
+    similarity_index.mark_stale()
+    autocomplete_index.mark_stale()
@@ -0,0 +1,287 @@
+"""
+Bulk player import from CSV or NDJSON.
+
+Rows are read incrementally from the upload, validated in batches against
+`PlayerCreate` with one shared TypeAdapter, and streamed into a temporary
+staging table with COPY. A batch the database rejects is bisected under
+savepoints so only its offending rows are reported. Players are then
+upserted with two set-based statements keyed on name plus club, the same
+identity `create_player` uses for its duplicate check.
+"""
+
+import csv
+import io
+import json
+import time
+import uuid
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models import Player
+from app.schemas.player import PlayerCreate
+from app.services.player_summary import SummaryKey
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Rows validated and copied per round trip
+BATCH_SIZE = 5000
+
+# Per-row errors returned in the report; the total is always counted
+MAX_REPORTED_ERRORS = 1000
+
+# NULL marker in the COPY stream
+COPY_NULL = "\\N"
+
+# Importable fields, in staging table order
+IMPORT_FIELDS = tuple(PlayerCreate.model_fields)
+
+# List fields arrive in CSV cells as `CM;CAM`
+LIST_FIELDS = ("secondary_positions",)
+
+# Validates a whole batch in one call; built once and reused
+ROWS_ADAPTER = TypeAdapter(List[PlayerCreate])
+
+# Rows are matched to existing players like create_player's duplicate check
+MATCH_CONDITION = (
+    "p.is_active AND p.name = r.name AND p.current_club IS NOT DISTINCT FROM r.current_club"
+)
+
+SUMMARY_COLUMNS = "is_active, position, nationality, current_club, market_value_eur"
+
+
+class ImportFormatError(ValueError):
+    """The upload can't be read as the declared format"""
+
+
+def _csv_records(stream: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames or not {"name", "position"} <= {field.strip() for field in reader.fieldnames}:
+        raise ImportFormatError("CSV header must include at least name and position")
+
+    for number, record in enumerate(reader, start=1):
+        row = {}
+        for key, value in record.items():
+            if key is None or value is None:
+                continue
+            key, value = key.strip(), value.strip()
+            if key not in IMPORT_FIELDS or value == "":
+                continue
+            row[key] = [item.strip() for item in value.split(";") if item.strip()] if key in LIST_FIELDS else value
+        yield number, row
+
+
+def _ndjson_records(stream: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+    number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, ImportFormatError(f"Invalid JSON: {e}")
+
+
+def _validate(batch: List[Tuple[int, Any]]) -> Tuple[List[Tuple[int, PlayerCreate]], List[dict]]:
+    """Validate a batch in one call; only failing batches are split by row"""
+    errors = []
+    candidates = []
+    for number, record in batch:
+        if isinstance(record, ImportFormatError):
+            errors.append({"row": number, "errors": [{"field": None, "message": str(record)}]})
+        elif not isinstance(record, dict):
+            errors.append({"row": number, "errors": [{"field": None, "message": "Expected a JSON object"}]})
+        else:
+            candidates.append((number, record))
+
+    while candidates:
+        try:
+            players = ROWS_ADAPTER.validate_python([record for _, record in candidates])
+        except ValidationError as e:
+            by_row: Dict[int, List[dict]] = {}
+            for error in e.errors():
+                index, *field = error["loc"]
+                by_row.setdefault(index, []).append({
+                    "field": ".".join(str(part) for part in field) or None,
+                    "message": error["msg"]
+                })
+            errors.extend({"row": candidates[index][0], "errors": row_errors} for index, row_errors in by_row.items())
+            candidates = [candidate for index, candidate in enumerate(candidates) if index not in by_row]
+            continue
+        return list(zip((number for number, _ in candidates), players)), errors
+    return [], errors
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, list):
+        items = (str(item).replace("\\", "\\\\").replace('"', '\\"') for item in value)
+        return "{" + ",".join(f'"{item}"' for item in items) + "}"
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _copy_batch(cursor, rows: List[Tuple[int, PlayerCreate]]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for number, player in rows:
+        writer.writerow([number, *(_copy_value(getattr(player, field)) for field in IMPORT_FIELDS)])
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY player_import_staging (row_number, {', '.join(IMPORT_FIELDS)}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+        buffer
+    )
+
+
+def _stage(cursor, rows: List[Tuple[int, PlayerCreate]]) -> Tuple[int, List[dict]]:
+    """
+    COPY a validated batch under a savepoint and return `(staged, errors)`.
+
+    A batch the database rejects (a value the schema let through but a
+    column can't hold) is rolled back and split in halves until the
+    offending rows are isolated and reported with the database's message.
+    COPY runs on the raw cursor, so errors arrive as driver exceptions
+    rather than SQLAlchemy's DBAPIError wrapper.
+    """
+    cursor.execute("SAVEPOINT player_import_batch")
+    try:
+        _copy_batch(cursor, rows)
+    except psycopg2.Error as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT player_import_batch")
+        if len(rows) == 1:
+            message = e.diag.message_primary or str(e).strip().splitlines()[0]
+            return 0, [{"row": rows[0][0], "errors": [{"field": None, "message": message}]}]
+        middle = len(rows) // 2
+        first_staged, first_errors = _stage(cursor, rows[:middle])
+        second_staged, second_errors = _stage(cursor, rows[middle:])
+        return first_staged + second_staged, first_errors + second_errors
+    cursor.execute("RELEASE SAVEPOINT player_import_batch")
+    return len(rows), []
+
+
+def _summary_key(row, offset: int) -> SummaryKey:
+    return SummaryKey(*row[offset:offset + 5])
+
+
+def import_players(
+    db: Session,
+    stream: io.TextIOBase,
+    import_format: str,
+    user_id: Optional[uuid.UUID]
+) -> Tuple[dict, List[Tuple[Optional[SummaryKey], Optional[SummaryKey]]], List[uuid.UUID]]:
+    """
+    Stage and upsert the players in `stream`, within the caller's transaction.
+
+    Matched players are updated with the non-empty values of their row;
+    unmatched rows are inserted. When a name and club appear several times
+    in the upload, the last row wins.
+
+    Returns the import report, the (before, after) summary snapshots of
+    every written player, and the ids of the players that were updated.
+    """
+    started = time.perf_counter()
+    table = Player.__table__
+    dialect = db.get_bind().dialect
+
+    staging_columns = ", ".join(f"{field} {table.c[field].type.compile(dialect=dialect)}" for field in IMPORT_FIELDS)
+    db.execute(text(
+        f"CREATE TEMP TABLE player_import_staging (row_number integer NOT NULL, {staging_columns}) ON COMMIT DROP"
+    ))
+    cursor = db.connection().connection.cursor()
+
+    records = _csv_records(stream) if import_format == "csv" else _ndjson_records(stream)
+    received = staged = failed = 0
+    errors: List[dict] = []
+    batch: List[Tuple[int, Any]] = []
+
+    def flush() -> None:
+        nonlocal staged, failed
+        valid, batch_errors = _validate(batch)
+        if valid:
+            copied, copy_errors = _stage(cursor, valid)
+            staged += copied
+            batch_errors.extend(copy_errors)
+        failed += len(batch_errors)
+        errors.extend(batch_errors[:max(0, MAX_REPORTED_ERRORS - len(errors))])
+        batch.clear()
+
+    try:
+        for record in records:
+            received += 1
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ImportFormatError(f"Could not read upload near row {received}: {e}")
+
+    # Serialize concurrent imports so the match-then-insert below can't race
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext('players_import'))"))
+
+    # Last occurrence of each name + club wins
+    db.execute(text("""
+        CREATE TEMP TABLE player_import_rows ON COMMIT DROP AS
+        SELECT DISTINCT ON (name, coalesce(current_club, '')) *
+        FROM player_import_staging
+        ORDER BY name, coalesce(current_club, ''), row_number DESC
+    """))
+    unique_rows = db.execute(text("SELECT count(*) FROM player_import_rows")).scalar()
+
+    # Existing players: fill in the provided values; `o` is the pre-update row
+    assignments = ", ".join(f"{field} = coalesce(r.{field}, p.{field})" for field in IMPORT_FIELDS)
+    updated = db.execute(text(f"""
+        UPDATE players AS p
+        SET {assignments}, last_updated_by = :user_id, updated_at = now()
+        FROM player_import_rows AS r, players AS o
+        WHERE o.id = p.id AND {MATCH_CONDITION}
+        RETURNING p.id, {', '.join(f'o.{column}' for column in SUMMARY_COLUMNS.split(', '))},
+                  {', '.join(f'p.{column}' for column in SUMMARY_COLUMNS.split(', '))}
+    """), {"user_id": user_id}).all()
+
+    # New players
+    inserted = db.execute(text(f"""
+        INSERT INTO players (
+            id, {', '.join(IMPORT_FIELDS)},
+            strengths, weaknesses, tags, availability_status, data_quality_score,
+            data_source, created_by, is_active, created_at
+        )
+        SELECT
+            gen_random_uuid(), {', '.join(
+                'coalesce(r.secondary_positions, ARRAY[]::varchar[])' if field == 'secondary_positions' else f'r.{field}'
+                for field in IMPORT_FIELDS
+            )},
+            ARRAY[]::varchar[], ARRAY[]::varchar[], ARRAY[]::varchar[], 'available', 0,
+            :data_source, :user_id, true, now()
+        FROM player_import_rows AS r
+        WHERE NOT EXISTS (SELECT 1 FROM players AS p WHERE {MATCH_CONDITION})
+        RETURNING {SUMMARY_COLUMNS}
+    """), {
+        "data_source": "csv_import" if import_format == "csv" else "api_import",
+        "user_id": user_id
+    }).all()
+
+    changes = [(_summary_key(row, 1), _summary_key(row, 6)) for row in updated]
+    changes.extend((None, _summary_key(row, 0)) for row in inserted)
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "received": received,
+        "inserted": len(inserted),
+        "updated": len(updated),
+        "failed": failed,
+        "duplicates": staged - unique_rows,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(received / elapsed, 1) if elapsed > 0 else None
+    }
+    return report, changes, [row[0] for row in updated]
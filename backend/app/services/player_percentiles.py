@@ -0,0 +1,224 @@
+"""
+Per-position percentile ranks of player stats and metrics.
+
+A position group is loaded as one float64 column per metric (NaN where a
+player has no value) and ranked with a single column-wise sort plus two
+searchsorted passes per metric. Results go to `player_percentiles`, one
+row per active player.
+
+Writers do nothing extra, so they never contend on shared rows. Instead
+each position has a fingerprint: its active player count plus a sum of
+hashes of every player's id and change timestamp, so any write, arrival
+or departure changes it. `refresh_dirty`, run on a schedule, recomputes
+the groups whose fingerprint differs from the one stored in
+`percentile_groups` when they were last computed. Reads only read.
+"""
+
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Float, Text, any_, bindparam, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
+from sqlalchemy.orm import Session
+
+from app.core.conditional import changed_at
+from app.models import PercentileGroup, Player, PlayerPercentile
+from app.models.player import PERFORMANCE_METRIC_KEYS, SEASON_STAT_KEYS, jsonb_number
+from app.services.jobs import Job
+
+logger = logging.getLogger(__name__)
+
+# Ranked metrics as (name, expression); higher values rank higher
+METRICS: List[Tuple[str, object]] = [
+    *((key, jsonb_number(Player.current_season_stats, key)) for key in SEASON_STAT_KEYS),
+    *((key, jsonb_number(Player.performance_metrics, key)) for key in PERFORMANCE_METRIC_KEYS),
+    ("overall_rating", Player.overall_rating),
+    ("potential_rating", Player.potential_rating),
+    ("market_value_eur", Player.market_value_eur),
+]
+
+
+def percentile_ranks(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mid-rank percentiles (0-100) of every column of `values` among its non-NaN entries.
+
+    A value scores the share of the column below it plus half the share
+    equal to it. Returns `(ranks, counts)`: ranks is NaN where the value
+    is, counts the non-NaN entries per column.
+    """
+    ranks = np.full(values.shape, np.nan)
+    present = ~np.isnan(values)
+    counts = np.count_nonzero(present, axis=0)
+    ordered = np.sort(values, axis=0)  # NaN sorts last, so each column's values lead
+    for column, count in enumerate(counts):
+        if not count:
+            continue
+        rows = present[:, column]
+        column_values = values[rows, column]
+        below = np.searchsorted(ordered[:count, column], column_values, side="left")
+        at_or_below = np.searchsorted(ordered[:count, column], column_values, side="right")
+        ranks[rows, column] = (below + at_or_below) * (50.0 / count)
+    return ranks, counts
+
+
+# Fingerprint of a position without active players
+EMPTY_FINGERPRINT = "0:0"
+
+
+def _uuid_array(name: str, ids: List[str]):
+    """Bind text ids as a uuid[]; psycopg2 would render a UUID list as one cast literal per element"""
+    return cast(bindparam(name, ids, type_=ARRAY(Text)), ARRAY(PlayerPercentile.player_id.type))
+
+
+def _fingerprints(db: Session, position: Optional[str] = None) -> Dict[str, str]:
+    """`{position: fingerprint}` of active players, for one position or all of them"""
+    statement = select(
+        Player.position,
+        func.count(),
+        func.coalesce(func.sum(func.hashtextextended(func.concat(cast(Player.id, Text), changed_at(Player)), 0)), 0)
+    ).where(Player.is_active == True).group_by(Player.position)
+    if position is not None:
+        statement = statement.where(Player.position == position)
+    return {group: f"{players}:{digest}" for group, players, digest in db.execute(statement) if group}
+
+
+def refresh_group(db: Session, position: str, fingerprint: Optional[str] = None) -> bool:
+    """
+    Recompute one position's percentiles if its fingerprint changed, and commit.
+
+    Pass the fingerprint when it was just read for every group. Returns
+    False when another session is recomputing the group.
+    """
+    locked = db.execute(
+        select(func.pg_try_advisory_xact_lock(func.hashtext(f"player_percentiles:{position}")))
+    ).scalar()
+    if not locked:
+        db.rollback()
+        return False
+
+    # Read before the load below: writes committing in between leave the group dirty
+    if fingerprint is None:
+        fingerprint = _fingerprints(db, position).get(position, EMPTY_FINGERPRINT)
+    group = db.get(PercentileGroup, position, populate_existing=True)
+    if group is not None and group.fingerprint == fingerprint:
+        db.commit()
+        return True
+    if group is None:
+        group = PercentileGroup(position=position)
+        db.add(group)
+
+    # Ids stay text end to end (see _uuid_array)
+    rows = db.execute(
+        select(cast(Player.id, Text), *(cast(expression, Float) for _, expression in METRICS))
+        .where(Player.is_active == True, Player.position == position)
+    ).all()
+
+    ids = [row[0] for row in rows]
+    values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(METRICS))
+    ranks, counts = percentile_ranks(values)
+    names = [name for name, _ in METRICS]
+
+    # Write only the difference to the stored rows: most edits move few rounded percentiles
+    table = PlayerPercentile.__table__
+    stored = dict(db.execute(
+        select(cast(table.c.player_id, Text), table.c.percentiles).where(table.c.position == position)
+    ).all())
+    documents = [
+        {name: rank for name, rank in zip(names, player_ranks) if rank == rank}  # NaN != NaN drops missing values
+        for player_ranks in np.round(ranks, 1).tolist()
+    ]
+    changed = [(player_id, document) for player_id, document in zip(ids, documents) if stored.get(player_id) != document]
+
+    # Players who left the position or were deactivated; movers are re-added by their new group
+    departed = list(stored.keys() - set(ids))
+    if departed:
+        db.execute(table.delete().where(table.c.player_id == any_(_uuid_array("departed", departed))))
+
+    if changed:
+        # One INSERT ... SELECT FROM unnest() for all changed rows
+        source = func.unnest(
+            _uuid_array("player_ids", [player_id for player_id, _ in changed]),
+            bindparam("documents", [json.dumps(document) for _, document in changed], type_=ARRAY(Text))
+        ).table_valued("player_id", "document").render_derived()
+        statement = insert(PlayerPercentile).from_select(
+            ["player_id", "position", "percentiles"],
+            select(source.c.player_id, literal(position), cast(source.c.document, JSONB))
+        )
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.player_id],
+            set_={
+                "position": statement.excluded.position,
+                "percentiles": statement.excluded.percentiles,
+                "computed_at": func.now()
+            }
+        ))
+
+    group.fingerprint = fingerprint
+    group.players = len(ids)
+    group.metric_counts = {name: int(count) for name, count in zip(names, counts)}
+    group.computed_at = func.now()
+    db.commit()
+    return True
+
+
+def refresh_dirty(db: Session, job: Optional[Job] = None) -> dict:
+    """Recompute every group whose fingerprint changed, including positions new or emptied since"""
+    started = time.perf_counter()
+    fingerprints = _fingerprints(db)
+    stored = dict(db.execute(select(PercentileGroup.position, PercentileGroup.fingerprint)).all())
+    db.commit()
+
+    positions = sorted(
+        position for position in fingerprints.keys() | stored.keys()
+        if fingerprints.get(position, EMPTY_FINGERPRINT) != stored.get(position)
+    )
+    refreshed, skipped = [], []
+    for position in positions:
+        fingerprint = fingerprints.get(position, EMPTY_FINGERPRINT)
+        (refreshed if refresh_group(db, position, fingerprint) else skipped).append(position)
+        if job is not None:
+            job.set_progress(groups=len(positions), refreshed=len(refreshed), skipped=len(skipped))
+
+    return {
+        "groups": len(positions),
+        "refreshed": refreshed,
+        "skipped": skipped,
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+def player_percentiles(db: Session, player: Player) -> dict:
+    """
+    Stored percentiles of an active player within their position; never writes.
+
+    `stale` flags values computed before the player's latest change, or
+    not computed yet; the scheduled refresh catches up.
+    """
+    group = db.get(PercentileGroup, player.position)
+    record = db.get(PlayerPercentile, player.id)
+    if record is not None and record.position != player.position:
+        record = None
+
+    percentiles = record.percentiles if record is not None else {}
+    counts = group.metric_counts if group is not None else {}
+    last_change = player.updated_at or player.created_at
+    return {
+        "player_id": player.id,
+        "position": player.position,
+        "players": group.players if group is not None else 0,
+        "percentiles": [
+            {"metric": name, "percentile": percentiles[name], "players": counts.get(name, 0)}
+            for name, _ in METRICS
+            if name in percentiles
+        ],
+        "computed_at": group.computed_at if group is not None else None,
+        "stale": record is None or group is None or group.computed_at is None or last_change > group.computed_at
+    }
+
+
+def run_refresh_job(db: Session, job: Job) -> dict:
+    """`refresh_dirty` as a background job (see app.services.jobs)"""
+    return refresh_dirty(db, job)
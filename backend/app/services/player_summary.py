@@ -0,0 +1,207 @@
+"""
+Incrementally maintained player summary statistics.
+
+Player writes pass before/after snapshots to `apply_changes` inside their
+transaction, so the rollup in `player_summary_counts` commits or rolls back
+with the write itself. `read_summary` then answers /players/stats/summary
+from the rollup instead of aggregating the players table.
+
+There is no separate total row, which every write would have to lock:
+totals are the sums over the position rows, taken at read time.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, or_, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Player, PlayerSummaryCount
+
+# Rollup dimensions; every active player counts once in each
+DIMENSIONS = ("position", "nationality", "club")
+
+# Dimension whose rows add up to the totals
+TOTAL_DIMENSION = "position"
+
+REBUILD_SQL = text("""
+    INSERT INTO player_summary_counts (dimension, value, players, valued_players, market_value_sum, updated_at)
+    SELECT
+        CASE
+            WHEN GROUPING(position) = 0 THEN 'position'
+            WHEN GROUPING(nationality) = 0 THEN 'nationality'
+            ELSE 'club'
+        END,
+        coalesce(
+            CASE
+                WHEN GROUPING(position) = 0 THEN position
+                WHEN GROUPING(nationality) = 0 THEN nationality
+                ELSE current_club
+            END,
+            ''
+        ),
+        count(*),
+        count(market_value_eur),
+        coalesce(sum(market_value_eur), 0),
+        now()
+    FROM players
+    WHERE is_active
+    GROUP BY GROUPING SETS ((position), (nationality), (current_club))
+""")
+
+
+class SummaryKey(NamedTuple):
+    """The part of a player that the summary depends on"""
+    is_active: bool
+    position: Optional[str]
+    nationality: Optional[str]
+    club: Optional[str]
+    market_value_eur: Optional[int]
+
+
+def snapshot(player: Optional[Player]) -> Optional[SummaryKey]:
+    """Capture a player's summary contribution (None for a player that doesn't exist yet)"""
+    if player is None:
+        return None
+    return SummaryKey(
+        is_active=bool(player.is_active),
+        position=player.position,
+        nationality=player.nationality,
+        club=player.current_club,
+        market_value_eur=player.market_value_eur
+    )
+
+
+def _rows(key: SummaryKey) -> Iterable[Tuple[str, str]]:
+    for dimension in DIMENSIONS:
+        yield dimension, getattr(key, dimension) or ""
+
+
+def apply_changes(db: Session, changes: Iterable[Tuple[Optional[SummaryKey], Optional[SummaryKey]]]) -> None:
+    """
+    Fold (before, after) snapshots into the rollup within the caller's transaction.
+
+    Edits that leave the grouped columns and market value alone cancel out
+    and write nothing. Rows are upserted in key order so concurrent writers
+    lock them in the same sequence.
+    """
+    deltas = defaultdict(lambda: [0, 0, 0])
+    for before, after in changes:
+        if before == after:
+            continue
+        for key, sign in ((before, -1), (after, 1)):
+            if key is None or not key.is_active:
+                continue
+            valued = key.market_value_eur is not None
+            for row in _rows(key):
+                delta = deltas[row]
+                delta[0] += sign
+                delta[1] += sign if valued else 0
+                delta[2] += sign * (key.market_value_eur or 0)
+
+    rows = [
+        {
+            "dimension": dimension,
+            "value": value,
+            "players": players,
+            "valued_players": valued_players,
+            "market_value_sum": market_value_sum
+        }
+        for (dimension, value), (players, valued_players, market_value_sum) in sorted(deltas.items())
+        if players or valued_players or market_value_sum
+    ]
+    if not rows:
+        return
+
+    statement = insert(PlayerSummaryCount).values(rows)
+    table = PlayerSummaryCount.__table__
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.dimension, table.c.value],
+        set_={
+            "players": table.c.players + statement.excluded.players,
+            "valued_players": table.c.valued_players + statement.excluded.valued_players,
+            "market_value_sum": table.c.market_value_sum + statement.excluded.market_value_sum,
+            "updated_at": func.now()
+        }
+    ))
+
+
+def rebuild(db: Session) -> None:
+    """Recompute the rollup from the players table (initial load or drift repair)"""
+    db.execute(PlayerSummaryCount.__table__.delete())
+    db.execute(REBUILD_SQL)
+
+
+def read_summary(db: Session, top: int) -> Tuple[dict, Optional[datetime]]:
+    """
+    Summary statistics from the rollup, with top-`top` nationality and club breakdowns.
+
+    Returns `(data, as_of)` where as_of is when the rollup last changed.
+    """
+    counts = db.query(
+        PlayerSummaryCount.dimension,
+        func.count().filter(
+            (PlayerSummaryCount.players > 0) & (PlayerSummaryCount.value != "")
+        ).label("distinct_values"),
+        func.sum(PlayerSummaryCount.players).label("players"),
+        func.sum(PlayerSummaryCount.valued_players).label("valued_players"),
+        func.sum(PlayerSummaryCount.market_value_sum).label("market_value_sum"),
+        func.max(PlayerSummaryCount.updated_at).label("updated_at")
+    ).group_by(PlayerSummaryCount.dimension).all()
+    by_dimension = {row.dimension: row for row in counts}
+
+    # Top-N per dimension, served by (dimension, players DESC)
+    rank = func.row_number().over(
+        partition_by=PlayerSummaryCount.dimension,
+        order_by=(PlayerSummaryCount.players.desc(), PlayerSummaryCount.value)
+    ).label("rank")
+    ranked = db.query(
+        PlayerSummaryCount.dimension, PlayerSummaryCount.value, PlayerSummaryCount.players, rank
+    ).filter(
+        PlayerSummaryCount.dimension.in_(DIMENSIONS),
+        PlayerSummaryCount.players > 0,
+        PlayerSummaryCount.value != ""
+    ).subquery()
+    breakdowns = defaultdict(list)
+    rows = db.query(ranked.c.dimension, ranked.c.value, ranked.c.players).filter(
+        or_(ranked.c.dimension == "position", ranked.c.rank <= top)
+    ).order_by(ranked.c.dimension, ranked.c.rank)
+    for dimension, value, players in rows:
+        breakdowns[dimension].append((value, players))
+
+    # min()/max() resolve to single probes of the partial (market_value_eur, id) index
+    extremes = db.query(
+        func.max(Player.market_value_eur), func.min(Player.market_value_eur)
+    ).filter(Player.is_active == True).first()
+
+    total = by_dimension.get(TOTAL_DIMENSION)
+    valued_players = total.valued_players if total else 0
+    as_of = max((row.updated_at for row in counts), default=None)
+
+    def distinct(dimension: str) -> int:
+        row = by_dimension.get(dimension)
+        return row.distinct_values if row else 0
+
+    data = {
+        "overview": {
+            "total_players": total.players if total else 0,
+            "total_nationalities": distinct("nationality"),
+            "total_clubs": distinct("club"),
+            "total_positions": distinct("position"),
+            "avg_market_value_eur": int(total.market_value_sum / valued_players) if valued_players else 0,
+            "max_market_value_eur": extremes[0],
+            "min_market_value_eur": extremes[1]
+        },
+        "position_breakdown": [
+            {"position": value, "count": count} for value, count in breakdowns["position"]
+        ],
+        "nationality_breakdown": [
+            {"nationality": value, "count": count} for value, count in breakdowns["nationality"]
+        ],
+        "club_breakdown": [
+            {"club": value, "count": count} for value, count in breakdowns["club"]
+        ]
+    }
+    return data, as_of
@@ -0,0 +1,316 @@
+"""
+In-process vector similarity index over `Player.similarity_vector`.
+
+Vectors are held per position group in contiguous float32 matrices,
+standardized per feature within the group and L2-normalized, so cosine
+similarity is a single matrix-vector product. The index loads lazily and
+then follows player writes incrementally: a sync re-reads only the players
+changed since its watermark.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_generation
+from app.core.config import settings
+from app.models import Player
+from app.models.age import birth_day_bounds
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per matrix-vector product; keeps the working set cache-sized
+SCORE_BATCH_ROWS = 65536
+
+# Re-read window behind the watermark, for transactions that committed late
+SYNC_OVERLAP = timedelta(seconds=60)
+
+SYNC_COLUMNS = (
+    Player.id, Player.is_active, Player.position, Player.similarity_vector,
+    Player.market_value_eur, Player.date_of_birth
+)
+
+
+class _PositionGroup:
+    """Vectors and filter columns of one position, stored row-aligned"""
+
+    def __init__(self, dimension: int):
+        self.ids: List[uuid.UUID] = []
+        self.rows: Dict[uuid.UUID, int] = {}
+        self.raw = np.empty((0, dimension), dtype=np.float32)
+        self.market_value = np.empty(0, dtype=np.float64)
+        self.birth_day = np.empty(0, dtype=np.float64)  # date ordinal, NaN when unknown
+        self._normalized: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _grow(self) -> None:
+        capacity = max(16, 2 * len(self.raw))
+        for name in ("raw", "market_value", "birth_day"):
+            current = getattr(self, name)
+            grown = np.empty((capacity, *current.shape[1:]), dtype=current.dtype)
+            grown[:len(current)] = current
+            setattr(self, name, grown)
+
+    def upsert(self, player_id: uuid.UUID, vector: np.ndarray, market_value: float, birth_day: float) -> None:
+        row = self.rows.get(player_id)
+        if row is None:
+            if len(self.ids) == len(self.raw):
+                self._grow()
+            row = len(self.ids)
+            self.ids.append(player_id)
+            self.rows[player_id] = row
+        self.raw[row] = vector
+        self.market_value[row] = market_value
+        self.birth_day[row] = birth_day
+        self._normalized = None
+
+    def remove(self, player_id: uuid.UUID) -> None:
+        row = self.rows.pop(player_id)
+        last = len(self.ids) - 1
+        if row != last:
+            # Move the last row into the gap so storage stays contiguous
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+            self.raw[row] = self.raw[last]
+            self.market_value[row] = self.market_value[last]
+            self.birth_day[row] = self.birth_day[last]
+        self.ids.pop()
+        self._normalized = None
+
+    def normalized(self) -> np.ndarray:
+        """Per-feature standardized, unit-length vectors (rebuilt after changes)"""
+        if self._normalized is None:
+            live = self.raw[:len(self.ids)]
+            std = live.std(axis=0)
+            scaled = (live - live.mean(axis=0)) / np.where(std > 0, std, 1.0)
+            norms = np.linalg.norm(scaled, axis=1, keepdims=True)
+            self._normalized = np.ascontiguousarray(
+                scaled / np.where(norms > 0, norms, 1.0), dtype=np.float32
+            )
+        return self._normalized
+
+    def top_k(self, player_id: uuid.UUID, k: int, mask: np.ndarray) -> List[Tuple[uuid.UUID, float]]:
+        matrix = self.normalized()
+        query = matrix[self.rows[player_id]]
+
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(scores), SCORE_BATCH_ROWS):
+            np.dot(matrix[start:start + SCORE_BATCH_ROWS], query, out=scores[start:start + SCORE_BATCH_ROWS])
+
+        candidates = int(mask.sum())
+        if candidates == 0:
+            return []
+        scores[~mask] = -np.inf
+        k = min(k, candidates)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.ids[row], float(scores[row])) for row in top]
+
+
+class SimilarityIndex:
+    """Cosine top-K over similarity vectors, grouped by position"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._groups: Dict[str, _PositionGroup] = {}
+        self._positions: Dict[uuid.UUID, str] = {}
+        self._dimension: Optional[int] = None
+        self._loaded = False
+        self._stale = False
+        self._watermark: Optional[datetime] = None
+        self._generation: Optional[int] = None
+        self._synced_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def mark_stale(self) -> None:
+        """Sync before the next query (called after local player writes)"""
+        self._stale = True
+
+    def ensure_fresh(self, db: Session, redis_client=None) -> None:
+        """
+        Load the index on first use, then apply player changes since the last sync.
+
+        Writes from other workers are noticed through the Redis `players`
+        generation, or every SIMILARITY_INDEX_SYNC_SECONDS without Redis.
+        """
+        with self._lock:
+            generation = get_generation(redis_client, "players")
+            if not self._loaded:
+                self._load(db)
+            elif self._stale or (
+                generation != self._generation if generation is not None
+                else time.monotonic() - self._synced_at >= settings.SIMILARITY_INDEX_SYNC_SECONDS
+            ):
+                self._sync(db)
+            self._generation = generation
+
+    def _changed_at(self):
+        return func.coalesce(Player.updated_at, Player.created_at)
+
+    def _load(self, db: Session) -> None:
+        started = time.perf_counter()
+        watermark = db.query(func.max(self._changed_at())).scalar()
+        rows = db.query(*SYNC_COLUMNS).filter(
+            and_(Player.is_active == True, Player.similarity_vector.isnot(None))
+        ).all()
+
+        # The most common vector length defines the index; others are skipped
+        lengths = Counter(len(row.similarity_vector) for row in rows if isinstance(row.similarity_vector, list))
+        self._dimension = lengths.most_common(1)[0][0] if lengths else None
+        self._groups.clear()
+        self._positions.clear()
+        for row in rows:
+            self._apply(row)
+
+        self._watermark = watermark
+        self._loaded = True
+        self._stale = False
+        self._synced_at = time.monotonic()
+        logger.info(
+            f"Similarity index loaded {len(self._positions)} of {len(rows)} vectors "
+            f"(dimension {self._dimension}) in {time.perf_counter() - started:.2f}s"
+        )
+
+    def _sync(self, db: Session) -> None:
+        changed_at = self._changed_at()
+        query = db.query(*SYNC_COLUMNS, changed_at.label("changed_at"))
+        if self._watermark is not None:
+            query = query.filter(changed_at > self._watermark - SYNC_OVERLAP)
+
+        for row in query.all():
+            self._apply(row)
+            if self._watermark is None or row.changed_at > self._watermark:
+                self._watermark = row.changed_at
+        self._stale = False
+        self._synced_at = time.monotonic()
+
+    def _vector(self, value) -> Optional[np.ndarray]:
+        if not isinstance(value, list) or not value:
+            return None
+        if self._dimension is None:
+            self._dimension = len(value)
+        if len(value) != self._dimension:
+            return None
+        try:
+            vector = np.asarray(value, dtype=np.float32)
+        except (TypeError, ValueError):
+            return None
+        return vector if np.isfinite(vector).all() else None
+
+    def _apply(self, row) -> None:
+        """Insert, move or drop one player so the index matches the row"""
+        previous = self._positions.get(row.id)
+        vector = self._vector(row.similarity_vector) if row.is_active else None
+
+        if previous is not None and (vector is None or previous != row.position):
+            self._groups[previous].remove(row.id)
+            del self._positions[row.id]
+        if vector is None:
+            return
+
+        group = self._groups.get(row.position)
+        if group is None:
+            group = self._groups[row.position] = _PositionGroup(self._dimension)
+        group.upsert(
+            row.id,
+            vector,
+            float(row.market_value_eur) if row.market_value_eur is not None else np.nan,
+            float(row.date_of_birth.toordinal()) if row.date_of_birth else np.nan
+        )
+        self._positions[row.id] = row.position
+
+    def similar(
+        self,
+        player_id: uuid.UUID,
+        k: int,
+        min_value: Optional[int] = None,
+        max_value: Optional[int] = None,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None
+    ) -> Optional[List[Tuple[uuid.UUID, float]]]:
+        """
+        The `k` most similar players in the same position as `(id, cosine)` pairs.
+
+        Returns None when the player has no usable vector, so callers can fall
+        back to attribute matching.
+        """
+        with self._lock:
+            position = self._positions.get(player_id)
+            if position is None:
+                return None
+            group = self._groups[position]
+
+            size = len(group)
+            mask = np.ones(size, dtype=bool)
+            mask[group.rows[player_id]] = False
+            if min_value is not None:
+                mask &= group.market_value[:size] >= min_value
+            if max_value is not None:
+                mask &= group.market_value[:size] <= max_value
+
+            earliest, latest = birth_day_bounds(min_age, max_age)
+            if earliest is not None:
+                mask &= group.birth_day[:size] >= earliest.toordinal()
+            if latest is not None:
+                mask &= group.birth_day[:size] <= latest.toordinal()
+
+            return group.top_k(player_id, k, mask)
+
+
+# Shared by all requests in this process
+similarity_index = SimilarityIndex()
+
+
+def sql_similar_players(
+    db: Session,
+    target: Player,
+    limit: int,
+    min_value: Optional[int] = None,
+    max_value: Optional[int] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None
+) -> List[Player]:
+    """Attribute-based matching for players without a similarity vector"""
+    similar_query = db.query(Player).filter(
+        and_(
+            Player.id != target.id,
+            Player.is_active == True,
+            Player.position == target.position
+        )
+    )
+
+    # Add age similarity (within 3 years), as a date_of_birth range
+    if target.age is not None:
+        similar_query = similar_query.filter(Player.age.between(max(target.age - 3, 0), target.age + 3))
+
+    # Explicit value bounds replace the default band of ±50% around the target
+    if min_value is None and max_value is None and target.market_value_eur:
+        min_value = target.market_value_eur * 0.5
+        max_value = target.market_value_eur * 1.5
+    if min_value is not None:
+        similar_query = similar_query.filter(Player.market_value_eur >= min_value)
+    if max_value is not None:
+        similar_query = similar_query.filter(Player.market_value_eur <= max_value)
+
+    if min_age is not None:
+        similar_query = similar_query.filter(Player.age >= min_age)
+    if max_age is not None:
+        similar_query = similar_query.filter(Player.age <= max_age)
+
+    # Order by market value similarity and limit results
+    return similar_query.order_by(
+        func.abs(Player.market_value_eur - target.market_value_eur)
+    ).limit(limit).all()
@@ -0,0 +1,132 @@
+"""
+Benchmark /players/autocomplete: in-memory prefix index vs the ilike search.
+
+Seeds synthetic players (data_source='benchmark') with accented first and
+last names, times prefix lookups typed without accents, then again with
+an overlay of recently changed players, and removes the seeded rows unless
+--keep is given.
+
+    cd backend && python -m scripts.benchmark_autocomplete --players 500000
+"""
+
+import argparse
+import random
+import time
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.core.filters import text_search
+from app.models import Player
+from app.services.autocomplete import AutocompleteIndex, normalize
+from scripts.benchmark_similarity import report
+
+FIRST_NAMES = [
+    "Erling", "Kylian", "Jude", "Vinícius", "Rodrigo", "Martin", "Bukayo", "Florian", "Jamal", "Pedro",
+    "Joško", "Rúben", "Khvicha", "Dušan", "Łukasz", "Søren", "Thiago", "Gonçalo", "Achraf", "Federico",
+    "Ousmane", "Ilkay", "Nicolò", "Dominik", "Mikel", "João", "Bernardo", "Kevin", "Alexis", "Théo",
+]
+LAST_NAMES = [
+    "Haaland", "Mbappé", "Bellingham", "Júnior", "Hernández", "Ødegaard", "Saka", "Wirtz", "Musiala",
+    "González", "Gvardiol", "Dias", "Kvaratskhelia", "Vlahović", "Fabiański", "Kjær", "Silva", "Ramos",
+    "Hakimi", "Valverde", "Dembélé", "Gündoğan", "Barella", "Szoboszlai", "Oyarzabal", "Félix",
+    "De Bruyne", "Mac Allister", "Hernández", "Müller", "Çalhanoğlu", "Özil", "Šeško", "Doué",
+]
+
+SEED_SQL = text("""
+    INSERT INTO players (
+        id, name, full_name, position, overall_rating, market_value_eur, data_source, is_active, created_at
+    )
+    SELECT
+        gen_random_uuid(),
+        first_name || ' ' || last_name || ' ' || g,
+        first_name || ' ' || last_name,
+        'ST',
+        40 + (random() * 55)::int,
+        (random() * 100000000)::int,
+        'benchmark',
+        true,
+        now() - interval '1 day'
+    FROM (
+        SELECT
+            g,
+            (:first_names)[1 + (g % cardinality(:first_names))] AS first_name,
+            (:last_names)[1 + ((g / 7) % cardinality(:last_names))] AS last_name
+        FROM generate_series(1, :players) AS g
+    ) AS seeded
+""")
+
+
+def random_prefix():
+    word = normalize(random.choice(FIRST_NAMES + LAST_NAMES)).split(" ")[0]
+    return word[:random.randint(1, min(6, len(word)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=500000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--sql-queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--overlay", type=int, default=2000, help="Players changed after load")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded players")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        db.execute(SEED_SQL, {"first_names": FIRST_NAMES, "last_names": LAST_NAMES, "players": args.players})
+        db.execute(text("ANALYZE players"))
+        db.commit()
+        print(f"Seeded {args.players} players in {time.perf_counter() - started:.1f}s")
+
+        index = AutocompleteIndex()
+        started = time.perf_counter()
+        index.ensure_fresh(db)
+        print(f"Loaded index ({len(index)} players) in {time.perf_counter() - started:.2f}s\n")
+
+        prefixes = [random_prefix() for _ in range(args.queries)]
+
+        def timed(search):
+            samples = []
+            for prefix in prefixes:
+                started = time.perf_counter()
+                search(prefix)
+                samples.append(time.perf_counter() - started)
+            return samples
+
+        report("index", timed(lambda prefix: index.search(prefix, args.limit)))
+
+        # Recent writes are served from the overlay until it is compacted
+        db.execute(text("""
+            UPDATE players SET overall_rating = 99, updated_at = now()
+            WHERE id IN (SELECT id FROM players WHERE data_source = 'benchmark' LIMIT :overlay)
+        """), {"overlay": args.overlay})
+        db.commit()
+        index.mark_stale()
+        started = time.perf_counter()
+        index.ensure_fresh(db)
+        print(f"Synced {args.overlay} changed players in {time.perf_counter() - started:.2f}s")
+        report("index+overlay", timed(lambda prefix: index.search(prefix, args.limit)))
+
+        sql_samples = []
+        for prefix in prefixes[:args.sql_queries]:
+            started = time.perf_counter()
+            db.query(Player.id, Player.name).filter(
+                Player.is_active == True,
+                text_search(prefix, [Player.name, Player.full_name, Player.current_club])
+            ).order_by(Player.overall_rating.desc().nullslast(), Player.market_value_eur.desc().nullslast()).limit(
+                args.limit
+            ).all()
+            sql_samples.append(time.perf_counter() - started)
+        report("sql ilike", sql_samples)
+    finally:
+        if not args.keep:
+            db.rollback()
+            db.execute(text("DELETE FROM players WHERE data_source = 'benchmark'"))
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
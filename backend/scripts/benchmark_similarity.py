@@ -0,0 +1,121 @@
+"""
+Benchmark /players/{id}/similar: in-process vector index vs the SQL matcher.
+
+Seeds synthetic players (data_source='benchmark') with random similarity
+vectors, times both engines over the same random targets and removes the
+seeded rows again unless --keep is given.
+
+    cd backend && python -m scripts.benchmark_similarity --players 100000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.models import Player
+from app.services.similarity import SimilarityIndex, sql_similar_players
+
+POSITIONS = ['GK', 'CB', 'LB', 'RB', 'CDM', 'CM', 'CAM', 'LW', 'RW', 'ST']
+
+SEED_SQL = text("""
+    INSERT INTO players (
+        id, name, position, market_value_eur, date_of_birth, similarity_vector,
+        data_source, is_active, created_at
+    )
+    SELECT
+        gen_random_uuid(),
+        'Benchmark Player ' || g,
+        (:positions)[1 + (g % cardinality(:positions))],
+        (random() * 100000000)::int,
+        DATE '1990-01-01' + (random() * 6000)::int,
+        (SELECT json_agg(round((random() * 2 - 1)::numeric, 4)) FROM generate_series(1, :dimension) WHERE g > 0),
+        'benchmark',
+        true,
+        now()
+    FROM generate_series(1, :players) AS g
+""")
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "p50": pick(0.50) * 1000,
+        "p95": pick(0.95) * 1000,
+        "p99": pick(0.99) * 1000,
+        "mean": statistics.fmean(ordered) * 1000,
+    }
+
+
+def report(label, samples):
+    stats = percentiles(samples)
+    print(
+        f"{label:<14} p50 {stats['p50']:8.2f} ms   p95 {stats['p95']:8.2f} ms   "
+        f"p99 {stats['p99']:8.2f} ms   mean {stats['mean']:8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=100000)
+    parser.add_argument("--dimension", type=int, default=32)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded players")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        db.execute(SEED_SQL, {"positions": POSITIONS, "dimension": args.dimension, "players": args.players})
+        db.execute(text("ANALYZE players"))
+        db.commit()
+        print(f"Seeded {args.players} players in {time.perf_counter() - started:.1f}s")
+
+        target_ids = [
+            row.id for row in db.query(Player.id).filter(Player.data_source == "benchmark").all()
+        ]
+        targets = random.sample(target_ids, min(args.queries, len(target_ids)))
+
+        index = SimilarityIndex()
+        started = time.perf_counter()
+        index.ensure_fresh(db)
+        print(f"Loaded index ({len(index)} vectors) in {time.perf_counter() - started:.2f}s\n")
+
+        vector_samples = []
+        for player_id in targets:
+            started = time.perf_counter()
+            index.similar(player_id, args.limit)
+            vector_samples.append(time.perf_counter() - started)
+
+        filtered_samples = []
+        for player_id in targets:
+            started = time.perf_counter()
+            index.similar(player_id, args.limit, max_value=20000000, min_age=21, max_age=29)
+            filtered_samples.append(time.perf_counter() - started)
+
+        sql_samples = []
+        for player_id in targets:
+            target = db.get(Player, player_id)
+            started = time.perf_counter()
+            sql_similar_players(db, target, args.limit)
+            sql_samples.append(time.perf_counter() - started)
+            db.expunge_all()
+
+        report("vector", vector_samples)
+        report("vector+filter", filtered_samples)
+        report("sql", sql_samples)
+    finally:
+        if not args.keep:
+            db.rollback()
+            db.execute(text("DELETE FROM players WHERE data_source = 'benchmark'"))
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Shared fixtures: tests using `db` run against TEST_DATABASE_URL inside
+one transaction that is rolled back afterwards, so endpoint commits never
+persist. Redis is left out, so responses come from the database.
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_db, get_redis
+from app.core.dependencies import get_current_user
+from app.main import app
+from app.models import User
+
+
+@pytest.fixture(scope="session")
+def engine():
+    engine = create_engine(settings.TEST_DATABASE_URL, connect_args={"options": "-c timezone=utc"})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(clerk_id=f"test_{uuid.uuid4().hex}", email=f"{uuid.uuid4().hex}@example.com", role="admin")
+    db.add(user)
+    db.flush()
+    return user
+
+
+@pytest.fixture
+def client(db, user):
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_redis] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        yield TestClient(app, base_url="http://localhost")
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements sent to the database while the test runs"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,58 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.autocomplete import KEY_BYTES, AutocompleteIndex, _entry, _SortedNames, normalize
+
+# Exactly KEY_BYTES bytes once normalized
+WIDE = "Alexandre Christophe Maximilien Bartholomew Duxx"
+
+
+def _row(name, overall_rating=70):
+    return SimpleNamespace(
+        id=uuid.uuid4(), name=name, full_name=None, position="ST", current_club=None, nationality=None,
+        overall_rating=overall_rating, market_value_eur=None
+    )
+
+
+def _index(rows, overlay=()):
+    index = AutocompleteIndex()
+    index._base = _SortedNames([_entry(row) for row in rows])
+    for row in overlay:
+        index._overlay.put(row.id, _entry(row))
+    return index
+
+
+@pytest.fixture(params=["base", "overlay"])
+def build(request):
+    """Index with the given players in the sorted array or in the overlay"""
+    if request.param == "base":
+        return lambda rows: _index(rows)
+    return lambda rows: _index([_row("Unrelated Player")], overlay=rows)
+
+
+def test_query_filling_the_key_width_matches_every_name_sharing_it(build):
+    assert len(normalize(WIDE).encode("utf-8")) == KEY_BYTES
+    exact, longer, other = _row(WIDE, 80), _row(f"{WIDE} Smith", 75), _row(f"{WIDE[:-1]}y Smith")
+    index = build([exact, longer, other])
+
+    assert [match.id for match in index.search(WIDE, 10)] == [exact.id, longer.id]
+
+
+def test_query_longer_than_the_key_width_is_confirmed_against_full_names(build):
+    smith, jones = _row(f"{WIDE} Smith", 80), _row(f"{WIDE} Jones", 75)
+    index = build([smith, jones])
+
+    assert [match.id for match in index.search(f"{WIDE} Sm", 10)] == [smith.id]
+    assert [match.id for match in index.search(f"{WIDE} Jones", 10)] == [jones.id]
+    assert index.search(f"{WIDE} Brown", 10) == []
+    assert [match.id for match in index.search(f"{WIDE} ", 10)] == [smith.id, jones.id]
+
+
+def test_long_queries_match_later_word_starts(build):
+    player = _row(f"Jean {WIDE} Smith")
+    index = build([player])
+
+    assert [match.id for match in index.search(f"{WIDE} Smith", 10)] == [player.id]
+    assert index.search(f"{WIDE} Smithers", 10) == []
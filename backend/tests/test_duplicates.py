@@ -0,0 +1,111 @@
+import itertools
+import uuid
+from datetime import date
+
+import pytest
+
+from app.core.config import settings
+from app.services.duplicates import _cluster, _match, _prepare, _record, _similarity, jaro_winkler, name_similarity
+from app.services.jobs import Job
+
+NAMES = [
+    "Kevin De Bruyne", "K. De Bruyne", "Kevin De Bruyn", "John Smith", "Jane Smith", "J. Smith", "Kyle Walker",
+    "Kylewalker", "Walker", "Kylian Mbappé", "Erling Braut Haaland", "Erling Haaland", "Bernardo Silva",
+    "Bernardo Mota Veiga de Carvalho e Silva", "Son Heung-min", "Heung-min Son"
+]
+
+
+def _job():
+    return Job("duplicate_scan", "player", "delete", None, lambda job: None)
+
+
+def _player(name, date_of_birth=None, nationality=None, full_name=None, current_club=None):
+    return _record(uuid.uuid4(), name, full_name, date_of_birth, nationality, current_club)
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("MARTHA", "MARHTA", 0.9611),
+    ("DWAYNE", "DUANE", 0.84),
+    ("DIXON", "DICKSONX", 0.8133),
+    ("same", "same", 1.0),
+    ("", "name", 0.0),
+    ("abc", "xyz", 0.0),
+])
+def test_jaro_winkler_reference_values(a, b, expected):
+    assert jaro_winkler(a, b) == pytest.approx(expected, abs=1e-4)
+
+
+def test_initial_matches_full_first_name_above_threshold():
+    score = name_similarity("K. De Bruyne", "Kevin De Bruyne")
+    assert score == pytest.approx(0.9667, abs=1e-4)
+    assert score >= settings.DUPLICATE_MATCH_THRESHOLD
+
+
+def test_different_first_names_stay_below_threshold():
+    score = name_similarity("John Smith", "Jane Smith")
+    assert score == pytest.approx(0.85, abs=1e-4)
+    assert score < settings.DUPLICATE_MATCH_THRESHOLD
+
+
+def test_partial_name_is_penalised_by_coverage():
+    # One of two words, matched exactly: 1.0 scaled by (1/2) ** 0.25
+    assert name_similarity("Walker", "Kyle Walker") == pytest.approx(0.5 ** 0.25)
+    assert name_similarity("Walker", "Kyle Walker") < settings.DUPLICATE_MATCH_THRESHOLD
+
+
+def test_names_compare_without_accents_case_or_word_splits():
+    assert name_similarity("Kylian Mbappé", "KYLIAN MBAPPE") == 1.0
+    assert name_similarity("Kylewalker", "Kyle Walker") >= settings.DUPLICATE_MATCH_THRESHOLD
+    assert name_similarity(None, "Kyle Walker") == 0.0
+
+
+@pytest.mark.parametrize("floor", [0.5, 0.8, 0.88, 0.95])
+def test_floor_pruning_only_changes_scores_below_the_floor(floor):
+    for a, b in itertools.permutations(map(_prepare, NAMES), 2):
+        exact = _similarity(a, b)
+        pruned = _similarity(a, b, floor)
+        if exact >= floor:
+            assert pruned == exact, (a.text, b.text)
+        else:
+            assert pruned < floor, (a.text, b.text)
+
+
+def test_known_different_birth_dates_rule_a_pair_out():
+    a = _player("Kevin De Bruyne", date(1991, 6, 28))
+    assert _match(a, _player("Kevin De Bruyne", date(1991, 6, 29))) is None
+    assert _match(a, _player("Kevin De Bruyne")) == (1.0, ["same name"])
+
+    score, reasons = _match(a, _player("K. De Bruyne", date(1991, 6, 28), current_club="Man City"))
+    assert score == pytest.approx(0.9667, abs=1e-4)
+    assert reasons == ["similar name", "same date of birth"]
+
+
+def test_clusters_join_matches_transitively():
+    born = date(1991, 6, 28)
+    records = [
+        _player("Kevin De Bruyne", born, "Belgium"),
+        _player("K. De Bruyne", born),
+        # Shares a block with "Kevin De Bruyne" (nationality and surname stem) but none with "K. De Bruyne"
+        _player("Kevin De Bruyn", None, "Belgium"),
+        _player("John Smith", date(1990, 1, 1), "England"),
+        _player("Jane Smith", date(1990, 1, 1), "England"),
+        _player("Kyle Walker", date(1990, 5, 28), "England"),
+        _player("Kyle Walker", date(1990, 5, 28)),
+    ]
+    compared, clusters = _cluster(records, _job())
+
+    assert compared > 0
+    assert [len(cluster["members"]) for cluster in clusters] == [3, 2]
+    assert {member["id"] for member in clusters[0]["members"]} == {record.id for record in records[:3]}
+    assert {frozenset(pair["ids"]) for pair in clusters[0]["pairs"]} == {
+        frozenset((records[0].id, records[1].id)), frozenset((records[0].id, records[2].id))
+    }
+    assert {member["id"] for member in clusters[1]["members"]} == {records[5].id, records[6].id}
+    assert clusters[1]["pairs"] == [{"ids": [records[5].id, records[6].id], "score": 1.0, "reasons": [
+        "same name", "same date of birth"
+    ]}]
+
+
+def test_records_in_no_shared_block_are_never_compared():
+    compared, clusters = _cluster([_player("Kevin De Bruyne"), _player("Kevin De Bruyne")], _job())
+    assert (compared, clusters) == (0, [])
@@ -0,0 +1,72 @@
+import uuid
+from datetime import date
+
+import pytest
+
+from app.models import Player
+
+# NULLs and ties in both sort columns, so pages split inside runs of equal values
+MARKET_VALUES = [None, 5, 5, 10, None, 3, 10, 7, None, 1, 5, 2, None]
+BIRTH_DATES = [
+    date(1995, 1, 1), None, date(2000, 6, 1), date(1995, 1, 1), None, date(1990, 3, 3), date(2000, 6, 1),
+    None, date(1998, 9, 9), date(1995, 1, 1), date(1992, 2, 2), None, date(2001, 1, 1)
+]
+PAGE_SIZE = 4
+
+
+@pytest.fixture
+def club(db):
+    club = f"Keyset Test {uuid.uuid4().hex}"
+    db.add_all(
+        Player(
+            name=f"Keyset Player {number}", position="CM", current_club=club,
+            market_value_eur=value * 1_000_000 if value is not None else None, date_of_birth=born
+        )
+        for number, (value, born) in enumerate(zip(MARKET_VALUES, BIRTH_DATES))
+    )
+    db.flush()
+    return club
+
+
+def _page(client, **params):
+    response = client.get("/api/v1/players", params={"fields": "id", "limit": PAGE_SIZE, **params})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return [player["id"] for player in body["data"]], body["meta"]
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", ["market_value", "age"])
+def test_cursor_pages_match_offset_pages_both_ways(client, club, sort_by, sort_order):
+    params = {"club": club, "sort_by": sort_by, "sort_order": sort_order}
+    offset_pages = [
+        _page(client, skip=skip, **params)[0]
+        for skip in range(0, len(MARKET_VALUES), PAGE_SIZE)
+    ]
+
+    # Forwards from the first page
+    forward, cursor = [], ""
+    while cursor is not None:
+        ids, meta = _page(client, cursor=cursor, **params)
+        forward.append(ids)
+        assert (meta["prev_cursor"] is None) == (len(forward) == 1)
+        cursor = meta["next_cursor"]
+    assert forward == offset_pages
+
+    # Backwards from the last page
+    backward, cursor = [], meta["prev_cursor"]
+    while cursor is not None:
+        ids, meta = _page(client, cursor=cursor, **params)
+        backward.append(ids)
+        assert meta["next_cursor"] is not None
+        cursor = meta["prev_cursor"]
+    assert backward == offset_pages[-2::-1]
+
+
+def test_cursor_is_bound_to_its_sort_order(client, club):
+    _, meta = _page(client, cursor="", club=club, sort_by="age", sort_order="asc")
+    response = client.get(
+        "/api/v1/players",
+        params={"club": club, "sort_by": "age", "sort_order": "desc", "cursor": meta["next_cursor"]}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,42 @@
+from app.models import Player, Shortlist, ShortlistItem
+from app.models.shortlist import ITEM_STATUSES
+
+
+def test_list_statements_do_not_grow_with_page_size_or_items(client, db, user, statements):
+    players = [Player(name=f"Test Player {number}", position="ST") for number in range(12)]
+    shortlists = [Shortlist(name=f"Test list {number}", type="player", created_by=user.id) for number in range(30)]
+    db.add_all(players + shortlists)
+    db.flush()
+
+    counts = {}
+    added = 0
+    for items_per_list in (0, 3, 12):
+        # Top up every shortlist to `items_per_list` items
+        db.add_all(
+            ShortlistItem(
+                shortlist_id=shortlist.id,
+                player_id=player.id,
+                status=ITEM_STATUSES[number % len(ITEM_STATUSES)],
+                estimated_fee_eur=1_000_000
+            )
+            for shortlist in shortlists
+            for number, player in enumerate(players[added:items_per_list], start=added)
+        )
+        db.flush()
+        added = items_per_list
+
+        for limit in (1, 20, 100):
+            statements.clear()
+            response = client.get("/api/v1/shortlists", params={"limit": limit, "type": "player"})
+            assert response.status_code == 200
+            counts[(items_per_list, limit)] = len(statements)
+
+            summaries = {summary["id"]: summary for summary in response.json()["data"]}
+            for shortlist in shortlists:
+                if str(shortlist.id) in summaries:
+                    summary = summaries[str(shortlist.id)]
+                    assert summary["items_count"] == items_per_list
+                    assert summary["total_estimated_cost"] == items_per_list * 1_000_000
+                    assert sum(summary["status_counts"].values()) == items_per_list
+
+    assert len(set(counts.values())) == 1, counts